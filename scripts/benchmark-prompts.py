@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Prompt Benchmarks - Measures prompt discovery, search and rendering at scale.
+
+Generates synthetic prompt libraries, times the PromptLoader operations used by
+agents and workflow runners, and compares the results against a stored baseline.
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Callable
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+CATEGORIES = [
+    "analysis", "classification", "evaluation", "extraction", "few-shot",
+    "generation", "summarization", "system", "templates", "transformation",
+]
+EXTENSIONS = {"few-shot": ".md", "templates": ".j2"}
+
+WORDS = (
+    "code review security python javascript api endpoint test testing deploy "
+    "latency cache index query schema migration pipeline stream batch model "
+    "prompt agent workflow orchestration retry timeout budget metric trace "
+    "kubernetes terraform docker container database sql graph vector token "
+    "summary classification extraction evaluation transformation generation"
+).split()
+
+# Lower is better for latency and memory, higher is better for throughput.
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "peak_rss_mb")
+HIGHER_IS_BETTER = ("ops_per_sec",)
+
+
+def load_prompt_module():
+    """Import scripts/load-prompts.py, whose file name is not importable directly."""
+    spec = importlib.util.spec_from_file_location("load_prompts", SCRIPTS_DIR / "load-prompts.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_library(root: Path, size: int, seed: int = 0) -> Path:
+    """Write size synthetic prompts spread across every category."""
+    rng = random.Random(seed)
+    for category in CATEGORIES:
+        (root / category).mkdir(parents=True, exist_ok=True)
+
+    for i in range(size):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        ext = EXTENSIONS.get(category, ".txt")
+        variables = [f"var_{rng.randrange(50)}" for _ in range(rng.randint(1, 6))]
+        paragraphs = [' '.join(rng.choices(WORDS, k=rng.randint(20, 80))) for _ in range(rng.randint(2, 8))]
+
+        lines = []
+        if i % 3 == 0:
+            lines += ["---", f'purpose: "Synthetic {category} prompt {i}"', "---", ""]
+        lines.append(f"# {category.title()} prompt {i}")
+        lines.append(f"# tags: {', '.join(rng.sample(WORDS, 2))}")
+        lines += paragraphs
+        if ext == ".j2":
+            lines.append("{% for item in items %}- {{ item }}\n{% endfor %}")
+        lines += [f"{name}: {{{{ {name} }}}}" for name in variables]
+
+        (root / category / f"prompt-{i:06d}{ext}").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return root
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure(fn: Callable[[Any], Any], inputs: List[Any], units_per_call: int = 1) -> Dict[str, float]:
+    """Time fn once per input and summarize latency and throughput."""
+    samples = []
+    started = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter_ns()
+        fn(item)
+        samples.append((time.perf_counter_ns() - t0) / 1e6)
+    elapsed = time.perf_counter() - started
+    return {
+        "calls": len(samples),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "ops_per_sec": round(len(samples) * units_per_call / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def benchmark_size(size: int, queries: int, iterations: int, seed: int, workdir: Path) -> Dict[str, Any]:
+    """Run every benchmark against one synthetic library in this process."""
+    prompts_module = load_prompt_module()
+    rng = random.Random(seed)
+    library = generate_library(workdir / f"prompts-{size}", size, seed)
+    cache_path = workdir / f"cache-{size}" / "prompt-index.json"
+    results: Dict[str, Any] = {}
+
+    def discover(use_cache):
+        loader = prompts_module.PromptLoader(str(library), cache_path=str(cache_path) if use_cache else None)
+        loader.discover()
+        return loader
+
+    results["discover_cold"] = measure(lambda _: discover(False), range(iterations), size)
+    discover(True)
+    results["discover_warm"] = measure(lambda _: discover(True), range(iterations), size)
+
+    loader = discover(True)
+    results["search_index_build"] = measure(lambda _: loader.search_index, [None])
+
+    search_terms = [' '.join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(queries)]
+    results["search"] = measure(lambda q: loader.search(q, top_k=10), search_terms)
+
+    ids = [p.qualified_id for p in rng.choices(loader.prompts, k=queries * 10)]
+    results["get_by_name"] = measure(loader.get_by_name, ids)
+
+    tags = [rng.choice(WORDS) for _ in range(queries * 10)]
+    results["get_by_tag"] = measure(loader.get_by_tag, tags)
+
+    variables = {f"var_{i}": f"value-{i}" for i in range(50)}
+    variables["items"] = ["a", "b", "c"]
+    names = [p.qualified_id for p in rng.choices(loader.prompts, k=queries)]
+    results["render_first"] = measure(lambda name: loader.render(name, variables), names)
+    results["render"] = measure(lambda name: loader.render(name, variables), names)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    results["process"] = {"peak_rss_mb": round(peak_mb, 1)}
+    return results
+
+
+def run_isolated(size: int, args) -> Dict[str, Any]:
+    """Benchmark one size in a child process so peak RSS is per library size."""
+    cmd = [
+        sys.executable, str(Path(__file__).resolve()), "--single", str(size),
+        "--queries", str(args.queries), "--iterations", str(args.iterations),
+        "--seed", str(args.seed), "--workdir", str(args.workdir),
+    ]
+    completed = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a message for every metric that regressed by more than threshold."""
+    regressions = []
+    for size, operations in results.items():
+        for operation, metrics in operations.items():
+            base = baseline.get(size, {}).get(operation, {})
+            for metric, value in metrics.items():
+                old = base.get(metric)
+                if not old:
+                    continue
+                if metric in LOWER_IS_BETTER and value > old * (1 + threshold):
+                    change = value / old - 1
+                elif metric in HIGHER_IS_BETTER and value < old * (1 - threshold):
+                    change = 1 - value / old
+                else:
+                    continue
+                regressions.append(
+                    f"{size} {operation}.{metric}: {old} -> {value} ({change:.0%} worse)"
+                )
+    return regressions
+
+
+def print_report(results: Dict[str, Any]):
+    """Print a human-readable summary table."""
+    print(f"{'Size':>8} {'Operation':<20} {'p50 ms':>10} {'p99 ms':>10} {'ops/s':>12}")
+    print("-" * 64)
+    for size, operations in results.items():
+        for operation, metrics in operations.items():
+            if operation == "process":
+                print(f"{size:>8} {'peak RSS':<20} {metrics['peak_rss_mb']:>10} MB")
+                continue
+            print(f"{size:>8} {operation:<20} {metrics['p50_ms']:>10} {metrics['p99_ms']:>10} "
+                  f"{metrics['ops_per_sec']:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt discovery, search and rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Synthetic library sizes to benchmark")
+    parser.add_argument("--queries", type=int, default=200, help="Search and render calls per size")
+    parser.add_argument("--iterations", type=int, default=3, help="Discovery runs per size")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for library generation")
+    parser.add_argument("--workdir", help="Directory for generated libraries (default: a temp dir)")
+    parser.add_argument("--output", default="prompt-benchmarks.json", help="Where to write JSON results")
+    parser.add_argument("--baseline", help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative regression before failing (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write results to --baseline")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        results = benchmark_size(args.single, args.queries, args.iterations, args.seed, Path(args.workdir))
+        print(json.dumps(results))
+        return
+
+    cleanup = args.workdir is None
+    args.workdir = args.workdir or tempfile.mkdtemp(prefix="prompt-bench-")
+    try:
+        results = {}
+        for size in args.sizes:
+            print(f"Benchmarking {size} prompts...", file=sys.stderr)
+            results[str(size)] = run_isolated(size, args)
+    finally:
+        if cleanup:
+            shutil.rmtree(args.workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "threshold": args.threshold,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print_report(results)
+    print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions over {args.threshold:.0%}:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    print(f"\n✅ No regressions over {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Workflow Graph Benchmarks - Measures graph analysis on synthetic dependency graphs.
+
+Generates deep chains, wide fan-out/fan-in graphs, dense fan-in graphs and
+graphs full of small cycles at increasing step counts, and times
+detect_cycles from validate-workflow.sh (--target cycles) or the linter's
+reachability analytics from workflow_graph.py (--target dag) on each, with
+peak traced memory.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_validator_module():
+    """Import scripts/validate-workflow.sh, a Python script with a .sh name."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    path = str(SCRIPTS_DIR / "validate-workflow.sh")
+    loader = importlib.machinery.SourceFileLoader("validate_workflow", path)
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def step(i: int, needs: List[int]) -> Dict[str, Any]:
+    return {"name": f"step-{i}", "agent": "bench", "needs": [f"step-{j}" for j in needs]}
+
+
+def deep_chain(size: int) -> List[Dict[str, Any]]:
+    """step-i needs step-(i-1): the deepest possible acyclic graph."""
+    return [step(i, [i - 1] if i else []) for i in range(size)]
+
+
+def deep_cycle(size: int) -> List[Dict[str, Any]]:
+    """A chain whose first step also needs the last: one cycle through every step."""
+    steps = deep_chain(size)
+    steps[0]["needs"] = [f"step-{size - 1}"]
+    return steps
+
+
+def wide(size: int) -> List[Dict[str, Any]]:
+    """One root, size - 2 parallel steps and a sink that needs all of them."""
+    steps = [step(0, [])] + [step(i, [0]) for i in range(1, size - 1)]
+    steps.append(step(size - 1, list(range(1, size - 1))))
+    return steps
+
+
+def fan_in(size: int) -> List[Dict[str, Any]]:
+    """step-i needs the four steps before it: every step joins several branches.
+
+    Each step's ancestors are every earlier step, so reachability that walks
+    per step is quadratic here while chains and fan-out stay linear.
+    """
+    return [step(i, list(range(max(0, i - 4), i))) for i in range(size)]
+
+
+def many_cycles(size: int) -> List[Dict[str, Any]]:
+    """Disjoint three-step cycles hanging off one root."""
+    steps = [step(0, [])]
+    for i in range(1, size, 3):
+        group = [j for j in (i, i + 1, i + 2) if j < size]
+        for k, j in enumerate(group):
+            steps.append(step(j, [0, group[k - 1]] if len(group) > 1 else [0]))
+    return steps
+
+
+SHAPES: Dict[str, Callable[[int], List[Dict[str, Any]]]] = {
+    "deep-chain": deep_chain,
+    "deep-cycle": deep_cycle,
+    "wide": wide,
+    "fan-in": fan_in,
+    "many-cycles": many_cycles,
+}
+
+
+def dag_analytics(workflow: dict) -> list:
+    """The linter's reachability analytics: redundant edges and output-order checks."""
+    from workflow_graph import WorkflowGraph
+    graph = WorkflowGraph(workflow["steps"])
+    graph.depends_on((i, dep) for i in range(len(graph)) for dep in graph.deps[i][:1])
+    return graph.redundant_edges()
+
+
+def measure(detect: Callable[[dict], list], workflow: dict, iterations: int) -> Dict[str, Any]:
+    """Time detect on workflow and record its peak traced memory."""
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter_ns()
+        errors = detect(workflow)
+        samples.append((time.perf_counter_ns() - t0) / 1e6)
+
+    tracemalloc.start()
+    detect(workflow)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "found": len(errors),
+        "best_ms": round(min(samples), 2),
+        "median_ms": round(sorted(samples)[len(samples) // 2], 2),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def print_report(results: Dict[str, Dict[str, Any]]):
+    """Print a human-readable summary table."""
+    print(f"{'Shape':<12} {'Steps':>8} {'Found':>8} {'best ms':>10} {'median ms':>10} {'peak MB':>9}")
+    print("-" * 62)
+    for shape, sizes in results.items():
+        for size, metrics in sizes.items():
+            print(f"{shape:<12} {size:>8} {metrics['found']:>8} {metrics['best_ms']:>10} "
+                  f"{metrics['median_ms']:>10} {metrics['peak_mb']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workflow graph analysis")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Synthetic workflow step counts")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES),
+                        help="Graph shapes to benchmark")
+    parser.add_argument("--target", choices=["cycles", "dag"], default="cycles",
+                        help="cycles: the validator's cycle detection (found = cycle groups); "
+                             "dag: the linter's reachability analytics (found = redundant edges)")
+    parser.add_argument("--iterations", type=int, default=3, help="Timed runs per graph")
+    parser.add_argument("--output", help="Where to write JSON results")
+    args = parser.parse_args()
+
+    validator = load_validator_module()
+    target = validator.detect_cycles if args.target == "cycles" else dag_analytics
+    results: Dict[str, Dict[str, Any]] = {}
+    for shape in args.shapes:
+        for size in args.sizes:
+            print(f"Benchmarking {shape} with {size} steps...", file=sys.stderr)
+            workflow = {"steps": SHAPES[shape](size)}
+            results.setdefault(shape, {})[str(size)] = measure(
+                target, workflow, args.iterations
+            )
+
+    print_report(results)
+    if args.output:
+        report = {
+            "meta": {
+                "target": args.target,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            },
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,39 @@ Workflow Linter - Validates workflow YAML files against best practices.
 """
 
 import argparse
+import hashlib
+import json
+import os
+import time
 import yaml
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
-from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Any, NamedTuple, Optional, Sequence, TextIO, Tuple
+from dataclasses import dataclass, field
+
+from workflow_discovery import discover_workflows
+from workflow_expressions import ExpressionError, compile_expression, compile_template, iter_strings, step_outputs
+from workflow_graph import DEPENDENCY_KEYS, WorkflowGraph
+from workflow_loader import DEFAULT_CACHE_DIR, WorkflowCache, load_workflow, read_entry, write_entry
+
+
+# Bump when rule behaviour changes in a way the source hash would not catch.
+LINTER_VERSION = "1.1.0"
+
+# Step keys that never hold data references.
+REFERENCE_SKIP_KEYS = frozenset({'name', *DEPENDENCY_KEYS})
+TEMPLATE_SKIP_KEYS = REFERENCE_SKIP_KEYS | {'condition'}
+
+# Source files that implement the rules; their contents are part of the rules fingerprint.
+RULE_SOURCES = (
+    Path(__file__),
+    Path(__file__).with_name('workflow_graph.py'),
+    Path(__file__).with_name('workflow_expressions.py'),
+)
 
 
 @dataclass
@@ -22,19 +50,108 @@ class LintResult:
     suggestion: str = ""
 
 
+@dataclass
+class LintRule:
+    """A registered lint rule and the result codes it can report."""
+    name: str
+    check: Callable[['WorkflowLinter'], None]
+    codes: Tuple[str, ...]
+    description: str = ""
+
+
+# Rules in registration order, which is also the order they run in.
+RULE_REGISTRY: Dict[str, LintRule] = {}
+
+
+def lint_rule(name: str, *codes: str):
+    """Register a check as a lint rule.
+
+    The check is called with the WorkflowLinter once the workflow is loaded
+    and appends LintResults reporting any of codes.
+    """
+    def decorator(check):
+        description = (check.__doc__ or "").strip().split("\n")[0]
+        RULE_REGISTRY[name] = LintRule(name, check, codes, description)
+        return check
+    return decorator
+
+
+@dataclass(frozen=True)
+class RuleSelection:
+    """Which rules run and, optionally, which result codes they may report.
+
+    rules is None when no selection was made and every registered rule
+    runs; an empty tuple runs none. codes is None when every code of the
+    selected rules is reported.
+    """
+    rules: Optional[Tuple[str, ...]] = None
+    codes: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def resolve(cls, select: Iterable[str] = (), ignore: Iterable[str] = ()) -> 'RuleSelection':
+        """Build a selection from rule names and result codes.
+
+        Selecting a rule name runs that rule; selecting a code runs the rule
+        that reports it but keeps only the selected codes. Ignoring a name
+        skips the rule and ignoring a code drops its results. Raises
+        ValueError for anything that is neither.
+        """
+        owners = {code: rule.name for rule in RULE_REGISTRY.values() for code in rule.codes}
+        select, ignore = list(select), list(ignore)
+        unknown = [item for item in select + ignore if item not in RULE_REGISTRY and item not in owners]
+        if unknown:
+            raise ValueError(f"Unknown rule or code: {', '.join(unknown)}")
+
+        if select:
+            wanted = {item if item in RULE_REGISTRY else owners[item] for item in select}
+        else:
+            wanted = set(RULE_REGISTRY)
+        wanted -= set(ignore)
+        rules = tuple(name for name in RULE_REGISTRY if name in wanted)
+
+        by_code = {item for item in select if item in owners}
+        dropped = {item for item in ignore if item in owners}
+        if not by_code and not dropped:
+            return cls(rules)
+        codes = set()
+        for name in rules:
+            rule_codes = set(RULE_REGISTRY[name].codes)
+            codes |= rule_codes if name in select else (rule_codes & by_code or rule_codes)
+        return cls(rules, frozenset(codes - dropped))
+
+    @property
+    def active(self) -> Tuple[str, ...]:
+        return tuple(RULE_REGISTRY) if self.rules is None else self.rules
+
+
 class WorkflowLinter:
     """Lints workflow YAML files."""
 
-    def __init__(self, workflow_path: str):
+    # Chains of at least this many one-to-one linked steps are reported.
+    SERIAL_CHAIN_MIN = 3
+
+    def __init__(self, workflow_path: str, cache: Optional[WorkflowCache] = None,
+                 selection: Optional[RuleSelection] = None):
         self.workflow_path = Path(workflow_path)
+        self.cache = cache
+        self.selection = selection or RuleSelection()
         self.results: List[LintResult] = []
+        # Rule name -> (nanoseconds, findings) for the last lint() run.
+        self.timings: Dict[str, Tuple[int, int]] = {}
         self.workflow = None
+        self._graph: Optional[WorkflowGraph] = None
+
+    @property
+    def graph(self) -> WorkflowGraph:
+        """Dependency graph over `needs` and `depends_on`, built once per workflow."""
+        if self._graph is None:
+            self._graph = WorkflowGraph(self.workflow.get('steps') or [])
+        return self._graph
 
     def load(self) -> bool:
         """Load and parse the workflow file."""
         try:
-            with open(self.workflow_path, 'r') as f:
-                self.workflow = yaml.safe_load(f)
+            self.workflow = load_workflow(str(self.workflow_path), self.cache)
             return True
         except yaml.YAMLError as e:
             self.results.append(LintResult(
@@ -53,6 +170,7 @@ class WorkflowLinter:
             ))
             return False
 
+    @lint_rule("required-fields", "REQUIRED_FIELD")
     def lint_required_fields(self):
         """Check for required fields."""
         required_fields = ['name', 'version', 'description', 'triggers', 'steps']
@@ -66,6 +184,7 @@ class WorkflowLinter:
                     suggestion=f"Add {field} to the workflow definition"
                 ))
 
+    @lint_rule("version", "VERSION_FORMAT")
     def lint_version(self):
         """Check version format."""
         version = self.workflow.get('version', '')
@@ -83,6 +202,7 @@ class WorkflowLinter:
                 suggestion="Use format: major.minor.patch (e.g., 1.0.0)"
             ))
 
+    @lint_rule("triggers", "TRIGGERS_EMPTY")
     def lint_triggers(self):
         """Check trigger configuration."""
         triggers = self.workflow.get('triggers', [])
@@ -95,6 +215,7 @@ class WorkflowLinter:
                 suggestion="Add at least one trigger (on_push, on_schedule, manual)"
             ))
 
+    @lint_rule("steps", "STEPS_EMPTY", "STEP_NAME", "STEP_NAME_DUPLICATE", "STEP_ACTION", "STEP_DEPENDENCY")
     def lint_steps(self):
         """Check step configuration."""
         steps = self.workflow.get('steps', [])
@@ -107,7 +228,7 @@ class WorkflowLinter:
             ))
             return
 
-        step_names = []
+        seen_names = set()
         for i, step in enumerate(steps):
             if 'name' not in step:
                 self.results.append(LintResult(
@@ -119,14 +240,14 @@ class WorkflowLinter:
                 ))
 
             name = step.get('name', f"step_{i}")
-            if name in step_names:
+            if name in seen_names:
                 self.results.append(LintResult(
                     file=str(self.workflow_path),
                     rule="STEP_NAME_DUPLICATE",
                     severity="error",
                     message=f"Duplicate step name: {name}"
                 ))
-            step_names.append(name)
+            seen_names.add(name)
 
             # Check for action
             if 'action' not in step and 'agent' not in step:
@@ -137,37 +258,98 @@ class WorkflowLinter:
                     message=f"Step '{name}' missing action or agent"
                 ))
 
-            # Check for dependencies
-            if 'depends_on' in step:
-                deps = step['depends_on']
-                for dep in deps:
-                    if dep not in step_names and dep not in [s.get('name') for s in steps]:
-                        self.results.append(LintResult(
-                            file=str(self.workflow_path),
-                            rule="STEP_DEPENDENCY",
-                            severity="warning",
-                            message=f"Step '{name}' depends on unknown step: {dep}",
-                            suggestion=f"Ensure '{dep}' is defined as a step name"
-                        ))
+        # Check for dependencies
+        for i, dep in self.graph.unknown:
+            self.results.append(LintResult(
+                file=str(self.workflow_path),
+                rule="STEP_DEPENDENCY",
+                severity="warning",
+                message=f"Step '{self.graph.names[i]}' depends on unknown step: {dep}",
+                suggestion=f"Ensure '{dep}' is defined as a step name"
+            ))
 
+    @lint_rule("guards", "CONDITION_SYNTAX", "TEMPLATE_SYNTAX", "OUTPUT_REF_STEP",
+               "OUTPUT_REF_NAME", "OUTPUT_REF_UNDECLARED", "OUTPUT_REF_ORDER")
     def lint_guards(self):
-        """Check guardrails and conditions."""
-        steps = self.workflow.get('steps', [])
-        for i, step in enumerate(steps):
-            name = step.get('name', f"step_{i}")
-
-            # Check for output usage without validation
-            if 'condition' in step:
-                condition = step['condition']
-                if 'outputs.' in str(condition):
-                    # Ensure the referenced output exists
-                    for other_step in steps:
-                        if other_step.get('name') in str(condition):
-                            outputs = other_step.get('outputs', [])
-                            for output in outputs:
-                                if f"outputs.{other_step['name']}.{output}" not in str(condition):
-                                    pass  # Would need deeper analysis
+        """Check conditions and output references against declared outputs."""
+        graph = self.graph
+        declared = {name: step_outputs(graph.steps[i]) for name, i in graph.index.items()}
+        # (step, referenced step, message) checked for dependency order in one pass at the end
+        order_checks = []
+
+        for i, step in enumerate(graph.steps):
+            name = graph.names[i]
+            refs = []
+
+            condition = step.get('condition')
+            if isinstance(condition, str):
+                try:
+                    refs.extend(compile_expression(condition).output_refs)
+                except ExpressionError as e:
+                    self.results.append(LintResult(
+                        file=str(self.workflow_path),
+                        rule="CONDITION_SYNTAX",
+                        severity="error",
+                        message=f"Step '{name}' condition cannot be parsed: {e}"
+                    ))
+
+            for text in iter_strings(step, TEMPLATE_SKIP_KEYS):
+                if '{{' not in text:
+                    continue
+                try:
+                    refs.extend(compile_template(text).output_refs)
+                except ExpressionError as e:
+                    self.results.append(LintResult(
+                        file=str(self.workflow_path),
+                        rule="TEMPLATE_SYNTAX",
+                        severity="warning",
+                        message=f"Step '{name}' template cannot be parsed: {e}"
+                    ))
+
+            for ref in dict.fromkeys(refs):
+                target = f"outputs.{ref.step}.{ref.output}"
+                if ref.step not in graph.index:
+                    self.results.append(LintResult(
+                        file=str(self.workflow_path),
+                        rule="OUTPUT_REF_STEP",
+                        severity="error",
+                        message=f"Step '{name}' references {target} but there is no step '{ref.step}'"
+                    ))
+                    continue
+
+                outputs = declared[ref.step]
+                if outputs is None:
+                    self.results.append(LintResult(
+                        file=str(self.workflow_path),
+                        rule="OUTPUT_REF_UNDECLARED",
+                        severity="warning",
+                        message=f"Step '{name}' references {target} but '{ref.step}' declares no outputs",
+                        suggestion=f"Add '{ref.output}' to the outputs of '{ref.step}'"
+                    ))
+                elif ref.output not in outputs:
+                    self.results.append(LintResult(
+                        file=str(self.workflow_path),
+                        rule="OUTPUT_REF_NAME",
+                        severity="error",
+                        message=f"Step '{name}' references {target} but '{ref.step}' has no output '{ref.output}'",
+                        suggestion=f"Declared outputs: {', '.join(sorted(outputs))}"
+                    ))
+
+                order_checks.append((i, graph.index[ref.step], ref.step,
+                                     f"Step '{name}' uses {target} but does not depend on '{ref.step}'"))
+
+        ordered = graph.depends_on((i, j) for i, j, _, _ in order_checks)
+        for i, j, dep, message in order_checks:
+            if (i, j) not in ordered:
+                self.results.append(LintResult(
+                    file=str(self.workflow_path),
+                    rule="OUTPUT_REF_ORDER",
+                    severity="warning",
+                    message=message,
+                    suggestion=f"Add '{dep}' to the step's needs so its outputs exist"
+                ))
 
+    @lint_rule("naming-conventions", "NAMING_CONVENTION")
     def lint_naming_conventions(self):
         """Check naming conventions."""
         name = self.workflow.get('name', '')
@@ -182,6 +364,7 @@ class WorkflowLinter:
                 suggestion="Example: my-workflow-name (not my_workflow_name or my workflow name)"
             ))
 
+    @lint_rule("complexity", "COMPLEXITY_HIGH", "COMPLEXITY_DAG")
     def lint_complexity(self):
         """Check workflow complexity."""
         steps = self.workflow.get('steps', [])
@@ -196,12 +379,7 @@ class WorkflowLinter:
             ))
 
         # Check for linear vs complex DAG
-        dependencies = set()
-        for step in steps:
-            for dep in step.get('depends_on', []):
-                dependencies.add(dep)
-
-        if len(dependencies) > len(steps) * 2:
+        if self.graph.edge_count > len(steps) * 2:
             self.results.append(LintResult(
                 file=str(self.workflow_path),
                 rule="COMPLEXITY_DAG",
@@ -210,85 +388,467 @@ class WorkflowLinter:
                 suggestion="Ensure proper error handling for parallel execution"
             ))
 
+    @lint_rule("dag-shape", "DAG_SHAPE", "DAG_CYCLE")
+    def lint_dag_shape(self):
+        """Report critical path length and maximum parallel width."""
+        graph = self.graph
+        if len(graph) < 2 or not graph.edge_count:
+            return
+
+        if graph.blocked:
+            names = ", ".join(graph.names[i] for i in graph.blocked)
+            self.results.append(LintResult(
+                file=str(self.workflow_path),
+                rule="DAG_CYCLE",
+                severity="error",
+                message=f"Steps are on or behind a dependency cycle: {names}",
+                suggestion="Remove one dependency from each cycle"
+            ))
+
+        length, path = graph.critical_path()
+        if not path:
+            return
+        width, widest = graph.max_width()
+        self.results.append(LintResult(
+            file=str(self.workflow_path),
+            rule="DAG_SHAPE",
+            severity="info",
+            message=(
+                f"Critical path: {length} of {len(graph)} steps "
+                f"({' → '.join(graph.names[i] for i in path)}); "
+                f"max parallel width: {width} ({', '.join(graph.names[i] for i in widest)})"
+            ),
+            suggestion=("Every step runs in sequence - look for steps that do not need their predecessor"
+                        if width == 1 else "")
+        ))
+
+    @lint_rule("redundant-dependencies", "DAG_REDUNDANT_EDGE")
+    def lint_redundant_dependencies(self):
+        """Flag dependencies already implied by another dependency of the step."""
+        graph = self.graph
+        for dep, step in graph.redundant_edges():
+            self.results.append(LintResult(
+                file=str(self.workflow_path),
+                rule="DAG_REDUNDANT_EDGE",
+                severity="info",
+                message=f"Step '{graph.names[step]}' dependency on '{graph.names[dep]}' is implied transitively",
+                suggestion=f"Drop '{graph.names[dep]}' from the step's needs/depends_on"
+            ))
+
+    @lint_rule("unreachable-steps", "DAG_UNREACHABLE", "DAG_ORPHAN")
+    def lint_unreachable_steps(self):
+        """Flag steps that can never run and steps disconnected from the graph."""
+        graph = self.graph
+        for i in graph.unreachable():
+            self.results.append(LintResult(
+                file=str(self.workflow_path),
+                rule="DAG_UNREACHABLE",
+                severity="warning",
+                message=f"Step '{graph.names[i]}' can never run: it depends on an unknown step or a cycle",
+                suggestion="Fix the dependency chain leading to this step"
+            ))
+
+        for i in graph.orphans():
+            self.results.append(LintResult(
+                file=str(self.workflow_path),
+                rule="DAG_ORPHAN",
+                severity="info",
+                message=f"Step '{graph.names[i]}' has no dependencies and nothing depends on it",
+                suggestion="Connect it to the workflow or confirm it should run independently"
+            ))
+
+    @lint_rule("serial-chains", "DAG_SERIAL_CHAIN")
+    def lint_serial_chains(self):
+        """Flag serialized chains where a step uses nothing from its predecessor."""
+        graph = self.graph
+        for chain in graph.chains(self.SERIAL_CHAIN_MIN):
+            independent = [
+                (u, v) for u, v in zip(chain, chain[1:])
+                if not references_step(graph.steps[v], graph.names[u])
+            ]
+            if not independent:
+                continue
+            links = ", ".join(f"'{graph.names[v]}' uses nothing from '{graph.names[u]}'" for u, v in independent)
+            self.results.append(LintResult(
+                file=str(self.workflow_path),
+                rule="DAG_SERIAL_CHAIN",
+                severity="info",
+                message=f"Serialized chain {' → '.join(graph.names[i] for i in chain)}: {links}",
+                suggestion="Depend on an earlier step instead so these steps can run in parallel"
+            ))
+
     def lint(self) -> List[LintResult]:
         """Run all linting checks."""
         if not self.workflow:
             return self.results
 
-        self.lint_required_fields()
-        self.lint_version()
-        self.lint_triggers()
-        self.lint_steps()
-        self.lint_guards()
-        self.lint_naming_conventions()
-        self.lint_complexity()
+        codes = self.selection.codes
+        for name in self.selection.active:
+            before = len(self.results)
+            start = time.perf_counter_ns()
+            RULE_REGISTRY[name].check(self)
+            elapsed = time.perf_counter_ns() - start
+            if codes is not None:
+                self.results[before:] = [r for r in self.results[before:] if r.rule in codes]
+            self.timings[name] = (elapsed, len(self.results) - before)
 
         return self.results
 
     def print_results(self):
         """Print lint results."""
-        if not self.results:
-            print(f"✓ {self.workflow_path}: No issues found")
-            return
+        print_results(str(self.workflow_path), self.results)
+
+
+def references_step(step: Dict[str, Any], name: str) -> bool:
+    """Whether any value of step, other than its name and dependencies, mentions name."""
+    return any(name in text for text in iter_strings(step, REFERENCE_SKIP_KEYS))
+
+
+def print_results(workflow_path: str, results: List[LintResult]):
+    """Print lint results for one workflow file."""
+    if not results:
+        print(f"✓ {workflow_path}: No issues found")
+        return
+
+    print(f"✗ {workflow_path}:")
+    for result in results:
+        icon = "🔴" if result.severity == "error" else ("🟡" if result.severity == "warning" else "🔵")
+        print(f"  {icon} [{result.rule}] {result.message}")
+        if result.suggestion:
+            print(f"     └─ 💡 {result.suggestion}")
+
+
+def collect_workflow_files(paths: List[str], excludes: Sequence[str] = (),
+                           use_ignore_files: bool = True) -> List[Path]:
+    """Expand file and directory arguments into workflow files, in lint order."""
+    return list(discover_workflows(paths, excludes, use_ignore_files))
+
+
+def rules_fingerprint(selection: Optional[RuleSelection] = None) -> str:
+    """Fingerprint the active rule set and the linter that implements it.
+
+    Covers LINTER_VERSION, the selected rules and codes in order and the
+    source of every module in RULE_SOURCES, so editing a rule invalidates
+    every cached result.
+    """
+    selection = selection or RuleSelection()
+    digest = hashlib.sha256()
+    digest.update(LINTER_VERSION.encode())
+    digest.update("\0".join(selection.active).encode())
+    if selection.codes is not None:
+        digest.update(("\1" + "\0".join(sorted(selection.codes))).encode())
+    for source in RULE_SOURCES:
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+class LintResultCache:
+    """On-disk cache of per-file lint results.
 
-        print(f"✗ {self.workflow_path}:")
-        for result in self.results:
-            icon = "🔴" if result.severity == "error" else ("🟡" if result.severity == "warning" else "🔵")
-            print(f"  {icon} [{result.rule}] {result.message}")
+    Entries are keyed by the file's path and content hash and grouped by
+    rules fingerprint, so unchanged files skip both parsing and linting.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, selection: Optional[RuleSelection] = None):
+        self.fingerprint = rules_fingerprint(selection)
+        self.cache_dir = Path(cache_dir) / "lint" / self.fingerprint[:16]
+
+    def _entry_path(self, path: str, data: bytes) -> Path:
+        digest = hashlib.sha256(path.encode() + b"\0" + data).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.pickle"
+
+    def get(self, path: str, data: bytes) -> Optional[Tuple[bool, List[LintResult]]]:
+        """Return (loaded, results) cached for this file content, or None."""
+        return read_entry(self._entry_path(path, data))
+
+    def put(self, path: str, data: bytes, loaded: bool, results: List[LintResult]):
+        write_entry(self._entry_path(path, data), (loaded, results))
+
+
+class LintOutcome(NamedTuple):
+    """One file's lint results.
+
+    results include load errors even when the file could not be parsed;
+    linted is False when they came from the result cache, in which case
+    timings is empty.
+    """
+    path: str
+    loaded: bool
+    results: List[LintResult]
+    linted: bool
+    timings: Dict[str, Tuple[int, int]]
+
+
+def lint_file(path: str, cache: Optional[WorkflowCache] = None,
+              result_cache: Optional[LintResultCache] = None,
+              selection: Optional[RuleSelection] = None) -> LintOutcome:
+    """Load and lint one workflow file with the selected rules."""
+    data = None
+    if result_cache is not None:
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            pass
+        else:
+            cached = result_cache.get(path, data)
+            if cached is not None:
+                loaded, results = cached
+                return LintOutcome(path, loaded, results, False, {})
+
+    linter = WorkflowLinter(path, cache, selection)
+    loaded = linter.load()
+    if loaded:
+        linter.lint()
+    if data is not None:
+        result_cache.put(path, data, loaded, linter.results)
+    return LintOutcome(path, loaded, linter.results, True, linter.timings)
+
+
+def lint_files(files: Iterable[Path], jobs: int = 1, cache: Optional[WorkflowCache] = None,
+               result_cache: Optional[LintResultCache] = None, chunksize: int = 16,
+               selection: Optional[RuleSelection] = None) -> Iterator[LintOutcome]:
+    """Lint files, yielding each file's results in input order.
+
+    With jobs > 1 files are sent in chunks to a process pool; results still
+    stream back in the order the files were given. Only a bounded window of
+    chunks is in flight, so memory stays flat however many files there are.
+    """
+    paths = (str(f) for f in files)
+    if jobs <= 1:
+        for path in paths:
+            yield lint_file(path, cache, result_cache, selection)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        worker = partial(lint_chunk, cache=cache, result_cache=result_cache, selection=selection)
+        pending = deque()
+        while True:
+            chunk = list(islice(paths, chunksize))
+            if not chunk:
+                break
+            pending.append(pool.submit(worker, chunk))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def lint_chunk(paths: List[str], cache: Optional[WorkflowCache] = None,
+               result_cache: Optional[LintResultCache] = None,
+               selection: Optional[RuleSelection] = None) -> List[LintOutcome]:
+    """Lint a batch of files in a worker process."""
+    return [lint_file(path, cache, result_cache, selection) for path in paths]
+
+
+@dataclass
+class RuleProfile:
+    """Cumulative per-rule time, calls and findings across a lint run."""
+    stats: Dict[str, List[int]] = field(default_factory=dict)
+    files: int = 0
+
+    def add(self, timings: Dict[str, Tuple[int, int]]):
+        """Fold one file's rule timings into the totals."""
+        if timings:
+            self.files += 1
+        for name, (elapsed, findings) in timings.items():
+            entry = self.stats.setdefault(name, [0, 0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+            entry[2] += findings
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rules ordered by cumulative time, slowest first."""
+        rules = {}
+        for name, (elapsed, calls, findings) in sorted(self.stats.items(), key=lambda item: -item[1][0]):
+            rules[name] = {
+                "total_ms": round(elapsed / 1e6, 3),
+                "calls": calls,
+                "mean_us": round(elapsed / calls / 1e3, 2),
+                "findings": findings,
+            }
+        return {"files": self.files, "rules": rules}
+
+    def print_report(self, stream: TextIO):
+        """Print the profile as a table."""
+        report = self.to_dict()
+        total = sum(rule["total_ms"] for rule in report["rules"].values()) or 1
+        print(f"\n⏱️  Rule profile ({report['files']} files linted)", file=stream)
+        print(f"  {'Rule':<24} {'total ms':>10} {'%':>6} {'calls':>7} {'mean us':>10} {'findings':>9}", file=stream)
+        for name, rule in report["rules"].items():
+            print(f"  {name:<24} {rule['total_ms']:>10.3f} {rule['total_ms'] / total:>6.1%} "
+                  f"{rule['calls']:>7} {rule['mean_us']:>10.2f} {rule['findings']:>9}", file=stream)
+
+
+def result_to_dict(result: LintResult) -> Dict[str, Any]:
+    """Serialize a LintResult for the JSON and NDJSON outputs."""
+    return {
+        "file": result.file,
+        "line": result.line,
+        "rule": result.rule,
+        "severity": result.severity,
+        "message": result.message,
+        "suggestion": result.suggestion
+    }
+
+
+class NdjsonWriter:
+    """Streams one JSON object per lint result, one per line."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, results: List[LintResult]):
+        for result in results:
+            self.stream.write(json.dumps(result_to_dict(result)) + "\n")
+        self.stream.flush()
+
+    def close(self, **summary):
+        pass
+
+
+class SarifWriter:
+    """Streams lint results as a SARIF 2.1.0 log.
+
+    The document is written incrementally: the header when created, each
+    result as it arrives and the closing invocation on close(), so memory
+    does not grow with the number of results.
+    """
+
+    SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+    LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.count = 0
+        driver = {
+            "name": "lint-workflow",
+            "version": LINTER_VERSION,
+            "informationUri": "https://github.com/LifeJiggy/Awesome-Grok-Workflows",
+        }
+        header = json.dumps({"version": "2.1.0", "$schema": self.SCHEMA})
+        self.stream.write(header[:-1] + ', "runs": [{"tool": ' +
+                          json.dumps({"driver": driver}) + ', "results": [\n')
+
+    def write(self, results: List[LintResult]):
+        for result in results:
+            record = {
+                "ruleId": result.rule,
+                "level": self.LEVELS.get(result.severity, "note"),
+                "message": {"text": result.message},
+                "locations": [{
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": Path(result.file).as_posix()},
+                        **({"region": {"startLine": result.line}} if result.line else {}),
+                    }
+                }],
+            }
             if result.suggestion:
-                print(f"     └─ 💡 {result.suggestion}")
+                record["properties"] = {"suggestion": result.suggestion}
+            self.stream.write((",\n" if self.count else "") + json.dumps(record))
+            self.count += 1
+        self.stream.flush()
+
+    def close(self, **summary):
+        invocation = {"executionSuccessful": True, "properties": summary}
+        self.stream.write('\n], "invocations": [' + json.dumps(invocation) + ']}]}\n')
+        self.stream.flush()
+
+
+WRITERS = {"ndjson": NdjsonWriter, "sarif": SarifWriter}
 
 
 def main():
     parser = argparse.ArgumentParser(description="Lint workflow YAML files")
-    parser.add_argument("workflows", nargs="+", help="Workflow files or directories to lint")
+    parser.add_argument("workflows", nargs="*", help="Workflow files or directories to lint")
     parser.add_argument("--fix", action="store_true", help="Attempt to fix issues")
     parser.add_argument("--json", action="store_true", help="Output in JSON format")
+    parser.add_argument("--format", choices=["text", "json", *WRITERS], default="text",
+                        help="Output format; ndjson and sarif stream results to stdout as files are linted")
     parser.add_argument("--exit-zero", action="store_true", help="Exit with 0 even if errors found")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Lint files in N worker processes (0 = one per CPU)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Parsed workflow cache directory")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse and lint every workflow without the caches")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="Skip files and directories matching a gitignore-style pattern (repeatable)")
+    parser.add_argument("--no-ignore", action="store_true",
+                        help="Do not read .gitignore/.workflowignore files while walking directories")
+    parser.add_argument("--select", action="append", default=[], metavar="RULES",
+                        help="Comma-separated rule names or result codes to run (default: all)")
+    parser.add_argument("--ignore", action="append", default=[], metavar="RULES",
+                        help="Comma-separated rule names or result codes to skip")
+    parser.add_argument("--list-rules", action="store_true", help="List registered rules and exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="Report per-rule time, calls and findings (bypasses the result cache)")
+    parser.add_argument("--profile-json", metavar="PATH", help="Also write the rule profile to PATH as JSON")
     args = parser.parse_args()
-
-    all_results = []
-
-    for path_str in args.workflows:
-        path = Path(path_str)
-
-        if path.is_file() and path.suffix in ['.yaml', '.yml']:
-            linter = WorkflowLinter(str(path))
-            if linter.load():
-                all_results.extend(linter.lint())
-            linter.print_results()
-        elif path.is_dir():
-            for yaml_file in path.rglob("*.yaml"):
-                linter = WorkflowLinter(str(yaml_file))
-                if linter.load():
-                    all_results.extend(linter.lint())
-                linter.print_results()
-            for yaml_file in path.rglob("*.yml"):
-                linter = WorkflowLinter(str(yaml_file))
-                if linter.load():
-                    all_results.extend(linter.lint())
-                linter.print_results()
-
-    errors = sum(1 for r in all_results if r.severity == "error")
-    warnings = sum(1 for r in all_results if r.severity == "warning")
-
-    print(f"\n{'='*60}")
-    print(f"Lint Results: {errors} errors, {warnings} warnings")
-
     if args.json:
-        import json
-        output = [
-            {
-                "file": r.file,
-                "line": r.line,
-                "rule": r.rule,
-                "severity": r.severity,
-                "message": r.message,
-                "suggestion": r.suggestion
-            }
-            for r in all_results
-        ]
-        print(json.dumps(output, indent=2))
+        args.format = "json"
+    args.profile = args.profile or bool(args.profile_json)
+
+    if args.list_rules:
+        for rule in RULE_REGISTRY.values():
+            codes = ", ".join(rule.codes) or "-"
+            print(f"{rule.name:<24} {codes}\n{'':<24} {rule.description}")
+        return
+    if not args.workflows:
+        parser.error("the following arguments are required: workflows")
+
+    try:
+        selection = RuleSelection.resolve(
+            [item for value in args.select for item in value.split(",") if item],
+            [item for value in args.ignore for item in value.split(",") if item],
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if not selection.active:
+        parser.error("no rules selected")
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    cache = None if args.no_cache else WorkflowCache(args.cache_dir)
+    # Profiling needs every rule to actually run.
+    result_cache = None if args.no_cache or args.profile else LintResultCache(args.cache_dir, selection)
+    profile = RuleProfile() if args.profile else None
+    writer = WRITERS[args.format](sys.stdout) if args.format in WRITERS else None
+    # Streaming formats keep stdout machine-readable; the summary goes to stderr.
+    report = sys.stderr if writer else sys.stdout
+    json_results = []
+    total = relinted = errors = warnings = 0
+
+    files = discover_workflows(args.workflows, args.exclude, not args.no_ignore)
+    for path, loaded, results, linted, timings in lint_files(files, jobs, cache, result_cache,
+                                                             selection=selection):
+        total += 1
+        relinted += linted
+        if profile:
+            profile.add(timings)
+        if loaded:
+            errors += sum(1 for r in results if r.severity == "error")
+            warnings += sum(1 for r in results if r.severity == "warning")
+            if writer:
+                writer.write(results)
+            elif args.format == "json":
+                json_results.extend(result_to_dict(r) for r in results)
+        if not writer:
+            print_results(path, results)
+
+    if writer:
+        writer.close(files=total, relinted=relinted, errors=errors, warnings=warnings)
+
+    print(f"\n{'='*60}", file=report)
+    print(f"Lint Results: {errors} errors, {warnings} warnings", file=report)
+    if result_cache is not None:
+        print(f"Re-linted {relinted} of {total} files ({total - relinted} unchanged, from cache)", file=report)
+
+    if args.format == "json":
+        print(json.dumps(json_results, indent=2))
+
+    if profile:
+        profile.print_report(report)
+        if args.profile_json:
+            Path(args.profile_json).write_text(json.dumps(profile.to_dict(), indent=2), encoding='utf-8')
+            print(f"Rule profile written to {args.profile_json}", file=report)
 
     if errors > 0 and not args.exit_zero:
         sys.exit(1)
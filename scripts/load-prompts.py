@@ -4,26 +4,94 @@ Prompt Loader - Loads and manages prompt collections.
 """
 
 import argparse
+import bisect
+import hashlib
+import heapq
 import json
+import math
+import os
+import re
+import socket
+import socketserver
 import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+from urllib.parse import parse_qs, urlparse
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional
 import yaml
 
+try:
+    import jinja2
+    import jinja2.meta
+except ImportError:  # .j2 prompts fall back to plain {{var}} substitution
+    jinja2 = None
+
+
+# Bump whenever the extracted metadata changes shape or meaning, so stale
+# on-disk indexes are rebuilt instead of served.
+INDEX_VERSION = 5
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+PROMPT_EXTENSIONS = ('.txt', '.md', '.j2')
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
 
-@dataclass
 class Prompt:
-    """Represents a prompt template."""
-    name: str
-    path: str
-    content: str
-    category: str = ""
-    description: str = ""
-    variables: List[str] = field(default_factory=list)
-    tags: List[str] = field(default_factory=list)
+    """Represents a prompt template.
 
-    def to_dict(self) -> Dict:
+    Only metadata is kept in memory. The body is read from ``path`` each time
+    ``content`` is accessed, unless it was supplied when the prompt was built.
+    """
+
+    __slots__ = ("name", "path", "category", "description", "variables", "tags", "digest", "_content")
+
+    def __init__(self, name: str, path: str, content: Optional[str] = None, category: str = "",
+                 description: str = "", variables: Optional[List[str]] = None,
+                 tags: Optional[List[str]] = None, digest: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self.category = category
+        self.description = description
+        self.variables = variables if variables is not None else []
+        self.tags = tags if tags is not None else []
+        self.digest = digest
+        self._content = content
+
+    @property
+    def qualified_id(self) -> str:
+        """Unique reference of the form category/name."""
+        return f"{self.category}/{self.name}" if self.category else self.name
+
+    @property
+    def file_id(self) -> str:
+        """Qualified id with the file extension, e.g. category/name.md.
+
+        Tells apart prompts whose qualified ids clash because the same name
+        exists with several extensions.
+        """
+        return self.qualified_id + Path(self.path).suffix
+
+    @property
+    def content(self) -> str:
+        """The prompt body, loaded on demand."""
+        if self._content is not None:
+            return self._content
+        return Path(self.path).read_text(encoding='utf-8')
+
+    def preview(self, limit: int = 200) -> str:
+        """Return the first limit characters of the body without reading the whole file."""
+        if self._content is not None:
+            text = self._content[:limit + 1]
+        else:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read(limit + 1)
+        return text[:limit] + "..." if len(text) > limit else text
+
+    def to_record(self) -> Dict:
+        """Metadata-only representation, as stored in the index cache."""
         return {
             "name": self.name,
             "path": self.path,
@@ -31,37 +99,509 @@ class Prompt:
             "description": self.description,
             "variables": self.variables,
             "tags": self.tags,
-            "content_preview": self.content[:200] + "..." if len(self.content) > 200 else self.content
+            "digest": self.digest,
+        }
+
+    def to_dict(self) -> Dict:
+        return {**self.to_record(), "id": self.qualified_id, "content_preview": self.preview()}
+
+    def __repr__(self) -> str:
+        return f"Prompt(name={self.name!r}, category={self.category!r}, path={self.path!r})"
+
+
+class PromptAnalyzer:
+    """Extracts description, variables and tags from prompt content in one pass.
+
+    YAML frontmatter is parsed once for ``description``/``purpose`` and
+    ``tags``. The body is then scanned by a single compiled pattern that
+    matches template variables, ``# tags:`` comment lines and every tag
+    keyword at once. Keywords only match whole words, so ``json`` no longer
+    counts as ``js``. Extra tag rules can be registered with add_tag_rule().
+
+    For Jinja templates the variables are the template's undeclared names as
+    reported by Jinja2, so ``{{ user.name }}`` and names used only in
+    ``{% if %}``/``{% for %}`` blocks are found too.
+    """
+
+    DEFAULT_TAG_RULES = {
+        "python": ["python", "pytest", "django", "flask"],
+        "javascript": ["javascript", "js", "node.js", "nodejs"],
+        "api": ["api", "apis", "endpoint", "endpoints"],
+        "testing": ["test", "tests", "testing", "tested", "unit-test", "unittest"],
+    }
+
+    FRONTMATTER_PATTERN = re.compile(r'\A---[ \t]*\n(.*?)\n---[ \t]*(?:\n|\Z)', re.DOTALL)
+
+    def __init__(self, tag_rules: Optional[Dict[str, List[str]]] = None):
+        self.keyword_tags: Dict[str, str] = {}
+        rules = self.DEFAULT_TAG_RULES if tag_rules is None else tag_rules
+        for tag, keywords in rules.items():
+            for keyword in keywords:
+                self.keyword_tags[keyword.lower()] = tag
+        self._jinja = jinja2.Environment() if jinja2 else None
+        self._compile()
+
+    def add_tag_rule(self, tag: str, keywords: List[str]):
+        """Tag prompts containing any of keywords (whole words, case-insensitive)."""
+        for keyword in keywords:
+            self.keyword_tags[keyword.lower()] = tag
+        self._compile()
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable hash of the active rules, used to invalidate cached metadata."""
+        rules = json.dumps([sorted(self.keyword_tags.items()), self._jinja is not None])
+        return hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+
+    def _compile(self):
+        keywords = sorted(self.keyword_tags, key=len, reverse=True)
+        alternatives = [
+            r'\{\{\s*(?P<variable>\w+)\s*\}\}',
+            r'#[ \t]*tags?(?:[ \t]*:|[ \t]+)[ \t]*(?P<tag_line>[^\n]+)',
+        ]
+        if keywords:
+            alternatives.append(r'(?<![\w.-])(?P<keyword>' + '|'.join(map(re.escape, keywords)) + r')(?![\w-])')
+        self._matcher = re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def analyze(self, content: str, template: bool = False) -> tuple:
+        """Return (description, variables, tags) for content.
+
+        template marks Jinja source (.j2), whose variables come from Jinja2's
+        parser when it is installed.
+        """
+        tags: Dict[str, None] = {}
+        description = ""
+
+        body = content
+        frontmatter = self.FRONTMATTER_PATTERN.match(content)
+        if frontmatter:
+            body = content[frontmatter.end():]
+            try:
+                meta = yaml.safe_load(frontmatter.group(1))
+            except yaml.YAMLError:
+                meta = None
+            if isinstance(meta, dict):
+                description = str(meta.get("description") or meta.get("purpose") or "")
+                meta_tags = meta.get("tags") or []
+                if isinstance(meta_tags, str):
+                    meta_tags = meta_tags.split(',')
+                for tag in meta_tags:
+                    tag = str(tag).strip()
+                    if tag:
+                        tags[tag] = None
+
+        if not description:
+            description = self._first_line(body)
+
+        variables: Dict[str, None] = {}
+        keyword_tags = self.keyword_tags
+        for match in self._matcher.finditer(body):
+            kind = match.lastgroup
+            if kind == "variable":
+                variables[match.group("variable")] = None
+            elif kind == "keyword":
+                tags[keyword_tags[match.group("keyword").lower()]] = None
+            else:
+                for tag in match.group("tag_line").split(','):
+                    tag = tag.strip()
+                    if tag:
+                        tags[tag] = None
+
+        if template and self._jinja is not None:
+            try:
+                ast = self._jinja.parse(body)
+            except jinja2.TemplateSyntaxError:
+                pass
+            else:
+                return description, sorted(jinja2.meta.find_undeclared_variables(ast)), list(tags)
+
+        return description, list(variables), list(tags)
+
+    @staticmethod
+    def _first_line(content: str) -> str:
+        """First non-empty line among the first five, without heading markers."""
+        for line in content.strip().split('\n', 5)[:5]:
+            line = line.strip().lstrip('#').strip()
+            if line and not line.startswith('```'):
+                return line
+        return ""
+
+
+class JinjaTemplate:
+    """A .j2 prompt compiled by Jinja2.
+
+    Its undeclared variables are known from discovery, so strict mode rejects
+    missing inputs before rendering starts.
+    """
+
+    __slots__ = ("template", "variables")
+
+    def __init__(self, template: "jinja2.Template", variables: Iterable[str]):
+        self.template = template
+        self.variables = frozenset(variables)
+
+    def render(self, variables: Dict[str, Any], strict: bool = False) -> str:
+        """Render with variables; missing ones render empty unless strict."""
+        if strict:
+            missing = self.variables.difference(variables)
+            if missing:
+                raise ValueError(f"Missing variables: {', '.join(sorted(missing))}")
+        try:
+            return self.template.render(variables)
+        except jinja2.TemplateError as e:
+            raise ValueError(f"Template error: {e}")
+
+
+class AmbiguousPromptError(ValueError):
+    """Raised when a bare prompt name matches prompts in several categories."""
+
+    def __init__(self, name: str, candidates: List[str]):
+        self.name = name
+        self.candidates = candidates
+        super().__init__(f"Ambiguous prompt name '{name}', use one of: {', '.join(candidates)}")
+
+
+def content_digest(content: str) -> str:
+    """Content address of a prompt body."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class CompiledTemplate:
+    """A prompt split once into literal text and variable slots.
+
+    Rendering fills the slots and joins the parts in a single pass, instead of
+    scanning the whole content once per variable.
+    """
+
+    __slots__ = ("parts", "slots", "variables")
+
+    def __init__(self, content: str):
+        self.parts: List[str] = []
+        self.slots: List[tuple] = []
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(content):
+            self.parts.append(content[pos:match.start()])
+            self.slots.append((len(self.parts), match.group(1), match.group(0)))
+            self.parts.append(match.group(0))
+            pos = match.end()
+        self.parts.append(content[pos:])
+        self.variables = frozenset(name for _, name, _ in self.slots)
+
+    def render(self, variables: Dict[str, Any], strict: bool = False) -> str:
+        """Fill the slots from variables.
+
+        Unknown placeholders are left as-is, or raise ValueError in strict mode.
+        """
+        parts = self.parts.copy()
+        missing = None
+        for index, name, placeholder in self.slots:
+            if name in variables:
+                parts[index] = str(variables[name])
+            elif strict:
+                missing = missing or set()
+                missing.add(name)
+        if missing:
+            raise ValueError(f"Missing variables: {', '.join(sorted(missing))}")
+        return ''.join(parts)
+
+
+class PromptRegistry:
+    """Prompts keyed by qualified id with content-addressed bodies.
+
+    Lookups by ``category/name``, by bare name or, when several files share a
+    name, by ``category/name.ext`` are dict hits. Bodies held in
+    memory and their compiled templates are stored once per content hash, so
+    files with identical content share a single copy.
+    """
+
+    def __init__(self):
+        self.by_id: Dict[str, List[Prompt]] = {}
+        self.by_name: Dict[str, List[Prompt]] = {}
+        self.by_file: Dict[str, List[Prompt]] = {}
+        self.bodies: Dict[str, str] = {}
+        self.templates: Dict[str, Dict[str, Any]] = {}
+        self.refs: Dict[str, int] = {}
+
+    def add(self, prompt: Prompt):
+        """Register a prompt, interning its body if it carries one."""
+        if prompt.digest is None:
+            prompt.digest = content_digest(prompt.content)
+        if prompt._content is not None:
+            prompt._content = self.bodies.setdefault(prompt.digest, prompt._content)
+        self.refs[prompt.digest] = self.refs.get(prompt.digest, 0) + 1
+        self.by_id.setdefault(prompt.qualified_id, []).append(prompt)
+        self.by_name.setdefault(prompt.name, []).append(prompt)
+        self.by_file.setdefault(prompt.file_id, []).append(prompt)
+
+    def remove(self, prompt: Prompt):
+        """Unregister a prompt, releasing its body once nothing else shares it."""
+        for index, key in ((self.by_id, prompt.qualified_id), (self.by_name, prompt.name),
+                           (self.by_file, prompt.file_id)):
+            index[key].remove(prompt)
+            if not index[key]:
+                del index[key]
+
+        self.refs[prompt.digest] -= 1
+        if not self.refs[prompt.digest]:
+            del self.refs[prompt.digest]
+            self.bodies.pop(prompt.digest, None)
+            self.templates.pop(prompt.digest, None)
+
+    def resolve(self, ref: str) -> Optional[Prompt]:
+        """Look up a prompt by qualified id or bare name.
+
+        Raises AmbiguousPromptError when the reference matches more than one prompt.
+        """
+        matches = self.by_id.get(ref)
+        if matches is None and '/' not in ref:
+            matches = self.by_name.get(ref)
+        if matches is None:
+            matches = self.by_file.get(ref)
+        if not matches:
+            return None
+        if len(matches) > 1:
+            # Each candidate resolves to exactly one prompt: its qualified id,
+            # or its file id where the qualified id is itself shared.
+            raise AmbiguousPromptError(ref, sorted({p.file_id if len(self.by_id[p.qualified_id]) > 1
+                                                    else p.qualified_id for p in matches}))
+        return matches[0]
+
+    def template(self, prompt: Prompt, kind: str = "text",
+                 build: Callable[[Prompt], Any] = lambda prompt: CompiledTemplate(prompt.content)):
+        """Compiled template for a prompt, shared by every prompt with the same body.
+
+        kind separates renderers of the same body, e.g. plain text and Jinja.
+        """
+        compiled = self.templates.setdefault(prompt.digest, {})
+        template = compiled.get(kind)
+        if template is None:
+            template = build(prompt)
+            compiled[kind] = template
+        return template
+
+
+class PromptIndexCache:
+    """On-disk index of parsed prompts, validated by size, mtime and content hash."""
+
+    def __init__(self, path: str, root: Path, fingerprint: str = ""):
+        self.path = Path(path)
+        self.root = str(root.resolve())
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._seen: set = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the index from disk, discarding it if it is stale or unreadable."""
+        self.entries = {}
+        self._seen = set()
+        self.hits = self.misses = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+
+        if (data.get("version") != INDEX_VERSION or data.get("root") != self.root
+                or data.get("analyzer") != self.fingerprint):
+            self._dirty = True
+            return
+        self.entries = data.get("entries", {})
+
+    def get(self, path: Path, stat: os.stat_result, digest: Optional[str] = None) -> Optional[Dict]:
+        """Return the cached record for path if it is still valid.
+
+        Without a digest only size and mtime are compared. With a digest the
+        content hash decides, which lets touched-but-unchanged files hit.
+        """
+        key = str(path)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        if digest is None:
+            if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                return None
+        elif entry["sha256"] != digest:
+            return None
+
+        with self._lock:
+            if digest is not None:
+                entry["size"] = stat.st_size
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+            self._seen.add(key)
+            self.hits += 1
+        return entry["prompt"]
+
+    def put(self, path: Path, stat: os.stat_result, digest: str, record: Dict):
+        """Store a freshly parsed record."""
+        key = str(path)
+        with self._lock:
+            self.entries[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest,
+                "prompt": record,
+            }
+            self._seen.add(key)
+            self.misses += 1
+            self._dirty = True
+
+    def save(self):
+        """Drop entries for files that disappeared and write the index atomically."""
+        stale = [key for key in self.entries if key not in self._seen]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "root": self.root,
+                "analyzer": self.fingerprint,
+                "entries": self.entries,
+            }, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def invalidate(self):
+        """Forget every cached entry and remove the index file."""
+        self.entries = {}
+        self._seen = set()
+        self._dirty = False
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts for the last discovery."""
+        return {
+            "path": str(self.path),
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
         }
 
 
+class PromptSearchIndex:
+    """Inverted full-text index over prompts with BM25 ranking.
+
+    Each prompt contributes a boosted term frequency per field, so a hit in
+    the name or description outranks the same term buried in the content.
+    Queries only touch the postings of their own terms.
+    """
+
+    FIELD_BOOSTS = {"name": 3.0, "description": 2.0, "content": 1.0}
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.doc_terms: Dict[str, List[str]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.docs: Dict[str, Prompt] = {}
+        self.total_length = 0
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase alphanumeric terms."""
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def add(self, prompt: Prompt):
+        """Index a prompt, replacing any previous version with the same path."""
+        key = prompt.path
+        if key in self.docs:
+            self.remove(key)
+
+        weighted: Dict[str, float] = {}
+        length = 0
+        for field_name, boost in self.FIELD_BOOSTS.items():
+            tokens = self.tokenize(getattr(prompt, field_name))
+            length += len(tokens)
+            for token in tokens:
+                weighted[token] = weighted.get(token, 0.0) + boost
+
+        for term, tf in weighted.items():
+            self.postings.setdefault(term, {})[key] = tf
+
+        self.docs[key] = prompt
+        self.doc_terms[key] = list(weighted)
+        self.doc_lengths[key] = length
+        self.total_length += length
+
+    def remove(self, key: str):
+        """Drop a prompt (by path) from the index."""
+        if key not in self.docs:
+            return
+
+        for term in self.doc_terms.pop(key):
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+
+        self.total_length -= self.doc_lengths.pop(key)
+        del self.docs[key]
+
+    def search(self, query: str, top_k: int = 20) -> List[tuple]:
+        """Return up to top_k (score, prompt) pairs, best first."""
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_length = (self.total_length / n_docs) or 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(self.tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for key, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(score, self.docs[key]) for key, score in best]
+
+
 class PromptLoader:
     """Loads and manages prompt collections."""
 
-    def __init__(self, prompts_dir: str = "prompts"):
+    def __init__(self, prompts_dir: str = "prompts", cache_path: Optional[str] = ".cache/prompt-index.json",
+                 workers: Optional[int] = None, analyzer: Optional[PromptAnalyzer] = None):
         self.prompts_dir = Path(prompts_dir)
+        self.workers = workers
+        self.analyzer = analyzer or PromptAnalyzer()
         self.prompts: List[Prompt] = []
         self.by_category: Dict[str, List[Prompt]] = {}
         self.by_tag: Dict[str, List[Prompt]] = {}
+        self._search_index: Optional[PromptSearchIndex] = None
+        self.registry = PromptRegistry()
+        self._snapshot: Dict[str, tuple] = {}
+        self.cache = PromptIndexCache(cache_path, self.prompts_dir, self.analyzer.fingerprint) if cache_path else None
+        self.jinja_cache_dir = Path(cache_path).parent / "jinja" if cache_path else None
+        self._jinja_env = None
 
     def discover(self) -> List[Prompt]:
         """Discover all prompts in the prompts directory."""
         self.prompts = []
+        self.by_category = {}
+        self.by_tag = {}
+        self._search_index = None
+        self.registry = PromptRegistry()
 
-        # System prompts
-        for path in self.prompts_dir.glob("system/*.txt"):
-            prompt = self._load_prompt(path, "system")
-            self.prompts.append(prompt)
-
-        # Few-shot examples
-        for path in self.prompts_dir.glob("few-shot/*.md"):
-            prompt = self._load_prompt(path, "few-shot")
-            self.prompts.append(prompt)
-
-        # Prompt templates
-        for path in self.prompts_dir.glob("templates/*.j2"):
-            prompt = self._load_prompt(path, "templates")
-            self.prompts.append(prompt)
+        self.prompts = sorted(self.iter_prompts(), key=lambda p: p.path)
 
         # Index prompts
         for prompt in self.prompts:
@@ -69,71 +609,131 @@ class PromptLoader:
 
         return self.prompts
 
-    def _load_prompt(self, path: Path, category: str) -> Prompt:
-        """Load a single prompt file."""
-        content = path.read_text(encoding='utf-8')
+    def iter_prompts(self) -> Iterator[Prompt]:
+        """Walk the prompts directory and yield prompts as soon as they are loaded.
+
+        Files are read and parsed on a thread pool while the walk continues, so
+        results arrive in completion order rather than path order.
+        """
+        if self.cache:
+            self.cache.load()
+
+        self._snapshot = {}
+        workers = self.workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            window = workers * 4
+            pending = set()
+            for path, category, stat in self._walk():
+                self._snapshot[str(path)] = (stat.st_size, stat.st_mtime_ns)
+                pending.add(pool.submit(self._load_prompt, path, category, stat))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        if self.cache:
+            self.cache.save()
+
+    def _walk(self) -> Iterator[tuple]:
+        """Yield (path, category, stat) for every prompt file under the prompts directory.
 
-        # Extract variables from template syntax
-        variables = self._extract_variables(content)
+        The category is the directory path relative to the prompts directory,
+        so prompts/analysis/x.txt belongs to "analysis". Hidden entries are skipped.
+        """
+        stack = [(str(self.prompts_dir), "")]
+        while stack:
+            directory, category = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{category}/{entry.name}" if category else entry.name))
+                    elif entry.name.endswith(PROMPT_EXTENSIONS) and entry.is_file():
+                        yield Path(entry.path), category, entry.stat()
 
-        # Extract description from first lines
-        description = self._extract_description(content)
+    def refresh(self) -> Dict[str, int]:
+        """Re-stat the prompts directory and reload only files that changed.
 
-        # Extract tags from frontmatter or content
-        tags = self._extract_tags(content)
+        Compares size and mtime against the last walk, so an unchanged library
+        costs one stat per file and no reads.
+        """
+        previous = self._snapshot
+        self._snapshot = {}
+        changed = []
+        for path, category, stat in self._walk():
+            key = str(path)
+            self._snapshot[key] = (stat.st_size, stat.st_mtime_ns)
+            if previous.get(key) != self._snapshot[key]:
+                changed.append((path, category, stat))
+        removed = [key for key in previous if key not in self._snapshot]
+
+        for key in removed:
+            self.remove_prompt(key)
+        for path, category, stat in changed:
+            self.add_prompt(self._load_prompt(path, category, stat))
+
+        if self.cache and (changed or removed):
+            self.cache.save()
+
+        updated = sum(1 for path, _, _ in changed if str(path) in previous)
+        return {"added": len(changed) - updated, "updated": updated, "removed": len(removed)}
+
+    def invalidate_cache(self):
+        """Discard the on-disk index so the next discovery re-parses everything."""
+        if self.cache:
+            self.cache.invalidate()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return index cache hit/miss counts for the last discovery."""
+        if not self.cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    def _load_prompt(self, path: Path, category: str, stat: os.stat_result) -> Prompt:
+        """Load a single prompt file, reusing the cached parse when unchanged."""
+        if not self.cache:
+            data = path.read_bytes()
+            return self._parse_prompt(path, category, data.decode('utf-8'), hashlib.sha256(data).hexdigest())
+
+        record = self.cache.get(path, stat)
+        if record is None:
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            record = self.cache.get(path, stat, digest)
+            if record is None:
+                prompt = self._parse_prompt(path, category, data.decode('utf-8'), digest)
+                self.cache.put(path, stat, digest, prompt.to_record())
+                return prompt
+
+        return Prompt(**record)
+
+    def _parse_prompt(self, path: Path, category: str, content: str, digest: str) -> Prompt:
+        """Parse prompt content into a Prompt."""
+        description, variables, tags = self.analyzer.analyze(content, template=path.suffix == '.j2')
 
         return Prompt(
             name=path.stem,
             path=str(path),
-            content=content,
             category=category,
             description=description,
             variables=variables,
-            tags=tags
+            tags=tags,
+            digest=digest
         )
 
-    def _extract_variables(self, content: str) -> List[str]:
-        """Extract template variables from content."""
-        import re
-        # Match {{variable}} or {{ var }}
-        pattern = r'\{\{\s*(\w+)\s*\}\}'
-        matches = re.findall(pattern, content)
-        return list(set(matches))
-
-    def _extract_description(self, content: str) -> str:
-        """Extract description from content."""
-        lines = content.strip().split('\n')
-        for line in lines[:5]:
-            line = line.strip().lstrip('#').strip()
-            if line and not line.startswith('```'):
-                return line
-        return ""
-
-    def _extract_tags(self, content: str) -> List[str]:
-        """Extract tags from content."""
-        tags = []
-
-        # Check for tags in comments
-        import re
-        tag_pattern = re.findall(r'#\s*tag[s]?[:\s]+([^\n]+)', content, re.IGNORECASE)
-        for tag_line in tag_pattern:
-            tags.extend([t.strip() for t in tag_line.split(',')])
-
-        # Infer tags from content
-        content_lower = content.lower()
-        if 'python' in content_lower:
-            tags.append('python')
-        if 'javascript' in content_lower or 'js' in content_lower:
-            tags.append('javascript')
-        if 'api' in content_lower or 'endpoint' in content_lower:
-            tags.append('api')
-        if 'test' in content_lower:
-            tags.append('testing')
-
-        return list(set(tags))
-
     def _index_prompt(self, prompt: Prompt):
-        """Index prompt by category and tags."""
+        """Index prompt by qualified id, category and tags."""
+        self.registry.add(prompt)
+
         if prompt.category not in self.by_category:
             self.by_category[prompt.category] = []
         self.by_category[prompt.category].append(prompt)
@@ -143,12 +743,52 @@ class PromptLoader:
                 self.by_tag[tag] = []
             self.by_tag[tag].append(prompt)
 
+        if self._search_index is not None:
+            self._search_index.add(prompt)
+
+    @property
+    def search_index(self) -> PromptSearchIndex:
+        """Full-text index, built from prompt bodies on first use."""
+        if self._search_index is None:
+            self._search_index = PromptSearchIndex()
+            for prompt in self.prompts:
+                self._search_index.add(prompt)
+        return self._search_index
+
+    def add_prompt(self, prompt: Prompt):
+        """Add a prompt and update every index incrementally."""
+        self.remove_prompt(prompt.path)
+        bisect.insort(self.prompts, prompt, key=lambda p: p.path)
+        self._index_prompt(prompt)
+
+    def remove_prompt(self, path: str) -> Optional[Prompt]:
+        """Remove the prompt loaded from path and drop it from every index."""
+        for i, prompt in enumerate(self.prompts):
+            if prompt.path == path:
+                break
+        else:
+            return None
+
+        del self.prompts[i]
+        self.by_category[prompt.category].remove(prompt)
+        if not self.by_category[prompt.category]:
+            del self.by_category[prompt.category]
+        for tag in prompt.tags:
+            self.by_tag[tag].remove(prompt)
+            if not self.by_tag[tag]:
+                del self.by_tag[tag]
+        if self._search_index is not None:
+            self._search_index.remove(path)
+        self.registry.remove(prompt)
+        return prompt
+
     def get_by_name(self, name: str) -> Optional[Prompt]:
-        """Get a prompt by name."""
-        for prompt in self.prompts:
-            if prompt.name == name:
-                return prompt
-        return None
+        """Get a prompt by qualified id (category/name), by bare name, or by
+        category/name.ext when a name exists with several extensions.
+
+        Raises AmbiguousPromptError when the reference matches several prompts.
+        """
+        return self.registry.resolve(name)
 
     def get_by_category(self, category: str) -> List[Prompt]:
         """Get prompts by category."""
@@ -158,29 +798,194 @@ class PromptLoader:
         """Get prompts by tag."""
         return self.by_tag.get(tag, [])
 
-    def search(self, query: str) -> List[Prompt]:
-        """Search prompts by content."""
-        query = query.lower()
-        results = []
-        for prompt in self.prompts:
-            if (query in prompt.name.lower() or
-                query in prompt.description.lower() or
-                query in prompt.content.lower()):
-                results.append(prompt)
-        return results
+    def search(self, query: str, top_k: int = 20) -> List[Prompt]:
+        """Search prompts by name, description and content, best match first."""
+        return [prompt for _, prompt in self.search_index.search(query, top_k)]
 
-    def render(self, name: str, variables: Dict[str, Any]) -> str:
-        """Render a prompt with variables."""
+    def compile(self, name: str) -> CompiledTemplate:
+        """Get the compiled template for a prompt, compiling it on first use."""
         prompt = self.get_by_name(name)
         if not prompt:
             raise ValueError(f"Prompt not found: {name}")
 
-        content = prompt.content
-        for key, value in variables.items():
-            content = content.replace(f'{{{{{key}}}}}', str(value))
-            content = content.replace(f'{{{{ {key} }}}}', str(value))
+        if prompt.path.endswith('.j2') and jinja2 is not None:
+            return self.registry.template(prompt, "jinja", self._compile_jinja)
+        return self.registry.template(prompt)
+
+    @property
+    def jinja_env(self) -> "jinja2.Environment":
+        """Jinja environment rooted at the prompts directory and its parent.
+
+        Compiled templates are kept in memory by the environment and written
+        to an on-disk bytecode cache shared by every process using the same
+        cache directory.
+        """
+        if self._jinja_env is None:
+            bytecode_cache = None
+            if self.jinja_cache_dir:
+                self.jinja_cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = jinja2.FileSystemBytecodeCache(str(self.jinja_cache_dir))
+            self._jinja_env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader([str(self.prompts_dir), str(self.prompts_dir.parent)]),
+                bytecode_cache=bytecode_cache,
+                undefined=jinja2.ChainableUndefined,
+                keep_trailing_newline=True,
+            )
+        return self._jinja_env
+
+    def _compile_jinja(self, prompt: Prompt) -> JinjaTemplate:
+        """Compile a .j2 prompt, from its file when it lives under the prompts directory."""
+        try:
+            try:
+                name = Path(prompt.path).relative_to(self.prompts_dir).as_posix()
+            except ValueError:
+                template = self.jinja_env.from_string(prompt.content)
+            else:
+                template = self.jinja_env.get_template(name)
+        except jinja2.TemplateError as e:
+            raise ValueError(f"Template error in {prompt.path}: {e}")
+        return JinjaTemplate(template, prompt.variables)
+
+    def render(self, name: str, variables: Dict[str, Any], strict: bool = False) -> str:
+        """Render a prompt with variables."""
+        return self.compile(name).render(variables, strict)
+
+    def render_many(self, name: str, variable_sets: Iterable[Dict[str, Any]],
+                    strict: bool = False) -> Iterator[str]:
+        """Render a prompt once per variable dict, yielding results as they are produced."""
+        template = self.compile(name)
+        for variables in variable_sets:
+            yield template.render(variables, strict)
+
+
+class PromptRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over a warm PromptLoader.
+
+    GET  /health                          library size and last refresh
+    GET  /prompts?category=...&tag=...    prompt metadata
+    GET  /search?q=...&limit=...          ranked search results
+    POST /render  {"name", "variables", "strict"} or {"name", "batch": [...], "strict"}
+    """
 
-        return content
+    server_version = "PromptLoader/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        server = self.server
+
+        with server.lock:
+            if url.path == "/health":
+                self._send_json(200, {"prompts": len(server.loader.prompts), **server.last_refresh})
+            elif url.path == "/prompts":
+                if "category" in query:
+                    prompts = server.loader.get_by_category(query["category"])
+                elif "tag" in query:
+                    prompts = server.loader.get_by_tag(query["tag"])
+                else:
+                    prompts = server.loader.prompts
+                self._send_json(200, [{"id": p.qualified_id, **p.to_record()} for p in prompts])
+            elif url.path == "/search":
+                try:
+                    limit = int(query.get("limit", 20))
+                except ValueError:
+                    self._send_json(400, {"error": "limit must be an integer"})
+                    return
+                results = server.loader.search_index.search(query.get("q", ""), limit)
+                self._send_json(200, [{"id": p.qualified_id, "score": score, **p.to_record()}
+                                      for score, p in results])
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/render":
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            name = request["name"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "Expected a JSON object with a 'name' field"})
+            return
+
+        strict = bool(request.get("strict", False))
+        try:
+            with self.server.lock:
+                if self.server.loader.get_by_name(name) is None:
+                    self._send_json(404, {"error": f"Prompt not found: {name}"})
+                    return
+                template = self.server.loader.compile(name)
+            if "batch" in request:
+                rendered = [template.render(variables, strict) for variables in request["batch"]]
+            else:
+                rendered = template.render(request.get("variables") or {}, strict)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, {"rendered": rendered})
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write(f"{format % args}\n")
+
+
+class PromptServer(ThreadingHTTPServer):
+    """Serves a discovered PromptLoader and polls the library for changes."""
+
+    daemon_threads = True
+
+    def __init__(self, loader: PromptLoader, address: tuple, poll_interval: float = 2.0,
+                 verbose: bool = False):
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.last_refresh: Dict[str, Any] = {"refreshed_at": time.time()}
+        super().__init__(address, PromptRequestHandler)
+
+    def poll_forever(self):
+        """Pick up added, changed and removed prompt files every poll_interval seconds."""
+        while True:
+            time.sleep(self.poll_interval)
+            with self.lock:
+                changes = self.loader.refresh()
+            self.last_refresh = {"refreshed_at": time.time(), **changes}
+            if self.verbose and any(changes.values()):
+                sys.stderr.write(f"Reloaded prompts: {changes}\n")
+
+    def serve(self):
+        """Start polling in the background and serve until interrupted."""
+        if self.poll_interval > 0:
+            threading.Thread(target=self.poll_forever, daemon=True).start()
+        self.serve_forever()
+
+
+class UnixPromptServer(PromptServer):
+    """PromptServer bound to a Unix domain socket."""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
 
 
 def main():
@@ -190,16 +995,55 @@ def main():
     parser.add_argument("--category", help="Filter by category")
     parser.add_argument("--tag", help="Filter by tag")
     parser.add_argument("--search", help="Search prompts")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of search results")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--render", metavar="NAME", help="Render a prompt")
     parser.add_argument("--var", action="append", metavar="KEY=VALUE", help="Variables for rendering")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Render once per JSON object line in FILE ('-' for stdin), one JSON string per line")
+    parser.add_argument("--strict", action="store_true", help="Fail when a template variable is not provided")
+    parser.add_argument("--serve", action="store_true", help="Keep the index warm and answer requests over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to serve on")
+    parser.add_argument("--socket", metavar="PATH", help="Serve on a Unix domain socket instead of TCP")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Seconds between change checks while serving (0 disables)")
+    parser.add_argument("--workers", type=int, help="Threads used to read and parse prompt files")
+    parser.add_argument("--cache", default=".cache/prompt-index.json", help="Path to the prompt index cache")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every prompt without the index cache")
+    parser.add_argument("--rebuild-index", action="store_true", help="Invalidate the index cache before discovery")
+    parser.add_argument("--cache-stats", action="store_true", help="Report index cache hits and misses")
 
     args = parser.parse_args()
 
-    loader = PromptLoader(args.dir)
+    loader = PromptLoader(args.dir, cache_path=None if args.no_cache else args.cache, workers=args.workers)
+    if args.rebuild_index:
+        loader.invalidate_cache()
     prompts = loader.discover()
 
-    if args.list:
+    if args.cache_stats:
+        stats = loader.cache_stats()
+        if stats["enabled"]:
+            print(f"Index cache: {stats['hits']} hits, {stats['misses']} misses ({stats['path']})", file=sys.stderr)
+        else:
+            print("Index cache: disabled", file=sys.stderr)
+
+    if args.serve:
+        if args.socket:
+            server = UnixPromptServer(loader, args.socket, args.poll_interval, verbose=True)
+            where = args.socket
+        else:
+            server = PromptServer(loader, (args.host, args.port), args.poll_interval, verbose=True)
+            where = f"http://{args.host}:{server.server_port}"
+        print(f"Serving {len(prompts)} prompts on {where}", file=sys.stderr)
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    elif args.list:
         if args.json:
             print(json.dumps([p.to_dict() for p in prompts], indent=2))
         else:
@@ -224,10 +1068,10 @@ def main():
             print(f"  - {p.name}")
 
     elif args.search:
-        results = loader.search(args.search)
+        results = loader.search_index.search(args.search, args.limit)
         print(f"Search results for '{args.search}':")
-        for p in results:
-            print(f"  - {p.name} ({p.category})")
+        for score, p in results:
+            print(f"  - {p.name} ({p.category}) [{score:.2f}]")
 
     elif args.render:
         variables = {}
@@ -238,8 +1082,15 @@ def main():
                     variables[key] = value
 
         try:
-            rendered = loader.render(args.render, variables)
-            print(rendered)
+            if args.batch:
+                batch_file = sys.stdin if args.batch == '-' else open(args.batch, 'r', encoding='utf-8')
+                with batch_file:
+                    variable_sets = ({**variables, **json.loads(line)} for line in batch_file if line.strip())
+                    for rendered in loader.render_many(args.render, variable_sets, strict=args.strict):
+                        print(json.dumps(rendered))
+            else:
+                rendered = loader.render(args.render, variables, strict=args.strict)
+                print(rendered)
         except ValueError as e:
             print(f"Error: {e}")
             sys.exit(1)
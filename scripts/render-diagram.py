@@ -6,9 +6,12 @@ Generates Mermaid diagrams from workflow YAML files.
 """
 
 import sys
-import yaml
 import argparse
 from pathlib import Path
+from typing import Optional
+
+from workflow_discovery import discover_workflows
+from workflow_loader import DEFAULT_CACHE_DIR, WorkflowCache, load_workflow
 
 
 def yaml_to_mermaid(yaml_content: dict) -> str:
@@ -97,12 +100,12 @@ def yaml_to_sequence_mermaid(yaml_content: dict) -> str:
     return '\n'.join(lines)
 
 
-def render_workflow(yaml_path: str, output_dir: str, format: str = 'mmd') -> list:
+def render_workflow(yaml_path: str, output_dir: str, format: str = 'mmd',
+                    cache: Optional[WorkflowCache] = None) -> list:
     """Render a single workflow to diagram."""
     generated = []
     
-    with open(yaml_path, 'r') as f:
-        workflow = yaml.safe_load(f)
+    workflow = load_workflow(yaml_path, cache)
     
     if not workflow:
         return generated
@@ -139,8 +142,16 @@ def main():
     parser.add_argument('--format', default='mmd', choices=['mmd', 'png', 'svg'],
                         help='Output format')
     parser.add_argument('--recursive', action='store_true', help='Recursively process directories')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='Skip files and directories matching a gitignore-style pattern (repeatable)')
+    parser.add_argument('--no-ignore', action='store_true',
+                        help='Do not read .gitignore/.workflowignore files while walking directories')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Parsed workflow cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Parse every workflow without the cache')
     args = parser.parse_args()
     
+    cache = None if args.no_cache else WorkflowCache(args.cache_dir)
+    
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -148,13 +159,10 @@ def main():
     
     input_path = Path(args.input)
     
-    if input_path.is_file() and input_path.suffix in ['.yaml', '.yml']:
-        generated = render_workflow(str(input_path), str(output_dir), args.format)
-        generated_files.extend(generated)
-    elif input_path.is_dir():
-        pattern = '**/*.yaml' if args.recursive else '*.yaml'
-        for yaml_file in input_path.glob(pattern):
-            generated = render_workflow(str(yaml_file), str(output_dir), args.format)
+    if (input_path.is_file() and input_path.suffix in ['.yaml', '.yml']) or input_path.is_dir():
+        workflows = discover_workflows([args.input], args.exclude, not args.no_ignore, args.recursive)
+        for yaml_file in workflows:
+            generated = render_workflow(str(yaml_file), str(output_dir), args.format, cache)
             generated_files.extend(generated)
     else:
         print(f"Error: Invalid input path: {args.input}")
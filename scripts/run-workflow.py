@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Workflow Runner - Executes a workflow's steps locally.
+
+Independent steps run concurrently on asyncio, up to --concurrency at once,
+and outputs flow between steps through {{outputs.<step>.<name>}} templates.
+Actions are Python callables registered by the modules given with --actions
+(see workflow_executor.py); --dry-run stands in for any that are missing.
+CPU-bound actions can run on a pool of --workers processes, and steps whose
+action and inputs are unchanged since an earlier run reuse its cached outputs.
+Runs are journaled in SQLite so a failed run can continue with --resume.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from workflow_executor import (DEFAULT_CONCURRENCY, ExecutionError, StepResult, WorkflowExecutor, action_name,
+                               load_actions)
+from workflow_journal import DEFAULT_JOURNAL, Journal
+from workflow_loader import DEFAULT_CACHE_DIR, WorkflowCache, load_workflow
+from workflow_step_cache import DEFAULT_MAX_BYTES, DEFAULT_STEP_CACHE_DIR, StepCache
+
+STATUS_ICONS = {'succeeded': '✅', 'failed': '❌', 'skipped': '⏭️ '}
+
+
+def parse_inputs(value: str) -> Dict[str, Any]:
+    """Parse --input: a JSON object, or @path to a file holding one."""
+    text = Path(value[1:]).read_text(encoding='utf-8') if value.startswith('@') else value
+    inputs = json.loads(text)
+    if not isinstance(inputs, dict):
+        raise ValueError("workflow inputs must be a JSON object")
+    return inputs
+
+
+def print_step(result: StepResult):
+    """Report a step as soon as it finishes."""
+    line = f"{STATUS_ICONS.get(result.status, '•')} {result.name} ({result.duration * 1000:.1f} ms"
+    line += ", cached)" if result.cached else ")"
+    if result.error:
+        line += f": {result.error}"
+    print(line, flush=True)
+
+
+def list_runs(journal: Journal):
+    """Print the most recent journaled runs."""
+    runs = journal.runs()
+    if not runs:
+        print(f"No runs journaled in {journal.path}")
+    for run in runs:
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run.started_at))
+        print(f"{run.run_id}  {run.status:<9}  {started}  {run.name or run.workflow}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a workflow locally')
+    parser.add_argument('--workflow', help='Workflow YAML file (defaults to the resumed run\'s)')
+    parser.add_argument('--input', help='Workflow inputs as a JSON object, or @FILE')
+    parser.add_argument('--actions', action='append', default=[], metavar='MODULE',
+                        help='Python file or module that registers action implementations (repeatable)')
+    parser.add_argument('--concurrency', type=int,
+                        help=f'Most steps running at once (default {DEFAULT_CONCURRENCY}, '
+                             '1 if the workflow sets config.parallel_execution: false)')
+    parser.add_argument('--workers', type=int,
+                        help='Worker processes for process-class actions (default: one per CPU)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Run unregistered actions as stubs whose outputs are all null')
+    parser.add_argument('--json', metavar='FILE', help='Write step results and outputs as JSON')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Parsed workflow cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Parse the workflow without the cache')
+    parser.add_argument('--step-cache-dir', default=DEFAULT_STEP_CACHE_DIR, help='Step output cache directory')
+    parser.add_argument('--step-cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar='MB',
+                        help='Step output cache budget; least recently used entries are evicted beyond it')
+    parser.add_argument('--no-step-cache', action='store_true', help='Run every step, without reusing outputs')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL, help='SQLite run journal')
+    parser.add_argument('--no-journal', action='store_true', help='Do not record the run')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='Continue a journaled run, keeping the outputs of steps that succeeded')
+    parser.add_argument('--list-runs', action='store_true', help='List recent journaled runs and exit')
+    args = parser.parse_args()
+
+    if args.no_journal and (args.resume or args.list_runs):
+        parser.error("--resume and --list-runs need the journal")
+    journal = None if args.no_journal else Journal(args.journal)
+    if args.list_runs:
+        list_runs(journal)
+        return
+
+    run_id = None
+    completed = {}
+    try:
+        workflow_path = args.workflow
+        inputs = parse_inputs(args.input) if args.input is not None else {}
+        if args.resume:
+            record = journal.run(args.resume)
+            if record is None:
+                raise ValueError(f"no run {args.resume} in {args.journal}")
+            if args.input is not None and inputs != record.inputs:
+                raise ValueError("a resumed run keeps its original --input")
+            run_id, inputs = record.run_id, record.inputs
+            workflow_path = workflow_path or record.workflow
+        if not workflow_path:
+            parser.error("--workflow is required unless resuming a run")
+
+        workflow = load_workflow(workflow_path, None if args.no_cache else WorkflowCache(args.cache_dir))
+        if not isinstance(workflow, dict):
+            raise ValueError("workflow file does not contain a mapping")
+        actions = {}
+        for spec in args.actions:
+            actions.update(load_actions(spec))
+        # After the actions, whose modules may define the classes of journaled outputs
+        if run_id is not None:
+            completed = journal.completed_steps(run_id, workflow.get('steps') or [])
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    concurrency = args.concurrency
+    if concurrency is None:
+        parallel = (workflow.get('config') or {}).get('parallel_execution', True)
+        concurrency = DEFAULT_CONCURRENCY if parallel else 1
+
+    def on_step(result: StepResult):
+        print_step(result)
+        if journal is not None and not result.resumed:
+            step = executor.graph.steps[executor.graph.index[result.name]]
+            journal.record_step(run_id, step, action_name(step), result)
+
+    def on_start(name: str):
+        if journal is not None:
+            journal.step_started(run_id, name)
+
+    try:
+        step_cache = None if args.no_step_cache else StepCache(args.step_cache_dir, args.step_cache_size * 1024 * 1024)
+        executor = WorkflowExecutor(workflow, actions, concurrency, args.dry_run, on_step=on_step,
+                                    workers=args.workers, step_cache=step_cache, completed=completed,
+                                    on_start=on_start)
+    except ExecutionError as e:
+        print(f"Error: cannot run {workflow_path}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if journal is not None:
+        run_id = journal.start_run(workflow_path, workflow, inputs, run_id)
+    verb = f"Resuming {run_id} of" if args.resume else "Running"
+    print(f"🚀 {verb} {workflow.get('name', workflow_path)} "
+          f"({len(executor.graph)} steps, concurrency {executor.concurrency})")
+    if completed:
+        print(f"⏩ {len(completed)} steps already completed")
+    result = executor.run_sync(inputs)
+
+    counts = {status: sum(1 for step in result.steps if step.status == status) for status in STATUS_ICONS}
+    step_time = sum(step.duration for step in result.steps)
+    print("\n" + "=" * 60)
+    print(f"{'✅ Workflow succeeded' if result.succeeded else '❌ Workflow failed'}: "
+          f"{counts['succeeded']} succeeded, {counts['failed']} failed, {counts['skipped']} skipped")
+    print(f"⏱️  Wall time {result.wall_time:.3f}s for {step_time:.3f}s of step time")
+    if result.cache is not None:
+        print(f"💾 Step cache: {result.cache['hits']} hits, {result.cache['misses']} misses, "
+              f"{result.cache['evictions']} evicted, {result.cache['bytes'] / (1024 * 1024):.1f} MB stored")
+
+    if journal is not None:
+        journal.finish_run(run_id, 'succeeded' if result.succeeded else 'failed')
+        journal.close()
+        print(f"📓 Run {run_id} journaled in {args.journal}")
+        if not result.succeeded:
+            print(f"   Resume with: python scripts/run-workflow.py --resume {run_id}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'run_id': run_id, **result.to_dict()}, indent=2, default=str),
+                                   encoding='utf-8')
+        print(f"Results written to {args.json}")
+
+    sys.exit(0 if result.succeeded else 1)
+
+
+if __name__ == '__main__':
+    main()
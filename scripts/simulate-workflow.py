@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Workflow Simulator - Predicts a workflow's wall-clock time for N workers.
+
+Replays run-workflow.py's scheduler as a discrete-event simulation: a step
+becomes ready when its last dependency finishes, ready steps start in the
+order they became ready whenever one of the N workers is free, and each takes
+its estimated duration. Estimates come from a --durations file (seconds per
+step name or action), else the median of past runs in the run journal, else
+--default-duration.
+
+For each worker count it reports the makespan, speedup and worker
+utilization, along with the critical path (the makespan no number of workers
+can beat) and the saturation point: the fewest workers whose makespan is
+within --tolerance of that floor, past which adding workers stops helping.
+"""
+
+import argparse
+import heapq
+import json
+import statistics
+import sys
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from workflow_executor import action_name
+from workflow_graph import WorkflowGraph
+from workflow_journal import DEFAULT_JOURNAL, Journal
+from workflow_loader import DEFAULT_CACHE_DIR, WorkflowCache, load_workflow, parse_yaml
+
+DEFAULT_DURATION = 1.0
+DEFAULT_TOLERANCE = 0.01
+
+
+@dataclass
+class Simulation:
+    """Outcome of simulating one worker count."""
+    workers: int
+    makespan: float
+    busy: List[float]
+    starts: List[float]
+
+    @property
+    def utilization(self) -> float:
+        """Share of the workers' time spent running steps."""
+        if not self.makespan:
+            return 0.0
+        return sum(self.busy) / (self.makespan * self.workers)
+
+    def to_dict(self, serial: float) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'makespan_s': round(self.makespan, 6),
+            'speedup': round(serial / self.makespan, 3) if self.makespan else None,
+            'utilization': round(self.utilization, 4),
+            'worker_busy_s': [round(busy, 6) for busy in self.busy],
+        }
+
+
+def estimate_durations(graph: WorkflowGraph, declared: Dict[str, float],
+                       learned: Dict[str, List[float]], default: float) -> Tuple[List[float], Dict[str, int]]:
+    """Duration of each step, and how many estimates came from each source.
+
+    A declared step name wins over a declared action, which wins over the
+    median of journaled runs of that action.
+    """
+    durations = []
+    sources = {'declared': 0, 'journal': 0, 'default': 0}
+    for name, step in zip(graph.names, graph.steps):
+        action = action_name(step)
+        if name in declared or action in declared:
+            durations.append(float(declared.get(name, declared.get(action))))
+            sources['declared'] += 1
+        elif learned.get(action):
+            durations.append(statistics.median(learned[action]))
+            sources['journal'] += 1
+        else:
+            durations.append(default)
+            sources['default'] += 1
+    return durations, sources
+
+
+def simulate(graph: WorkflowGraph, durations: Sequence[float], workers: int) -> Simulation:
+    """Run the scheduler over the graph's schedulable steps with a fixed worker pool.
+
+    Events are step completions in a heap keyed by finish time; at each one
+    the finished step's worker is freed and newly ready steps start on the
+    lowest-numbered free workers. O((steps + edges) log steps).
+    """
+    schedulable = set(graph.order)
+    pending = [len(deps) for deps in graph.deps]
+    ready = deque(i for i in graph.order if not graph.deps[i])
+    free = list(range(workers))
+    events: List[Tuple[float, int, int]] = []
+    busy = [0.0] * workers
+    starts = [0.0] * len(graph)
+    now = 0.0
+
+    while ready or events:
+        while ready and free:
+            node = ready.popleft()
+            worker = heapq.heappop(free)
+            starts[node] = now
+            busy[worker] += durations[node]
+            heapq.heappush(events, (now + durations[node], node, worker))
+
+        now, node, worker = heapq.heappop(events)
+        heapq.heappush(free, worker)
+        for child in graph.dependents[node]:
+            pending[child] -= 1
+            if pending[child] == 0 and child in schedulable:
+                ready.append(child)
+
+    return Simulation(workers, now, busy, starts)
+
+
+def saturation_point(graph: WorkflowGraph, durations: Sequence[float], floor: float,
+                     tolerance: float, upper: int) -> Tuple[int, Dict[int, Simulation]]:
+    """Fewest workers whose makespan is within tolerance of floor.
+
+    With upper workers (one per step) every step starts the moment it is
+    ready, so the makespan is the critical path itself. Binary search over
+    1..upper relies on more workers never making the schedule slower, which
+    holds for all but contrived graphs. Returns the point and every
+    simulation run along the way.
+    """
+    runs: Dict[int, Simulation] = {}
+    low, high = 1, max(upper, 1)
+    while low < high:
+        middle = (low + high) // 2
+        runs[middle] = simulate(graph, durations, middle)
+        if runs[middle].makespan <= floor * (1 + tolerance):
+            high = middle
+        else:
+            low = middle + 1
+    if low not in runs:
+        runs[low] = simulate(graph, durations, low)
+    return low, runs
+
+
+def default_worker_counts(width: int) -> List[int]:
+    """Powers of two up to the graph's widest level, plus that width."""
+    counts = []
+    n = 1
+    while n < width:
+        counts.append(n)
+        n *= 2
+    counts.append(max(width, 1))
+    return counts
+
+
+def load_declared(path: Optional[str]) -> Dict[str, float]:
+    """Read a durations file: a YAML or JSON mapping of step or action names to seconds."""
+    if not path:
+        return {}
+    data = parse_yaml(Path(path).read_bytes(), path)
+    if not isinstance(data, dict) or not all(isinstance(v, (int, float)) for v in data.values()):
+        raise ValueError(f"{path} must map step or action names to durations in seconds")
+    return {str(key): float(value) for key, value in data.items()}
+
+
+def load_learned(journal_path: Optional[str], workflow_path: str) -> Dict[str, List[float]]:
+    """Journaled durations by action: this workflow's runs, falling back to any workflow's."""
+    if not journal_path or not Path(journal_path).exists():
+        return {}
+    journal = Journal(journal_path)
+    try:
+        learned = journal.action_durations()
+        learned.update(journal.action_durations(workflow_path))
+    finally:
+        journal.close()
+    return learned
+
+
+def format_seconds(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a human-readable capacity plan."""
+    print(f"🔮 {report['workflow']}: {report['steps']} steps, "
+          f"{format_seconds(report['serial_s'])} of work, widest level {report['max_width']}")
+    sources = report['estimates']
+    print(f"   Estimates: {sources['declared']} declared, {sources['journal']} from journal, "
+          f"{sources['default']} default")
+    if report['unschedulable']:
+        print(f"   ⚠️  {len(report['unschedulable'])} steps on or behind a dependency cycle are left out")
+
+    print(f"\n{'Workers':>8} {'Makespan':>12} {'Speedup':>8} {'Utilization':>12}")
+    print("-" * 44)
+    for run in report['simulations']:
+        speedup = f"{run['speedup']:.2f}x" if run['speedup'] else '-'
+        print(f"{run['workers']:>8} {format_seconds(run['makespan_s']):>12} {speedup:>8} {run['utilization']:>11.1%}")
+
+    critical = report['critical_path']
+    print(f"\n🛤️  Critical path: {format_seconds(critical['length_s'])} through {len(critical['steps'])} steps")
+    print(f"   {' → '.join(critical['steps'])}")
+    saturation = report['saturation']
+    print(f"📈 Saturation: {saturation['workers']} workers reach {format_seconds(saturation['makespan_s'])}, "
+          f"within {report['tolerance']:.0%} of the critical path; more workers stop helping")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate a workflow run and plan worker capacity')
+    parser.add_argument('workflow', help='Workflow YAML file')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='Worker counts to simulate (default: powers of two up to the widest level)')
+    parser.add_argument('--durations', metavar='FILE', help='YAML/JSON mapping of step or action names to seconds')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL,
+                        help='Run journal to learn durations from (median per action)')
+    parser.add_argument('--no-journal', action='store_true', help='Do not learn durations from the run journal')
+    parser.add_argument('--default-duration', type=float, default=DEFAULT_DURATION,
+                        help='Seconds assumed for steps with no other estimate')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='How close to the critical path counts as saturated (fraction)')
+    parser.add_argument('--json', metavar='FILE', help='Write the report as JSON')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Parsed workflow cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Parse the workflow without the cache')
+    args = parser.parse_args()
+
+    try:
+        workflow = load_workflow(args.workflow, None if args.no_cache else WorkflowCache(args.cache_dir))
+        if not isinstance(workflow, dict):
+            raise ValueError("workflow file does not contain a mapping")
+        declared = load_declared(args.durations)
+        learned = {} if args.no_journal else load_learned(args.journal, args.workflow)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.workers and min(args.workers) < 1:
+        parser.error("--workers must be at least 1")
+
+    graph = WorkflowGraph(workflow.get('steps') or [])
+    durations, sources = estimate_durations(graph, declared, learned, args.default_duration)
+    schedulable = graph.order
+    serial = sum(durations[i] for i in schedulable)
+    width, _ = graph.max_width()
+    floor, path = graph.critical_path(durations)
+
+    saturation, runs = saturation_point(graph, durations, floor, args.tolerance, len(schedulable))
+    for workers in args.workers or default_worker_counts(width):
+        if workers not in runs:
+            runs[workers] = simulate(graph, durations, workers)
+    shown = sorted(set(args.workers or default_worker_counts(width)) | {saturation})
+
+    report = {
+        'workflow': workflow.get('name', args.workflow),
+        'steps': len(graph),
+        'unschedulable': [graph.names[i] for i in graph.blocked],
+        'serial_s': round(serial, 6),
+        'max_width': width,
+        'estimates': sources,
+        'tolerance': args.tolerance,
+        'durations_s': {graph.names[i]: durations[i] for i in schedulable},
+        'critical_path': {'length_s': round(floor, 6), 'steps': [graph.names[i] for i in path]},
+        'saturation': runs[saturation].to_dict(serial),
+        'simulations': [runs[workers].to_dict(serial) for workers in shown],
+    }
+    print_report(report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,16 +6,26 @@ Validates workflow YAML files against schema and best practices.
 """
 
 import sys
+import json
 import yaml
 import argparse
+from functools import lru_cache
 from pathlib import Path
-from jsonschema import validate, ValidationError
+from typing import Optional, Union
+from jsonschema import validators
+from jsonschema.exceptions import best_match
 
+from workflow_discovery import discover_workflows
+from workflow_graph import WorkflowGraph
+from workflow_loader import DEFAULT_CACHE_DIR, WorkflowCache, load_workflow
 
-def load_yaml(file_path: str) -> dict:
+
+DEFAULT_SCHEMA = Path(__file__).resolve().parent.parent / 'schemas' / 'workflow-schema.json'
+
+
+def load_yaml(file_path: str, cache: Optional[WorkflowCache] = None) -> dict:
     """Load and parse YAML file."""
-    with open(file_path, 'r') as f:
-        return yaml.safe_load(f)
+    return load_workflow(file_path, cache)
 
 
 def validate_workflow_structure(workflow: dict, file_path: str) -> list:
@@ -38,118 +48,150 @@ def validate_workflow_structure(workflow: dict, file_path: str) -> list:
 
 
 def validate_dependencies(workflow: dict, file_path: str) -> list:
-    """Validate step dependencies are valid."""
-    errors = []
-    step_names = {step.get('name') for step in workflow.get('steps', [])}
-    
-    for step in workflow.get('steps', []):
-        depends_on = step.get('depends_on', [])
-        for dep in depends_on:
-            if dep not in step_names:
-                errors.append(
-                    f"Step '{step['name']}' depends on unknown step '{dep}' in {file_path}"
-                )
-    
-    return errors
+    """Validate step dependencies (needs and depends_on) are valid."""
+    graph = WorkflowGraph(workflow.get('steps', []))
+    return [
+        f"Step '{graph.names[i]}' depends on unknown step '{dep}' in {file_path}"
+        for i, dep in graph.unknown
+    ]
+
+
+# Cycle groups larger than this list only their first few steps.
+MAX_CYCLE_MEMBERS_SHOWN = 10
 
 
 def detect_cycles(workflow: dict) -> list:
-    """Detect circular dependencies."""
+    """Detect circular dependencies, reporting every cycle group.
+
+    Finds strongly connected components over needs and depends_on in one
+    linear, non-recursive pass, so it scales to very large generated
+    workflows.
+    """
     errors = []
-    steps = workflow.get('steps', [])
-    
-    # Build adjacency list
-    graph = {step.get('name'): set(step.get('depends_on', [])) for step in steps}
-    
-    # DFS cycle detection
-    visited = set()
-    rec_stack = set()
-    
-    def detect_cycle(node, path):
-        if node not in visited:
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    if detect_cycle(neighbor, path + [node]):
-                        return True
-                elif neighbor in rec_stack:
-                    errors.append(
-                        f"Circular dependency detected: {' -> '.join(path + [node, neighbor])}"
-                    )
-                    return True
-            
-            rec_stack.remove(node)
-        return False
-    
-    for node in graph:
-        if node not in visited:
-            detect_cycle(node, [node])
-    
+    graph = WorkflowGraph(workflow.get('steps', []))
+
+    for group in graph.cycle_groups():
+        cycle = ' -> '.join(graph.names[i] for i in graph.find_cycle(group))
+        message = f"Circular dependency detected: {cycle}"
+        if len(group) > 1 and cycle.count(' -> ') < len(group):
+            members = ', '.join(graph.names[i] for i in group[:MAX_CYCLE_MEMBERS_SHOWN])
+            if len(group) > MAX_CYCLE_MEMBERS_SHOWN:
+                members += ', ...'
+            message += f" (cycle group of {len(group)} steps: {members})"
+        errors.append(message)
+
     return errors
 
 
-def validate_against_schema(workflow: dict, schema: dict) -> list:
-    """Validate workflow against JSON schema."""
+def compile_schema(schema: dict):
+    """Check a JSON schema once and build a reusable validator for it."""
+    cls = validators.validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema, format_checker=cls.FORMAT_CHECKER)
+
+
+@lru_cache(maxsize=None)
+def load_schema_validator(schema_path: str):
+    """Load and compile the schema at schema_path, once per process."""
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        return compile_schema(json.load(f))
+
+
+def format_error_path(path) -> str:
+    """Render a jsonschema error path as steps[2].needs."""
+    rendered = ''
+    for part in path:
+        rendered += f"[{part}]" if isinstance(part, int) else (f".{part}" if rendered else str(part))
+    return rendered or '<root>'
+
+
+def error_sort_key(error):
+    """Order errors by document position, with list indexes compared numerically."""
+    return [(isinstance(part, str), part) for part in error.absolute_path]
+
+
+def most_specific_error(error):
+    """For a oneOf/anyOf failure, pick the error from the branch that fits the value's type.
+
+    Branches rejected only for being the wrong type say little about what
+    is actually wrong, so they are skipped when another branch applies.
+    """
+    if not error.context:
+        return error
+    relevant = [
+        e for e in error.context
+        if not (e.validator == 'type' and not e.relative_path)
+    ]
+    return most_specific_error(best_match(relevant)) if relevant else error
+
+
+def validate_against_schema(workflow: dict, schema: Union[dict, object], file_path: str = '') -> list:
+    """Validate workflow against a JSON schema, reporting every violation.
+
+    schema may be a compiled validator (see load_schema_validator) or a raw
+    schema dict, which is compiled on each call.
+    """
+    validator = compile_schema(schema) if isinstance(schema, dict) else schema
+    location = f" in {file_path}" if file_path else ""
     errors = []
-    try:
-        validate(instance=workflow, schema=schema)
-    except ValidationError as e:
-        errors.append(f"Schema validation failed: {e.message}")
-    
+    for error in sorted(validator.iter_errors(workflow), key=error_sort_key):
+        error = most_specific_error(error)
+        errors.append(
+            f"Schema validation failed{location}: {format_error_path(error.absolute_path)}: {error.message}"
+        )
     return errors
 
 
 def main():
     parser = argparse.ArgumentParser(description='Validate workflow YAML files')
     parser.add_argument('paths', nargs='+', help='Paths to validate')
-    parser.add_argument('--schema', default='schemas/workflow-schema.json',
-                        help='Path to JSON schema')
+    parser.add_argument('--schema', default=str(DEFAULT_SCHEMA),
+                        help='Path to JSON schema (default: the bundled workflow schema)')
     parser.add_argument('--skip-schema', action='store_true',
                         help='Skip JSON schema validation')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='Skip files and directories matching a gitignore-style pattern (repeatable)')
+    parser.add_argument('--no-ignore', action='store_true',
+                        help='Do not read .gitignore/.workflowignore files while walking directories')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Parsed workflow cache directory')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Parse every workflow without the cache')
     args = parser.parse_args()
     
     all_errors = []
+    cache = None if args.no_cache else WorkflowCache(args.cache_dir)
     
     # Load schema if not skipped
     schema = None
     if not args.skip_schema:
         try:
-            schema = load_yaml(args.schema)
+            schema = load_schema_validator(args.schema)
         except FileNotFoundError:
             print(f"Warning: Schema file not found: {args.schema}")
     
     # Process each path
-    for path_str in args.paths:
-        path = Path(path_str)
+    for file_path in discover_workflows(args.paths, args.exclude, not args.no_ignore):
+        print(f"Validating: {file_path}")
+        
+        try:
+            workflow = load_yaml(str(file_path), cache)
+        except yaml.YAMLError as e:
+            all_errors.append(f"YAML syntax error in {file_path}: {e}")
+            continue
+        
+        # Structure validation
+        all_errors.extend(validate_workflow_structure(workflow, str(file_path)))
+        
+        # Dependency validation
+        all_errors.extend(validate_dependencies(workflow, str(file_path)))
         
-        if path.is_file() and path.suffix in ['.yaml', '.yml']:
-            files = [path]
-        else:
-            files = list(path.rglob('*.yaml')) + list(path.rglob('*.yml'))
+        # Cycle detection
+        all_errors.extend(detect_cycles(workflow))
         
-        for file_path in files:
-            print(f"Validating: {file_path}")
-            
-            try:
-                workflow = load_yaml(str(file_path))
-            except yaml.YAMLError as e:
-                all_errors.append(f"YAML syntax error in {file_path}: {e}")
-                continue
-            
-            # Structure validation
-            all_errors.extend(validate_workflow_structure(workflow, str(file_path)))
-            
-            # Dependency validation
-            all_errors.extend(validate_dependencies(workflow, str(file_path)))
-            
-            # Cycle detection
-            all_errors.extend(detect_cycles(workflow))
-            
-            # Schema validation
-            if schema and workflow:
-                all_errors.extend(validate_against_schema(workflow, schema))
+        # Schema validation
+        if schema and workflow:
+            all_errors.extend(validate_against_schema(workflow, schema, str(file_path)))
     
     # Report results
     if all_errors:
@@ -0,0 +1,142 @@
+"""
+Workflow Discovery - Finds workflow files for the workflow tools.
+
+lint-workflow.py, validate-workflow.sh and render-diagram.py all expand file
+and directory arguments into workflow files. This module walks each directory
+once with os.scandir, picking up both .yaml and .yml files, prunes vendored
+and hidden directories before descending into them, and honors .gitignore /
+.workflowignore files and --exclude patterns. Paths are yielded as they are
+found so callers can start work before the walk finishes.
+"""
+
+import os
+import re
+from fnmatch import translate
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+WORKFLOW_EXTENSIONS = ('.yaml', '.yml')
+
+IGNORE_FILES = ('.gitignore', '.workflowignore')
+
+# Never descended into: dependency trees, VCS metadata and tool caches.
+VENDORED_DIRS = frozenset({
+    'node_modules', 'vendor', 'third_party', 'site-packages', '__pycache__',
+    'venv', '.venv', '.tox', '.nox', '.git', '.hg', '.svn', '.cache',
+})
+
+
+class IgnorePattern(NamedTuple):
+    """One compiled line of an ignore file, in gitignore's basic syntax.
+
+    A pattern containing a slash is anchored to the directory of the file
+    that declared it (base); otherwise it matches an entry's name at any
+    depth. A trailing slash matches directories only and a leading ! re-includes.
+    """
+    regex: re.Pattern
+    base: str
+    anchored: bool
+    dir_only: bool
+    negate: bool
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if not self.anchored:
+            return self.regex.match(name) is not None
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def compile_patterns(lines: Iterable[str], base: str = '') -> Tuple[IgnorePattern, ...]:
+    """Compile ignore-file lines declared in directory base (relative to the walk root)."""
+    patterns = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        anchored = '/' in line
+        line = line.lstrip('/')
+        if not line:
+            continue
+        patterns.append(IgnorePattern(re.compile(translate(line)), base, anchored, dir_only, negate))
+    return tuple(patterns)
+
+
+def is_ignored(patterns: Sequence[IgnorePattern], rel_path: str, name: str, is_dir: bool) -> bool:
+    """Whether the last pattern matching an entry excludes it."""
+    ignored = False
+    for pattern in patterns:
+        if pattern.negate == ignored and pattern.matches(rel_path, name, is_dir):
+            ignored = not pattern.negate
+    return ignored
+
+
+def read_ignore_files(directory: str, base: str) -> Tuple[IgnorePattern, ...]:
+    """Compile the ignore files found directly in directory."""
+    patterns: Tuple[IgnorePattern, ...] = ()
+    for filename in IGNORE_FILES:
+        try:
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                patterns += compile_patterns(f, base)
+        except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError):
+            continue
+    return patterns
+
+
+def walk_workflows(root: str, excludes: Sequence[str] = (), use_ignore_files: bool = True,
+                   recursive: bool = True, extensions: Tuple[str, ...] = WORKFLOW_EXTENSIONS) -> Iterator[Path]:
+    """Yield workflow files under root in a single scandir walk.
+
+    Files in a directory come before its subdirectories, each in name order,
+    so the output is stable across runs and platforms. Hidden and vendored
+    directories are pruned without being read.
+    """
+    root_patterns = compile_patterns(excludes)
+    stack: List[Tuple[str, str, Tuple[IgnorePattern, ...]]] = [(root, '', root_patterns)]
+    while stack:
+        directory, rel_dir, patterns = stack.pop()
+        if use_ignore_files:
+            patterns = patterns + read_ignore_files(directory, rel_dir)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if entry.is_dir(follow_symlinks=False):
+                if recursive and not name.startswith('.') and name not in VENDORED_DIRS \
+                        and not is_ignored(patterns, rel_path, name, True):
+                    subdirs.append((entry.path, rel_path, patterns))
+            elif name.endswith(extensions) and entry.is_file() \
+                    and not is_ignored(patterns, rel_path, name, False):
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def discover_workflows(paths: Iterable[str], excludes: Sequence[str] = (), use_ignore_files: bool = True,
+                       recursive: bool = True) -> Iterator[Path]:
+    """Expand file and directory arguments into a stream of workflow files.
+
+    Files named explicitly are yielded as given if they have a workflow
+    extension; directories are walked with walk_workflows.
+    """
+    for path_str in paths:
+        path = Path(path_str)
+        if path.is_file():
+            if path.suffix in WORKFLOW_EXTENSIONS:
+                yield path
+        elif path.is_dir():
+            yield from walk_workflows(str(path), excludes, use_ignore_files, recursive)
@@ -0,0 +1,441 @@
+"""
+Workflow Executor - Runs workflow steps concurrently on asyncio.
+
+Each step's `action` (or `agent`, looked up as "agent:<name>") resolves to a
+Python callable in an action registry. A step starts as soon as everything it
+`needs`/`depends_on` has finished, so independent branches overlap and the
+wall time of a run tends towards the workflow's critical path. A global
+semaphore bounds how many steps run at once.
+
+Actions are called as action(params, inputs) with every {{ ... }} template in
+the step already rendered, and return a mapping of outputs (or a bare value
+for a step with a single declared output). Declared outputs are then visible
+to later steps as outputs.<step>.<name> and steps.<step>.outputs.<name>.
+Coroutine functions are awaited on the event loop; plain functions run in the
+loop's default thread pool, or on worker processes when the action is
+registered with execution='process' or the step sets `execution: process`
+(see workflow_process_pool.py). With a StepCache, steps whose action and
+rendered params/inputs match an earlier run reuse its outputs instead of
+running (see workflow_step_cache.py). Steps passed in `completed`, such as
+those a resumed run already finished, are not run again.
+"""
+
+import asyncio
+import functools
+import importlib
+import importlib.util
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from workflow_expressions import compile_expression, compile_template
+from workflow_graph import WorkflowGraph
+from workflow_process_pool import ProcessPool
+from workflow_step_cache import MISSING, StepCache, action_identity, step_key
+
+# Matches max_parallel_steps in agents/orchestrator-agents/workflow-runner-agent.md.
+DEFAULT_CONCURRENCY = 4
+
+# Where an action runs: on the event loop, in the thread pool, or on a worker process.
+EXECUTION_CLASSES = ('async', 'thread', 'process')
+
+# Prefix of the error of a step skipped because a step it depends on, directly
+# or transitively, failed.
+DEPENDENCY_FAILED = 'dependency failed'
+
+ACTIONS: Dict[str, Callable[..., Any]] = {}
+
+# Action files loaded so far, re-imported by process pool workers that do not fork.
+ACTION_FILES: List[str] = []
+
+
+def action(name: str, execution: Optional[str] = None):
+    """Register a callable as the implementation of an action name.
+
+    execution picks the action's execution class; by default coroutine
+    functions are 'async' and everything else 'thread'.
+    """
+    if execution is not None and execution not in EXECUTION_CLASSES:
+        raise ValueError(f"Unknown execution class {execution!r}; expected one of {', '.join(EXECUTION_CLASSES)}")
+
+    def register(func: Callable[..., Any]) -> Callable[..., Any]:
+        if execution is not None:
+            func.execution = execution
+        ACTIONS[name] = func
+        return func
+    return register
+
+
+def load_actions(spec: str) -> Dict[str, Callable[..., Any]]:
+    """Import a module of actions by file path or dotted name.
+
+    The module registers its actions with @action, or exposes an ACTIONS
+    mapping of action name to callable. Returns the actions it provides.
+    """
+    before = dict(ACTIONS)
+    if spec.endswith('.py') or Path(spec).is_file():
+        path = Path(spec).resolve()
+        module_name = path.stem.replace('-', '_')
+        module_spec = importlib.util.spec_from_file_location(module_name, path)
+        if module_spec is None or module_spec.loader is None:
+            raise ImportError(f"Cannot load actions from {spec}")
+        module = importlib.util.module_from_spec(module_spec)
+        # Registered so actions pickle by reference for process pool workers.
+        sys.modules[module_name] = module
+        module_spec.loader.exec_module(module)
+        if str(path) not in ACTION_FILES:
+            ACTION_FILES.append(str(path))
+    else:
+        module = importlib.import_module(spec)
+
+    provided = {name: func for name, func in ACTIONS.items() if before.get(name) is not func}
+    provided.update(getattr(module, 'ACTIONS', None) or {})
+    return provided
+
+
+def load_action_files(paths: List[str]):
+    """Process pool initializer: import action files not inherited from the parent."""
+    for path in paths:
+        if Path(path).stem.replace('-', '_') not in sys.modules:
+            load_actions(path)
+
+
+def action_name(step: Dict[str, Any]) -> str:
+    """Registry key for a step: its action, or agent:<name> for agent steps."""
+    if step.get('action'):
+        return step['action']
+    return f"agent:{step.get('agent', '')}"
+
+
+def stub_action(params: Dict[str, Any], inputs: Dict[str, Any]) -> None:
+    """Stand-in for unregistered actions in dry runs; every declared output is None."""
+    return None
+
+
+def is_async(func: Callable[..., Any]) -> bool:
+    """Whether calling func returns a coroutine, including objects with an async __call__."""
+    return asyncio.iscoroutinefunction(func) or asyncio.iscoroutinefunction(getattr(func, '__call__', None))
+
+
+def execution_class(step: Dict[str, Any], func: Callable[..., Any]) -> str:
+    """Execution class of a step: its own `execution`, else the action's, else by function kind."""
+    return step.get('execution') or getattr(func, 'execution', None) or ('async' if is_async(func) else 'thread')
+
+
+def render(value: Any, context: Dict[str, Any]) -> Any:
+    """Render every template string nested in value."""
+    if isinstance(value, str):
+        return compile_template(value).render(context) if '{{' in value else value
+    if isinstance(value, dict):
+        return {key: render(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, context) for item in value]
+    return value
+
+
+class ExecutionError(Exception):
+    """Raised when a workflow cannot be run at all (cycles, unknown steps, missing actions)."""
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step: succeeded, failed, or skipped (with the reason in error).
+
+    cached is set when the outputs came from the step cache, and resumed
+    when they were carried over from an earlier attempt at the same run.
+    """
+    name: str
+    status: str
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    started: float = 0.0
+    finished: float = 0.0
+    cached: bool = False
+    resumed: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def blocked(self) -> bool:
+        """Whether this step failed or was skipped because something upstream failed."""
+        return self.status == 'failed' or (self.status == 'skipped' and
+                                           (self.error or '').startswith(DEPENDENCY_FAILED))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'outputs': self.outputs,
+            'error': self.error,
+            'duration_s': round(self.duration, 6),
+            'cached': self.cached,
+            'resumed': self.resumed,
+        }
+
+
+@dataclass
+class RunResult:
+    """All step results of a run, in step order, its wall time and step cache counters."""
+    steps: List[StepResult]
+    wall_time: float
+    cache: Optional[Dict[str, int]] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return all(step.status != 'failed' for step in self.steps)
+
+    @property
+    def outputs(self) -> Dict[str, Dict[str, Any]]:
+        return {step.name: step.outputs for step in self.steps if step.status == 'succeeded'}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'succeeded': self.succeeded,
+            'wall_time_s': round(self.wall_time, 6),
+            'step_time_s': round(sum(step.duration for step in self.steps), 6),
+            'cache': self.cache,
+            'steps': [step.to_dict() for step in self.steps],
+        }
+
+
+def collect_outputs(step: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    """Turn an action's return value into the step's outputs.
+
+    With declared outputs, exactly those names are kept (missing ones are
+    None); otherwise a returned mapping is passed on as is.
+    """
+    declared = step.get('outputs')
+    names = list(declared) if isinstance(declared, (list, dict)) else None
+    if result is None:
+        result = {}
+    elif not isinstance(result, Mapping):
+        if names is not None and len(names) == 1:
+            result = {names[0]: result}
+        else:
+            raise TypeError(f"action returned {type(result).__name__}, expected a mapping of outputs")
+    if names is None:
+        return dict(result)
+    return {str(name): result.get(name) for name in names}
+
+
+class WorkflowExecutor:
+    """Runs one workflow's steps as a dependency-ordered, bounded-concurrency DAG."""
+
+    def __init__(self, workflow: Dict[str, Any], actions: Optional[Mapping[str, Callable[..., Any]]] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, dry_run: bool = False,
+                 on_step: Optional[Callable[[StepResult], None]] = None, workers: Optional[int] = None,
+                 step_cache: Optional[StepCache] = None, completed: Optional[Mapping[str, Dict[str, Any]]] = None,
+                 on_start: Optional[Callable[[str], None]] = None):
+        self.workflow = workflow
+        self.graph = WorkflowGraph(workflow.get('steps') or [])
+        self.actions = dict(ACTIONS if actions is None else actions)
+        self.concurrency = max(1, concurrency)
+        self.dry_run = dry_run
+        self.on_step = on_step
+        self.on_start = on_start
+        self.completed = dict(completed or {})
+        self.workers = workers
+        self.funcs = self.resolve()
+        self.executions = [execution_class(step, func) for step, func in zip(self.graph.steps, self.funcs)]
+        self.pool: Optional[ProcessPool] = None
+        self.step_cache = step_cache
+        self.identities = [self.cache_identity(step, func) for step, func in zip(self.graph.steps, self.funcs)]
+
+    def resolve(self) -> List[Callable[..., Any]]:
+        """Check the graph can run and look up each step's action callable."""
+        graph = self.graph
+        problems = [f"step '{graph.names[i]}' depends on unknown step '{dep}'" for i, dep in graph.unknown]
+        for group in graph.cycle_groups():
+            problems.append("dependency cycle: " + " → ".join(graph.names[i] for i in graph.find_cycle(group)))
+        if len(graph.index) != len(graph):
+            duplicates = sorted({name for i, name in enumerate(graph.names) if graph.index[name] != i})
+            problems.append("duplicate step names: " + ", ".join(duplicates))
+
+        funcs = []
+        missing = []
+        for step in graph.steps:
+            key = action_name(step)
+            func = self.actions.get(key)
+            if func is None:
+                if not self.dry_run:
+                    missing.append(key)
+                func = stub_action
+            execution = execution_class(step, func)
+            if execution not in EXECUTION_CLASSES:
+                problems.append(f"step '{step.get('name')}' has unknown execution class '{execution}'")
+            elif execution != 'async' and is_async(func):
+                problems.append(f"step '{step.get('name')}' runs a coroutine action, which needs execution 'async'")
+            elif execution == 'async' and not is_async(func):
+                problems.append(f"step '{step.get('name')}' has execution 'async' but its action is not a coroutine")
+            funcs.append(func)
+        if missing:
+            problems.append("no implementation for actions: " + ", ".join(sorted(set(missing))))
+        if problems:
+            raise ExecutionError("; ".join(problems))
+        return funcs
+
+    def cache_identity(self, step: Dict[str, Any], func: Callable[..., Any]) -> Optional[str]:
+        """Action identity for the step's cache keys, or None if the step is not cached."""
+        if self.step_cache is None or step.get('cache', True) is False or func is stub_action:
+            return None
+        return action_identity(action_name(step), func)
+
+    def context(self, inputs: Dict[str, Any], results: List[Optional[StepResult]]) -> Dict[str, Any]:
+        """Template and condition namespace: inputs (also at top level), outputs, steps and config."""
+        outputs = {r.name: r.outputs for r in results if r is not None and r.status == 'succeeded'}
+        return {
+            **inputs,
+            'inputs': inputs,
+            'config': self.workflow.get('config') or {},
+            'outputs': outputs,
+            'steps': {r.name: {'status': r.status, 'outputs': r.outputs} for r in results if r is not None},
+        }
+
+    async def call(self, index: int, params: Dict[str, Any], inputs: Dict[str, Any]) -> Any:
+        """Call a step's action on the loop, the thread pool or the process pool."""
+        func = self.funcs[index]
+        execution = self.executions[index]
+        if execution == 'async':
+            return await func(params, inputs)
+        if execution == 'process':
+            return await self.pool.call(func, params, inputs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, params, inputs))
+
+    async def run_step(self, index: int, inputs: Dict[str, Any], results: List[Optional[StepResult]],
+                       semaphore: asyncio.Semaphore) -> StepResult:
+        graph = self.graph
+        step = graph.steps[index]
+        name = graph.names[index]
+
+        if name in self.completed:
+            now = time.perf_counter()
+            return StepResult(name, 'succeeded', dict(self.completed[name]), started=now, finished=now, resumed=True)
+
+        failed = [graph.names[dep] for dep in graph.deps[index] if results[dep].blocked]
+        if failed:
+            now = time.perf_counter()
+            return StepResult(name, 'skipped', error=f"{DEPENDENCY_FAILED}: {', '.join(failed)}",
+                              started=now, finished=now)
+
+        async with semaphore:
+            started = time.perf_counter()
+            if self.on_start is not None:
+                self.on_start(name)
+            try:
+                context = self.context(inputs, results)
+                condition = step.get('condition')
+                if condition is False or (isinstance(condition, str)
+                                          and not compile_expression(condition).evaluate(context)):
+                    return StepResult(name, 'skipped', error="condition is false", started=started, finished=started)
+                params = render(step.get('params') or {}, context)
+                step_inputs = render(step.get('inputs') or {}, context)
+
+                loop = asyncio.get_running_loop()
+                key = None
+                if self.identities[index] is not None:
+                    key, outputs = await loop.run_in_executor(None, self.cache_lookup, index, params, step_inputs)
+                    if outputs is not MISSING:
+                        return StepResult(name, 'succeeded', outputs, started=started,
+                                          finished=time.perf_counter(), cached=True)
+
+                outputs = collect_outputs(step, await self.call(index, params, step_inputs))
+                if key is not None:
+                    await loop.run_in_executor(None, self.cache_store, name, key, outputs)
+            except Exception as e:
+                return StepResult(name, 'failed', error=f"{type(e).__name__}: {e}",
+                                  started=started, finished=time.perf_counter())
+            return StepResult(name, 'succeeded', outputs, started=started, finished=time.perf_counter())
+
+    def cache_lookup(self, index: int, params: Dict[str, Any], inputs: Dict[str, Any]):
+        """Hash a step's rendered arguments and look them up; runs off the event loop.
+
+        The cache never fails a step: any error here is reported and the step runs uncached.
+        """
+        try:
+            key = step_key(self.identities[index], params, inputs, self.graph.steps[index].get('outputs'))
+            return key, self.step_cache.get(key)
+        except Exception as e:
+            print(f"Warning: step cache lookup failed for {self.graph.names[index]}: {type(e).__name__}: {e}",
+                  file=sys.stderr)
+            return None, MISSING
+
+    def cache_store(self, name: str, key: str, outputs: Dict[str, Any]):
+        """Store a step's outputs; runs off the event loop and, like cache_lookup, never raises."""
+        try:
+            self.step_cache.put(key, outputs)
+        except Exception as e:
+            print(f"Warning: could not cache outputs of {name}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    async def run(self, inputs: Optional[Dict[str, Any]] = None) -> RunResult:
+        """Run every step once its dependencies have finished.
+
+        Steps are started as their last dependency completes, so scheduling
+        is linear in steps plus edges. A failed step skips everything
+        downstream of it; other branches keep going.
+        """
+        inputs = dict(inputs or {})
+        graph = self.graph
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: List[Optional[StepResult]] = [None] * len(graph)
+        pending = [len(deps) for deps in graph.deps]
+        remaining = len(graph)
+        done = asyncio.Event()
+        tasks = set()
+        started = time.perf_counter()
+
+        def start(index: int):
+            task = asyncio.ensure_future(self.run_step(index, inputs, results, semaphore))
+            task.add_done_callback(functools.partial(finish, index))
+            tasks.add(task)
+
+        def finish(index: int, task: asyncio.Task):
+            # Scheduling comes first: anything raised here would otherwise
+            # leave dependents unstarted and the run waiting forever.
+            nonlocal remaining
+            tasks.discard(task)
+            try:
+                results[index] = task.result()
+            except BaseException as e:
+                results[index] = StepResult(graph.names[index], 'failed', error=f"{type(e).__name__}: {e}")
+            remaining -= 1
+            for child in graph.dependents[index]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    start(child)
+            if remaining == 0:
+                done.set()
+            if self.on_step is not None:
+                try:
+                    self.on_step(results[index])
+                except Exception as e:
+                    print(f"Warning: on_step callback failed for {graph.names[index]}: "
+                          f"{type(e).__name__}: {e}", file=sys.stderr)
+
+        if 'process' in self.executions:
+            self.pool = ProcessPool(self.workers, load_action_files, (list(ACTION_FILES),))
+        try:
+            if remaining:
+                for index, count in enumerate(pending):
+                    if count == 0:
+                        start(index)
+                await done.wait()
+        finally:
+            if self.pool is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self.pool.shutdown)
+                self.pool = None
+        return RunResult([r for r in results if r is not None], time.perf_counter() - started,
+                         self.step_cache.stats() if self.step_cache is not None else None)
+
+    def run_sync(self, inputs: Optional[Dict[str, Any]] = None) -> RunResult:
+        """Run to completion on a fresh event loop."""
+        return asyncio.run(self.run(inputs))
+
+
+def run_workflow(workflow: Dict[str, Any], inputs: Optional[Dict[str, Any]] = None, **options) -> RunResult:
+    """Run a workflow to completion; options go to WorkflowExecutor."""
+    return WorkflowExecutor(workflow, **options).run_sync(inputs)
@@ -0,0 +1,387 @@
+"""
+Workflow Expressions - Compiled step conditions and output references.
+
+Steps gate themselves with `condition` expressions such as
+"outputs.verify.success == true and inputs.env != 'prod'" and pass data along
+with templates such as "{{steps.build.outputs.artifact}}" or
+"{{outputs.build.artifact}}". This module parses both once into small ASTs,
+caches the compiled forms by source text, and exposes the step output
+references they contain so tools can check them against each step's declared
+outputs without re-parsing.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+TEMPLATE_PATTERN = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<name>[A-Za-z_][\w-]*)
+      | (?P<op>==|!=|<=|>=|&&|\|\||[<>!()\[\],.|])
+    )""", re.VERBOSE)
+
+KEYWORDS = {"true": True, "false": False, "null": None, "none": None}
+COMPARISONS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "in": lambda a, b: a in b,
+    "not in": lambda a, b: a not in b,
+}
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that cannot be parsed."""
+
+
+class OutputRef(NamedTuple):
+    """A reference to a step output: outputs.<step>.<output>[.<field>...]."""
+    step: str
+    output: str
+    fields: Tuple[str, ...]
+
+
+class Literal:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        return self.value
+
+
+class Reference:
+    """A dotted path looked up in the evaluation context; missing keys give None."""
+    __slots__ = ("path",)
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        value: Any = context
+        for part in self.path:
+            if isinstance(value, dict):
+                value = value.get(part)
+            elif isinstance(value, (list, tuple)) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return None
+        return value
+
+
+class ListLiteral:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        return [item.evaluate(context) for item in self.items]
+
+
+class Compare:
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op: str, left, right):
+        self.op, self.left, self.right = op, left, right
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        try:
+            return COMPARISONS[self.op](self.left.evaluate(context), self.right.evaluate(context))
+        except TypeError:
+            return False  # e.g. None < 0.95 when an output is missing
+
+
+class BoolOp:
+    __slots__ = ("op", "operands")
+
+    def __init__(self, op: str, operands: List[Any]):
+        self.op, self.operands = op, operands
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        if self.op == "and":
+            return all(operand.evaluate(context) for operand in self.operands)
+        return any(operand.evaluate(context) for operand in self.operands)
+
+
+class Not:
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        return not self.operand.evaluate(context)
+
+
+class Filter(NamedTuple):
+    """A template filter such as default(...) or required."""
+    name: str
+    args: Tuple[Any, ...]
+
+
+def tokenize(source: str) -> List[Tuple[str, str]]:
+    """Split an expression into (kind, text) tokens."""
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = TOKEN_PATTERN.match(source, position)
+        if not match:
+            raise ExpressionError(f"Unexpected character {source[position:].lstrip()[:1]!r} in {source!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class Parser:
+    """Recursive-descent parser for condition and template expressions.
+
+    Grammar, loosest binding first:
+        expr       := and_expr (('or' | '||') and_expr)*
+        and_expr   := not_expr (('and' | '&&') not_expr)*
+        not_expr   := ('not' | '!') not_expr | comparison
+        comparison := operand (op operand)?     op: == != < <= > >= in, not in
+        operand    := literal | path | '(' expr ')' | '[' expr, ... ']'
+        path       := name ('.' (name | number) | '[' (number | string) ']')*
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = tokenize(source)
+        self.position = 0
+        self.references: List[Tuple[str, ...]] = []
+
+    def peek(self, offset: int = 0) -> Optional[Tuple[str, str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def accept(self, *texts: str) -> Optional[str]:
+        token = self.peek()
+        if token and token[1] in texts and token[0] in ("op", "name"):
+            self.position += 1
+            return token[1]
+        return None
+
+    def expect(self, text: str):
+        if not self.accept(text):
+            found = self.peek()
+            raise ExpressionError(f"Expected {text!r} but found {found[1] if found else 'end'!r} in {self.source!r}")
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None and self.peek() != ("op", "|"):
+            raise ExpressionError(f"Unexpected {self.peek()[1]!r} in {self.source!r}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.accept("or", "||"):
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else BoolOp("or", operands)
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.accept("and", "&&"):
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else BoolOp("and", operands)
+
+    def parse_not(self):
+        if self.accept("not", "!"):
+            return Not(self.parse_not())
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        left = self.parse_operand()
+        op = self.accept("==", "!=", "<=", ">=", "<", ">", "in")
+        if op is None and self.peek() == ("name", "not") and self.peek(1) == ("name", "in"):
+            self.position += 2
+            op = "not in"
+        if op is None:
+            return left
+        return Compare(op, left, self.parse_operand())
+
+    def parse_operand(self):
+        token = self.peek()
+        if token is None:
+            raise ExpressionError(f"Unexpected end of {self.source!r}")
+        kind, text = token
+        self.position += 1
+        if kind == "number":
+            return Literal(float(text) if "." in text else int(text))
+        if kind == "string":
+            return Literal(re.sub(r"\\(.)", r"\1", text[1:-1]))
+        if kind == "op" and text == "(":
+            node = self.parse_or()
+            self.expect(")")
+            return node
+        if kind == "op" and text == "[":
+            items = []
+            if not self.accept("]"):
+                items.append(self.parse_or())
+                while self.accept(","):
+                    items.append(self.parse_or())
+                self.expect("]")
+            return ListLiteral(items)
+        if kind == "name":
+            if text.lower() in KEYWORDS and self.peek() != ("op", "."):
+                return Literal(KEYWORDS[text.lower()])
+            return self.parse_path(text)
+        raise ExpressionError(f"Unexpected {text!r} in {self.source!r}")
+
+    def parse_path(self, first: str) -> Reference:
+        path = [first]
+        while True:
+            if self.accept("."):
+                token = self.peek()
+                if token is None or token[0] not in ("name", "number"):
+                    raise ExpressionError(f"Expected a name after '.' in {self.source!r}")
+                path.append(token[1])
+                self.position += 1
+            elif self.peek() == ("op", "[") and self.peek(1) and self.peek(1)[0] in ("number", "string"):
+                key = self.tokens[self.position + 1][1]
+                path.append(key.strip("'\"") if key[0] in "'\"" else key)
+                self.position += 2
+                self.expect("]")
+            else:
+                break
+        self.references.append(tuple(path))
+        return Reference(tuple(path))
+
+    def parse_filters(self) -> Tuple[Filter, ...]:
+        filters = []
+        while self.accept("|"):
+            token = self.peek()
+            if token is None or token[0] != "name":
+                raise ExpressionError(f"Expected a filter name after '|' in {self.source!r}")
+            self.position += 1
+            args = []
+            if self.accept("("):
+                if not self.accept(")"):
+                    args.append(self.parse_or())
+                    while self.accept(","):
+                        args.append(self.parse_or())
+                    self.expect(")")
+            filters.append(Filter(token[1], tuple(args)))
+        if self.peek() is not None:
+            raise ExpressionError(f"Unexpected {self.peek()[1]!r} in {self.source!r}")
+        return tuple(filters)
+
+
+def output_refs(paths: Tuple[Tuple[str, ...], ...]) -> Tuple[OutputRef, ...]:
+    """Pick step output references out of referenced paths.
+
+    Both outputs.<step>.<name> and steps.<step>.outputs.<name> forms count.
+    """
+    refs = []
+    for path in paths:
+        if len(path) >= 3 and path[0] == "outputs":
+            refs.append(OutputRef(path[1], path[2], tuple(path[3:])))
+        elif len(path) >= 4 and path[0] == "steps" and path[2] == "outputs":
+            refs.append(OutputRef(path[1], path[3], tuple(path[4:])))
+    return tuple(refs)
+
+
+class Expression:
+    """A compiled condition expression."""
+
+    def __init__(self, source: str):
+        self.source = source
+        parser = Parser(source)
+        self.node = parser.parse()
+        if parser.peek() is not None:
+            raise ExpressionError(f"Unexpected {parser.peek()[1]!r} in {source!r}")
+        self.references = tuple(parser.references)
+        self.output_refs = output_refs(self.references)
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        return self.node.evaluate(context)
+
+
+class TemplateExpression:
+    """One {{ ... }} placeholder: an expression followed by optional filters."""
+
+    def __init__(self, source: str):
+        self.source = source.strip()
+        parser = Parser(self.source)
+        self.node = parser.parse()
+        self.filters = parser.parse_filters()
+        self.references = tuple(parser.references)
+        self.output_refs = output_refs(self.references)
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        value = self.node.evaluate(context)
+        for name, args in self.filters:
+            if name == "default" and value is None and args:
+                value = args[0].evaluate(context)
+        return value
+
+
+class Template:
+    """A string with {{ ... }} placeholders, split into literal text and expressions."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: List[Any] = []
+        position = 0
+        for match in TEMPLATE_PATTERN.finditer(source):
+            if match.start() > position:
+                self.parts.append(source[position:match.start()])
+            self.parts.append(TemplateExpression(match.group(1)))
+            position = match.end()
+        if position < len(source):
+            self.parts.append(source[position:])
+        self.expressions = tuple(part for part in self.parts if isinstance(part, TemplateExpression))
+        self.output_refs = tuple(ref for expression in self.expressions for ref in expression.output_refs)
+
+    def render(self, context: Dict[str, Any]) -> Any:
+        """Substitute placeholders; a lone placeholder keeps its value's type."""
+        if len(self.parts) == 1 and self.expressions:
+            return self.expressions[0].evaluate(context)
+        return "".join(
+            part if isinstance(part, str) else str(part.evaluate(context)) for part in self.parts
+        )
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(source: str) -> Expression:
+    """Compile a condition expression, reusing earlier compilations of the same text."""
+    return Expression(source)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> Template:
+    """Compile a template string, reusing earlier compilations of the same text."""
+    return Template(source)
+
+
+def iter_strings(value: Any, skip_keys: FrozenSet[str] = frozenset()) -> Iterator[str]:
+    """Yield every string nested in value, skipping top-level keys in skip_keys."""
+    stack = [v for k, v in value.items() if k not in skip_keys] if isinstance(value, dict) else [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def step_outputs(step: Dict[str, Any]) -> Optional[FrozenSet[str]]:
+    """Names of the outputs a step declares, or None if it declares none."""
+    outputs = step.get("outputs")
+    if isinstance(outputs, dict):
+        return frozenset(outputs)
+    if isinstance(outputs, list):
+        return frozenset(str(output) for output in outputs)
+    return None
@@ -0,0 +1,359 @@
+"""
+Workflow Graph - Step dependency graph shared by the workflow tools.
+
+Steps declare their dependencies with either `needs` (what generate-workflow.py
+emits) or `depends_on`. WorkflowGraph resolves both into integer adjacency
+lists once in linear time; the analyses below all work on those lists.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+DEPENDENCY_KEYS = ('needs', 'depends_on')
+
+
+def step_dependencies(step: Dict[str, Any]) -> List[str]:
+    """Return the step names a step depends on, from `needs` and `depends_on`.
+
+    A bare string is treated as a single dependency; duplicates are dropped
+    and declaration order is kept.
+    """
+    deps: Dict[str, None] = {}
+    for key in DEPENDENCY_KEYS:
+        value = step.get(key)
+        if value:
+            deps.update(dict.fromkeys([value] if isinstance(value, str) else value))
+    return list(deps)
+
+
+class WorkflowGraph:
+    """Dependency graph over a workflow's steps.
+
+    Nodes are step positions; a step without a name is called step_<i>.
+    Duplicate names resolve to their first step, and dependencies on
+    unknown steps are kept aside in `unknown` rather than becoming edges.
+    """
+
+    def __init__(self, steps: Sequence[Dict[str, Any]]):
+        self.steps = steps
+        self.names = [step.get('name', f"step_{i}") for i, step in enumerate(steps)]
+        self.index: Dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            self.index.setdefault(name, i)
+
+        self.deps: List[List[int]] = [[] for _ in steps]
+        self.dependents: List[List[int]] = [[] for _ in steps]
+        self.unknown: List[Tuple[int, str]] = []
+        self.edge_count = 0
+
+        for i, step in enumerate(steps):
+            for dep in step_dependencies(step):
+                j = self.index.get(dep)
+                if j is None:
+                    self.unknown.append((i, dep))
+                else:
+                    self.deps[i].append(j)
+                    self.dependents[j].append(i)
+                    self.edge_count += 1
+
+        self._order: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def order(self) -> List[int]:
+        """Steps in topological order (Kahn's algorithm).
+
+        Steps on or downstream of a cycle never become ready and are left
+        out; see `blocked`.
+        """
+        if self._order is None:
+            pending = [len(deps) for deps in self.deps]
+            ready = deque(i for i, count in enumerate(pending) if count == 0)
+            order = []
+            while ready:
+                node = ready.popleft()
+                order.append(node)
+                for child in self.dependents[node]:
+                    pending[child] -= 1
+                    if pending[child] == 0:
+                        ready.append(child)
+            self._order = order
+        return self._order
+
+    @property
+    def blocked(self) -> List[int]:
+        """Steps that are on, or depend on, a dependency cycle."""
+        ordered = set(self.order)
+        return [i for i in range(len(self)) if i not in ordered]
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Strongly connected components, found by iterative Tarjan in one pass.
+
+        Uses an explicit stack so chains of any depth stay within Python's
+        recursion limit. Components come out in reverse topological order.
+        """
+        count = len(self)
+        index = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components = []
+        counter = 0
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, edge = work[-1]
+                if edge == 0:
+                    index[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+
+                deps = self.deps[node]
+                while edge < len(deps):
+                    dep = deps[edge]
+                    edge += 1
+                    if index[dep] == -1:
+                        work[-1] = (node, edge)
+                        work.append((dep, 0))
+                        break
+                    if on_stack[dep]:
+                        lowlink[node] = min(lowlink[node], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def cycle_groups(self) -> List[List[int]]:
+        """Groups of steps that depend on each other, each sorted by step order.
+
+        Every component with more than one step, or a step that depends on
+        itself, is a cycle group.
+        """
+        groups = [
+            sorted(component) for component in self.strongly_connected_components()
+            if len(component) > 1 or component[0] in self.deps[component[0]]
+        ]
+        return sorted(groups)
+
+    def find_cycle(self, group: Sequence[int]) -> List[int]:
+        """One dependency cycle inside a cycle group, starting and ending at its first step.
+
+        Breadth-first, so the cycle returned is a shortest one through that step.
+        """
+        members = set(group)
+        start = group[0]
+        via: Dict[int, int] = {}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for dep in self.deps[node]:
+                if dep == start:
+                    path = [start]
+                    while node != start:
+                        path.append(node)
+                        node = via[node]
+                    return [start] + path[:0:-1] + [start]
+                if dep in members and dep not in via:
+                    via[dep] = node
+                    queue.append(dep)
+        return []
+
+    def ancestors(self, node: int) -> Set[int]:
+        """Every step node depends on, directly or transitively."""
+        seen: Set[int] = set()
+        queue = deque(self.deps[node])
+        while queue:
+            current = queue.popleft()
+            if current not in seen:
+                seen.add(current)
+                queue.extend(self.deps[current])
+        return seen
+
+    def unreachable(self) -> List[int]:
+        """Steps that can never run, in step order.
+
+        A step is unreachable if it depends on an unknown step or a cycle,
+        directly or through any of its own dependencies.
+        """
+        seeds = {i for i, _ in self.unknown}
+        seeds.update(self.blocked)
+        seen = set(seeds)
+        queue = deque(seeds)
+        while queue:
+            for child in self.dependents[queue.popleft()]:
+                if child not in seen:
+                    seen.add(child)
+                    queue.append(child)
+        return sorted(seen)
+
+    def orphans(self) -> List[int]:
+        """Steps with no dependencies and no dependents in a connected workflow."""
+        if not self.edge_count:
+            return []
+        has_unknown = {i for i, _ in self.unknown}
+        return [
+            i for i in range(len(self))
+            if not self.deps[i] and not self.dependents[i] and i not in has_unknown
+        ]
+
+    def levels(self) -> Dict[int, int]:
+        """Earliest level each schedulable step can start at (0 = no dependencies)."""
+        level: Dict[int, int] = {}
+        for node in self.order:
+            level[node] = max((level[dep] + 1 for dep in self.deps[node]), default=0)
+        return level
+
+    def max_width(self) -> Tuple[int, List[int]]:
+        """Most steps that can run at once when every step starts as early as possible.
+
+        Returns (width, steps at the widest level).
+        """
+        by_level: Dict[int, List[int]] = {}
+        for node, level in self.levels().items():
+            by_level.setdefault(level, []).append(node)
+        if not by_level:
+            return 0, []
+        widest = max(by_level.values(), key=len)
+        return len(widest), widest
+
+    def critical_path(self, durations: Optional[Sequence[float]] = None) -> Tuple[float, List[int]]:
+        """Longest dependency chain through the schedulable steps.
+
+        durations gives each step's weight by position (default 1, so the
+        length is a step count). Returns (length, steps along the path).
+        """
+        finish: Dict[int, float] = {}
+        via: Dict[int, Optional[int]] = {}
+        for node in self.order:
+            best = max(self.deps[node], key=finish.__getitem__, default=None)
+            weight = 1 if durations is None else durations[node]
+            finish[node] = weight + (finish[best] if best is not None else 0)
+            via[node] = best
+        if not finish:
+            return 0, []
+
+        node: Optional[int] = max(finish, key=finish.__getitem__)
+        length = finish[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = via[node]
+        return length, path[::-1]
+
+    def _ancestor_bitsets(self) -> Iterator[Tuple[List[int], int, int, List[int]]]:
+        """Yield (members, ancestors, inherited, component_of) per strongly connected component.
+
+        Components come dependencies first, and both sets are bitsets over
+        component positions in that order: ancestors holds every component
+        the members depend on (their own, if they form a cycle), inherited
+        only those their dependencies depend on. Each set is the union of
+        its dependencies' sets, so reachability costs one pass of
+        O(edges * components / word size) rather than a walk per step, and
+        is dropped once its last dependent has used it, so memory follows
+        the widest frontier rather than steps squared.
+        """
+        components = self.strongly_connected_components()
+        component_of = [0] * len(self)
+        for position, members in enumerate(components):
+            for node in members:
+                component_of[node] = position
+        waiting = [0] * len(components)
+        for node, deps in enumerate(self.deps):
+            for dep in deps:
+                if component_of[dep] != component_of[node]:
+                    waiting[component_of[dep]] += 1
+
+        live: Dict[int, int] = {}
+        for position, members in enumerate(components):
+            inherited = 0
+            ancestors = 0
+            for node in members:
+                for dep in self.deps[node]:
+                    source = component_of[dep]
+                    if source == position:
+                        ancestors |= 1 << position  # A cycle: each member depends on itself
+                        continue
+                    inherited |= live[source]
+                    ancestors |= 1 << source
+                    waiting[source] -= 1
+                    if not waiting[source]:
+                        del live[source]
+            ancestors |= inherited
+            if waiting[position]:
+                live[position] = ancestors
+            yield members, ancestors, inherited, component_of
+
+    def depends_on(self, pairs: Iterable[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+        """The (step, dep) pairs where step depends on dep, directly or transitively.
+
+        Answers every query in a single pass over _ancestor_bitsets, cycles included.
+        """
+        queries: Dict[int, List[int]] = {}
+        for step, dep in pairs:
+            queries.setdefault(step, []).append(dep)
+        found: Set[Tuple[int, int]] = set()
+        if not queries:
+            return found
+        for members, ancestors, _, component_of in self._ancestor_bitsets():
+            for node in members:
+                for dep in queries.pop(node, ()):
+                    if ancestors >> component_of[dep] & 1:
+                        found.add((node, dep))
+            if not queries:
+                break
+        return found
+
+    def redundant_edges(self) -> List[Tuple[int, int]]:
+        """Edges (dep, step) already implied by another of the step's dependencies.
+
+        A dependency is redundant when it is an ancestor of one of the
+        step's other dependencies, i.e. in the step's inherited set. Only
+        schedulable steps are considered; cycles are reported on their own.
+        """
+        schedulable = set(self.order)
+        redundant = []
+        for members, _, inherited, component_of in self._ancestor_bitsets():
+            node = members[0]
+            deps = self.deps[node]
+            if len(deps) >= 2 and inherited and node in schedulable:
+                redundant.extend((dep, node) for dep in deps if inherited >> component_of[dep] & 1)
+        redundant.sort(key=lambda edge: edge[1])
+        return redundant
+
+    def chains(self, min_length: int = 3) -> List[List[int]]:
+        """Maximal runs of steps linked one-to-one (a -> b -> c ...).
+
+        A link u -> v belongs to a chain when v depends only on u and u has
+        no other dependents.
+        """
+        def linked(u: int, v: int) -> bool:
+            return self.deps[v] == [u] and self.dependents[u] == [v]
+
+        chains = []
+        for node in self.order:
+            deps = self.deps[node]
+            if len(deps) == 1 and linked(deps[0], node):
+                continue  # Not the head of a chain
+            chain = [node]
+            while len(self.dependents[chain[-1]]) == 1 and linked(chain[-1], self.dependents[chain[-1]][0]):
+                chain.append(self.dependents[chain[-1]][0])
+            if len(chain) >= min_length:
+                chains.append(chain)
+        return chains
@@ -0,0 +1,271 @@
+"""
+Workflow Journal - SQLite record of workflow runs for checkpointing and resume.
+
+run-workflow.py records every step transition (running, then succeeded,
+failed or skipped) together with the step's outputs. A failed run can then be
+resumed: steps that succeeded keep their journaled outputs and only the rest
+of the DAG runs again. A step whose definition has changed since it ran is
+run again too, along with everything downstream of it, as is a step whose
+outputs could not be pickled.
+
+Writes go through a queue to a background thread, which commits them in
+batches of up to BATCH_SIZE records or every FLUSH_INTERVAL seconds, whichever
+comes first, so wide DAGs do not wait on one fsync per step. Anything still
+queued when a process is killed is lost and those steps simply run again.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import queue
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from workflow_graph import WorkflowGraph
+
+DEFAULT_JOURNAL = os.environ.get("WORKFLOW_JOURNAL", ".cache/runs.sqlite")
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.05  # seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    workflow TEXT NOT NULL,
+    name TEXT,
+    inputs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    action TEXT,
+    definition TEXT,
+    status TEXT NOT NULL,
+    outputs BLOB,
+    error TEXT,
+    duration REAL,
+    cached INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, step)
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_action ON steps (action, status);
+"""
+
+_STOP = object()
+
+
+def step_definition(step: Dict[str, Any]) -> str:
+    """Digest of a step's definition, to tell whether a journaled result still applies."""
+    text = json.dumps(step, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+class RunRecord(NamedTuple):
+    run_id: str
+    workflow: str
+    name: Optional[str]
+    inputs: Dict[str, Any]
+    status: str
+    started_at: float
+    finished_at: Optional[float]
+
+
+class Journal:
+    """A run journal in one SQLite file, shared by any number of runs."""
+
+    def __init__(self, path: str = DEFAULT_JOURNAL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._connect()
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self.batches = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # Writes
+
+    def start_run(self, workflow_path: str, workflow: Dict[str, Any], inputs: Dict[str, Any],
+                  run_id: Optional[str] = None) -> str:
+        """Create a run (or reopen run_id when resuming) and mark it running."""
+        run_id = run_id or new_run_id()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, workflow, name, inputs, status, started_at) VALUES (?, ?, ?, ?, 'running', ?) "
+                "ON CONFLICT (run_id) DO UPDATE SET status = 'running', finished_at = NULL",
+                (run_id, str(Path(workflow_path).resolve()), workflow.get('name'),
+                 json.dumps(inputs, default=str), time.time()),
+            )
+        return run_id
+
+    def step_started(self, run_id: str, step: str):
+        self._put(('event', (run_id, step, 'running', time.time())))
+
+    def record_step(self, run_id: str, step: Dict[str, Any], action: str, result: Any):
+        """Queue a finished step's state and outputs (a workflow_executor.StepResult).
+
+        Outputs that cannot be pickled are left out, so the step runs again on resume.
+        """
+        now = time.time()
+        outputs = None
+        if result.status == 'succeeded':
+            try:
+                outputs = pickle.dumps(result.outputs, protocol=pickle.HIGHEST_PROTOCOL)
+            except (TypeError, AttributeError, pickle.PicklingError) as e:
+                print(f"Warning: outputs of {result.name} cannot be journaled and it will run again on resume: {e}",
+                      file=sys.stderr)
+        self._put(('event', (run_id, result.name, result.status, now)))
+        self._put(('step', (run_id, result.name, action, step_definition(step), result.status, outputs,
+                            result.error, result.duration, int(result.cached), now)))
+
+    def finish_run(self, run_id: str, status: str):
+        """Flush queued records, then mark the run finished with status."""
+        self.flush()
+        with self._conn:
+            self._conn.execute("UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?",
+                               (status, time.time(), run_id))
+
+    def _put(self, record: Tuple[str, tuple]):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name='workflow-journal', daemon=True)
+            self._writer.start()
+        self._queue.put(record)
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + FLUSH_INTERVAL
+                while len(batch) < BATCH_SIZE and batch[-1] is not _STOP:
+                    try:
+                        batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                try:
+                    self._commit(conn, [record for record in batch if record is not _STOP])
+                except sqlite3.Error as e:
+                    # Losing a checkpoint only means those steps run again on resume.
+                    print(f"Warning: could not write to run journal {self.path}: {e}", file=sys.stderr)
+                for _ in batch:
+                    self._queue.task_done()
+                if batch[-1] is _STOP:
+                    return
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+        if not batch:
+            return
+        events = [row for kind, row in batch if kind == 'event']
+        steps = [row for kind, row in batch if kind == 'step']
+        with conn:
+            if events:
+                conn.executemany("INSERT INTO events (run_id, step, status, at) VALUES (?, ?, ?, ?)", events)
+            if steps:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO steps (run_id, step, action, definition, status, outputs, error, "
+                    "duration, cached, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", steps)
+        self.batches += 1
+
+    def flush(self):
+        """Block until every queued record is committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+        self._conn.close()
+
+    # Reads
+
+    def run(self, run_id: str) -> Optional[RunRecord]:
+        row = self._conn.execute(
+            "SELECT run_id, workflow, name, inputs, status, started_at, finished_at FROM runs WHERE run_id = ?",
+            (run_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return RunRecord(row[0], row[1], row[2], json.loads(row[3]), row[4], row[5], row[6])
+
+    def runs(self, limit: int = 20) -> List[RunRecord]:
+        """Most recent runs first."""
+        rows = self._conn.execute(
+            "SELECT run_id FROM runs ORDER BY started_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self.run(run_id) for (run_id,) in rows]
+
+    def step_states(self, run_id: str) -> Dict[str, str]:
+        return dict(self._conn.execute("SELECT step, status FROM steps WHERE run_id = ?", (run_id,)))
+
+    def completed_steps(self, run_id: str, steps: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Outputs of steps that succeeded in run_id and are still defined the same way.
+
+        A step that has to run again, including one whose journaled outputs
+        no longer unpickle, invalidates everything downstream of it, since
+        those results were computed from its old outputs.
+        """
+        definitions = {step.get('name'): step_definition(step) for step in steps}
+        completed = {}
+        for name, definition, outputs in self._conn.execute(
+                "SELECT step, definition, outputs FROM steps WHERE run_id = ? AND status = 'succeeded'", (run_id,)):
+            if definitions.get(name) != definition or outputs is None:
+                continue
+            try:
+                completed[name] = pickle.loads(outputs)
+            except Exception as e:
+                # e.g. a class from an actions module that was renamed or not loaded
+                print(f"Warning: journaled outputs of {name} cannot be loaded, running it again: "
+                      f"{type(e).__name__}: {e}", file=sys.stderr)
+
+        graph = WorkflowGraph(steps)
+        stale = [i for i, name in enumerate(graph.names) if name not in completed]
+        seen = set(stale)
+        while stale:
+            for child in graph.dependents[stale.pop()]:
+                if child not in seen:
+                    seen.add(child)
+                    completed.pop(graph.names[child], None)
+                    stale.append(child)
+        return completed
+
+    def action_durations(self, workflow: Optional[str] = None) -> Dict[str, List[float]]:
+        """Durations of succeeded, actually executed steps by action, optionally for one workflow file."""
+        sql = ("SELECT steps.action, steps.duration FROM steps JOIN runs USING (run_id) "
+               "WHERE steps.status = 'succeeded' AND steps.cached = 0 AND steps.duration IS NOT NULL")
+        params: Tuple[Any, ...] = ()
+        if workflow is not None:
+            sql += " AND runs.workflow = ?"
+            params = (str(Path(workflow).resolve()),)
+        durations: Dict[str, List[float]] = {}
+        for action, duration in self._conn.execute(sql, params):
+            durations.setdefault(action, []).append(duration)
+        return durations
@@ -0,0 +1,123 @@
+"""
+Workflow Loader - Shared YAML loading for the workflow tools.
+
+lint-workflow.py, validate-workflow.sh and render-diagram.py all parse the same
+workflow files. This module parses them with libyaml's C loader when PyYAML
+was built with it, and keeps the parsed documents in an on-disk cache keyed
+by content hash so each file is parsed once across all of the tools.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+# Bump when the cached representation changes.
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.environ.get("WORKFLOW_CACHE_DIR", ".cache/workflows")
+
+_MISSING = object()
+
+
+def read_entry(entry: Path, default: Any = None) -> Any:
+    """Read a pickled cache entry, returning default if it is missing, corrupt or unloadable.
+
+    Entries written by other code (a renamed class, a module that is no longer
+    importable, a script run as __main__) can fail to unpickle in many ways;
+    every one of them is a miss, never an error.
+    """
+    try:
+        with open(entry, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return default
+
+
+def write_entry(entry: Path, value: Any):
+    """Atomically write a pickled cache entry, creating its directory."""
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, entry)
+
+
+def parse_yaml(data: bytes, name: str = "<bytes>") -> Any:
+    """Parse a YAML document with the fastest available safe loader.
+
+    name is used in error messages, as it would be for an open file.
+    """
+    stream = io.BytesIO(data)
+    stream.name = name
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+class WorkflowCache:
+    """On-disk cache of parsed workflow documents keyed by content hash.
+
+    Entries are pickled documents stored under the sha256 of the source
+    bytes, so any edit misses and identical files share an entry. Writes are
+    atomic, which makes the cache safe to share between concurrent processes.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir) / f"v{CACHE_VERSION}"
+        self.hits = 0
+        self.misses = 0
+        self._memory: Dict[str, Any] = {}
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}.pickle"
+
+    def load(self, path: str) -> Any:
+        """Return the parsed document for path, parsing only on a cache miss."""
+        data = Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if digest in self._memory:
+            self.hits += 1
+            return self._memory[digest]
+
+        entry = self._entry_path(digest)
+        document = self._read(entry)
+        if document is _MISSING:
+            document = parse_yaml(data, str(path))
+            self.misses += 1
+            self._store(entry, document)
+        else:
+            self.hits += 1
+
+        self._memory[digest] = document
+        return document
+
+    def _read(self, entry: Path) -> Any:
+        return read_entry(entry, _MISSING)
+
+    def _store(self, entry: Path, document: Any):
+        write_entry(entry, document)
+
+    def __getstate__(self):
+        # Worker processes get their own in-memory layer.
+        return {**self.__dict__, "_memory": {}}
+
+
+def load_workflow(path: str, cache: Optional[WorkflowCache] = None) -> Any:
+    """Load and parse a workflow file, through cache when one is given.
+
+    Raises yaml.YAMLError for invalid YAML and FileNotFoundError for missing
+    files, like yaml.safe_load on an open file would.
+    """
+    if cache is not None:
+        return cache.load(path)
+    return parse_yaml(Path(path).read_bytes(), str(path))
@@ -0,0 +1,154 @@
+"""
+Workflow Process Pool - Runs CPU-bound workflow actions on worker processes.
+
+Actions registered with execution='process' (or steps that set
+`execution: process`) are sent to a ProcessPoolExecutor so they scale across
+cores instead of sharing the event loop's GIL. Arguments and results are
+pickled as usual, except for byte buffers of SHARED_MEMORY_THRESHOLD bytes or
+more: those are written once into a shared memory block and only the block's
+name crosses the pipe. Actions receive such arguments as read-only
+memoryviews over the shared block, without a copy.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+SHARED_MEMORY_THRESHOLD = 1 << 20  # 1 MiB
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+class SharedBuffer(NamedTuple):
+    """Handle to a byte buffer held in a shared memory block."""
+    name: str
+    size: int
+
+
+def map_items(value: Any, convert: Callable[[Any], Any]) -> Any:
+    """Rebuild a plain dict, list, tuple or namedtuple with convert applied to its items.
+
+    Anything else, including other subclasses whose constructors may not
+    take a single iterable, is returned unchanged.
+    """
+    kind = type(value)
+    if kind is dict:
+        return {key: convert(item) for key, item in value.items()}
+    if kind is list or kind is tuple:
+        return kind(convert(item) for item in value)
+    if isinstance(value, tuple) and hasattr(kind, '_make') and hasattr(kind, '_fields'):
+        return kind._make(convert(item) for item in value)
+    return value
+
+
+def share_buffers(value: Any, blocks: List[SharedMemory], threshold: int = SHARED_MEMORY_THRESHOLD) -> Any:
+    """Replace large byte buffers nested in value with SharedBuffer handles.
+
+    Each buffer is copied once into a new block, appended to blocks; the
+    caller owns the blocks and must close (and eventually unlink) them.
+    """
+    if isinstance(value, BUFFER_TYPES):
+        view = memoryview(value)
+        if view.nbytes < threshold or not view.c_contiguous:
+            return value
+        block = SharedMemory(create=True, size=view.nbytes)
+        block.buf[:view.nbytes] = view.cast('B')
+        blocks.append(block)
+        return SharedBuffer(block.name, view.nbytes)
+    if isinstance(value, SharedBuffer):
+        return value
+    return map_items(value, lambda item: share_buffers(item, blocks, threshold))
+
+
+def attach_buffers(value: Any, blocks: List[SharedMemory]) -> Any:
+    """Replace SharedBuffer handles nested in value with read-only views of their blocks."""
+    if isinstance(value, SharedBuffer):
+        block = SharedMemory(name=value.name)
+        blocks.append(block)
+        return block.buf[:value.size].toreadonly()
+    return map_items(value, lambda item: attach_buffers(item, blocks))
+
+
+def collect_buffers(value: Any) -> Any:
+    """Copy SharedBuffer handles in a worker's result into bytes and free their blocks."""
+    if isinstance(value, SharedBuffer):
+        block = SharedMemory(name=value.name)
+        try:
+            return bytes(block.buf[:value.size])
+        finally:
+            block.close()
+            block.unlink()
+    return map_items(value, collect_buffers)
+
+
+def release(blocks: Sequence[SharedMemory], unlink: bool = False):
+    """Close (and optionally unlink) blocks, tolerating views an action kept alive."""
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            pass  # Unmapped once the last view is garbage collected
+        if unlink:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def call_in_worker(func: Callable[..., Any], params: Any, inputs: Any) -> Any:
+    """Worker-side wrapper: attach shared arguments, call the action, share large results."""
+    attached: List[SharedMemory] = []
+    created: List[SharedMemory] = []
+    try:
+        result = func(attach_buffers(params, attached), attach_buffers(inputs, attached))
+        # Shared before the input blocks are released, in case the result views them.
+        return share_buffers(result, created)
+    finally:
+        release(created)
+        release(attached)
+
+
+class ProcessPool:
+    """A lazily started process pool for one run, with shared-memory argument passing."""
+
+    def __init__(self, workers: Optional[int] = None, initializer: Optional[Callable[..., None]] = None,
+                 initargs: Tuple[Any, ...] = ()):
+        self.workers = workers or os.cpu_count() or 1
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Workers then share the parent's tracker, so blocks created on
+            # one side and unlinked on the other are tracked exactly once.
+            resource_tracker.ensure_running()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(),
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        return self._executor
+
+    async def call(self, func: Callable[..., Any], params: Any, inputs: Any) -> Any:
+        """Run func(params, inputs) on a worker and return its result in this process."""
+        blocks: List[SharedMemory] = []
+        try:
+            shared_params = share_buffers(params, blocks)
+            shared_inputs = share_buffers(inputs, blocks)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, call_in_worker, func, shared_params, shared_inputs)
+        finally:
+            release(blocks, unlink=True)
+        return collect_buffers(result)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,206 @@
+"""
+Workflow Step Cache - Content-addressed memoization of step outputs.
+
+run-workflow.py looks each step up here before calling its action. The key is
+a sha256 over the action's identity (registered name, function and a digest of
+its code), the step's rendered params and inputs (which carry whatever it
+takes from upstream outputs) and its declared outputs, so a rerun recomputes
+only steps whose action or data changed. Entries are pickled outputs written
+atomically with workflow_loader's helpers; a hit refreshes an entry's mtime,
+and the least recently used entries are evicted once the store grows past its
+size budget. Steps opt out with `cache: false`.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from workflow_loader import read_entry, write_entry
+
+# Bump when the key derivation or entry format changes.
+STEP_CACHE_VERSION = 2
+
+DEFAULT_STEP_CACHE_DIR = os.environ.get("WORKFLOW_STEP_CACHE_DIR", ".cache/steps")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Eviction trims the store to this share of its budget, so a full cache is
+# rescanned once per batch of writes rather than on every write.
+LOW_WATER_MARK = 0.9
+
+MISSING = object()
+
+
+class Unencodable(Exception):
+    """Raised for values with no stable encoding, which therefore cannot be part of a key."""
+
+
+def canonical(value: Any) -> Any:
+    """A JSON-encodable stand-in for value that only equal values share.
+
+    Every value carries a type tag, so 1, 1.0, True and "1" stay distinct.
+    Mapping keys are encoded the same way, which also lets keys of mixed
+    types sort. Buffers hash by content. Anything else has no stable encoding
+    (a default repr holds an address, a custom one may truncate) and raises
+    Unencodable.
+    """
+    kind = type(value)
+    if value is None or kind in (bool, int, float, str):
+        return [kind.__name__, value]
+    if kind in (bytes, bytearray, memoryview):
+        return ['buffer', hashlib.sha256(value).hexdigest()]
+    if kind in (list, tuple):
+        return [kind.__name__, [canonical(item) for item in value]]
+    if kind in (set, frozenset):
+        return [kind.__name__, sorted((canonical(item) for item in value), key=_dumps)]
+    if kind is dict:
+        items = sorted(([_dumps(canonical(key)), canonical(item)] for key, item in value.items()),
+                       key=lambda pair: pair[0])
+        return ['dict', items]
+    raise Unencodable(f"no stable encoding for {kind.__qualname__}")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'))
+
+
+def action_identity(name: str, func: Callable[..., Any]) -> str:
+    """Name, qualified function name and code digest of an action.
+
+    Editing the function's body changes its code digest and so every key
+    derived from it.
+    """
+    target = getattr(func, '__func__', func)
+    code = getattr(target, '__code__', None) or getattr(getattr(type(func), '__call__', None), '__code__', None)
+    code_digest = ''
+    if code is not None:
+        code_digest = hashlib.sha256(code.co_code + repr(code.co_consts).encode('utf-8')).hexdigest()[:16]
+    module = getattr(target, '__module__', type(func).__module__)
+    qualname = getattr(target, '__qualname__', type(func).__qualname__)
+    return f"{name}|{module}.{qualname}|{code_digest}"
+
+
+def step_key(identity: str, params: Any, inputs: Any, outputs: Any) -> Optional[str]:
+    """Content address of one step execution, or None if its arguments cannot be encoded stably."""
+    try:
+        payload = _dumps([STEP_CACHE_VERSION, identity, canonical(params), canonical(inputs), canonical(outputs)])
+    except Unencodable:
+        return None
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class StepCache:
+    """On-disk, size-bounded LRU store of step outputs keyed by content hash.
+
+    Safe to use from several threads; the size total is computed from disk
+    on first use and kept up to date as entries are written and evicted.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_STEP_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) / f"v{STEP_CACHE_VERSION}"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pickle"
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every entry on disk."""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.pickle'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return entries
+
+    @property
+    def size(self) -> int:
+        """Bytes currently held on disk."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            return self._size
+
+    def get(self, key: Optional[str]) -> Any:
+        """Return the cached outputs for key, or MISSING; a hit marks the entry recently used.
+
+        A None key, from arguments step_key cannot encode, is always a miss.
+        """
+        if key is None:
+            with self._lock:
+                self.misses += 1
+            return MISSING
+        entry = self._entry_path(key)
+        outputs = read_entry(entry, MISSING)
+        with self._lock:
+            if outputs is MISSING:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            pass  # Evicted by another run since it was read
+        return outputs
+
+    def put(self, key: str, outputs: Dict[str, Any]) -> bool:
+        """Store outputs under key, then evict down to the size budget.
+
+        Outputs that cannot be pickled, or are larger than the whole budget,
+        are not cached; returns whether the entry was written.
+        """
+        entry = self._entry_path(key)
+        self.size  # Total from disk before this write, on first use
+        previous = entry.stat().st_size if entry.exists() else 0
+        try:
+            write_entry(entry, outputs)
+        except (TypeError, AttributeError, pickle.PicklingError):
+            entry.with_name(f"{entry.name}.{os.getpid()}.tmp").unlink(missing_ok=True)
+            return False
+        written = entry.stat().st_size
+        if written > self.max_bytes:
+            entry.unlink()
+            with self._lock:
+                self._size -= previous  # The entry it replaced is gone too
+            return False
+        with self._lock:
+            self._size += written - previous
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+        return True
+
+    def evict(self):
+        """Delete least recently used entries until the store is back under its low-water mark."""
+        entries = sorted(self._entries())
+        target = self.max_bytes * LOW_WATER_MARK
+        with self._lock:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+            self._size = total
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'bytes': self.size}
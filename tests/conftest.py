@@ -0,0 +1,34 @@
+# Shared fixtures for the test suites
+
+import importlib.machinery
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SCRIPTS_DIR = Path(__file__).parent.parent / 'scripts'
+
+
+@pytest.fixture(scope='session')
+def load_script():
+    """Import a script from scripts/ by file name (e.g. 'load-prompts.py', 'validate-workflow.sh')."""
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+
+    modules = {}
+
+    def _load(filename):
+        if filename not in modules:
+            module_name = Path(filename).stem.replace('-', '_')
+            # Some Python scripts carry a .sh name, so name the loader explicitly.
+            loader = importlib.machinery.SourceFileLoader(module_name, str(SCRIPTS_DIR / filename))
+            spec = importlib.util.spec_from_loader(module_name, loader)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+            modules[filename] = module
+        return modules[filename]
+
+    return _load
@@ -0,0 +1,455 @@
+# Prompt Loader Tests
+# Tests for prompt discovery, indexing and rendering
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def prompt_loader(load_script):
+    """Get the load-prompts module."""
+    return load_script('load-prompts.py')
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    """Create a small prompt library."""
+    root = tmp_path / 'prompts'
+    (root / 'system').mkdir(parents=True)
+    (root / 'few-shot').mkdir()
+    (root / 'templates').mkdir()
+
+    (root / 'system' / 'reviewer.txt').write_text(
+        "# Code reviewer\nYou review {{language}} code for {{ focus }}.\n"
+    )
+    (root / 'few-shot' / 'python-examples.md').write_text(
+        "# Python examples\nExamples of idiomatic python.\n"
+    )
+    (root / 'templates' / 'api-client.j2').write_text(
+        "# API client\n# tags: api, clients\nGenerate a client for {{endpoint}}.\n"
+    )
+    return root
+
+
+class TestPromptAnalyzer:
+    """Test single-pass metadata extraction."""
+
+    @pytest.fixture
+    def analyzer(self, prompt_loader):
+        """Get an analyzer with the default tag rules."""
+        return prompt_loader.PromptAnalyzer()
+
+    def test_keywords_match_whole_words_only(self, analyzer):
+        """'json' and 'latest' no longer imply javascript and testing."""
+        _, _, tags = analyzer.analyze("Return the latest result as JSON.")
+        assert tags == []
+
+        _, _, tags = analyzer.analyze("Write a JS helper and unit tests for the API.")
+        assert sorted(tags) == ['api', 'javascript', 'testing']
+
+    def test_variables_in_first_seen_order(self, analyzer):
+        """Variables are unique and ordered by first appearance."""
+        _, variables, _ = analyzer.analyze("{{ b }} {{a}} {{b}} {{c}}")
+        assert variables == ['b', 'a', 'c']
+
+    def test_frontmatter_and_tag_comments(self, analyzer):
+        """Frontmatter supplies description and tags; tag comments add more."""
+        content = (
+            "---\npurpose: \"Review pull requests\"\ntags: [review, quality]\n---\n"
+            "# Reviewer\n# tags: security, ops\nCheck {{diff}}.\n"
+        )
+        description, variables, tags = analyzer.analyze(content)
+        assert description == 'Review pull requests'
+        assert variables == ['diff']
+        assert tags == ['review', 'quality', 'security', 'ops']
+
+    def test_description_falls_back_to_first_line(self, analyzer):
+        """Without frontmatter the first heading is the description."""
+        description, _, _ = analyzer.analyze("\n## Bug Analysis Prompt\nBody\n")
+        assert description == 'Bug Analysis Prompt'
+
+    def test_custom_tag_rules_change_fingerprint(self, analyzer):
+        """Registering a rule tags matching prompts and changes the cache fingerprint."""
+        before = analyzer.fingerprint
+        analyzer.add_tag_rule('kubernetes', ['k8s', 'kubernetes'])
+        _, _, tags = analyzer.analyze("Deploy to k8s.")
+        assert tags == ['kubernetes']
+        assert analyzer.fingerprint != before
+
+
+class TestPromptIndexCache:
+    """Test the on-disk prompt index cache."""
+
+    def test_second_discovery_hits_cache(self, prompt_loader, prompts_dir, tmp_path):
+        """Unchanged files are served from the index."""
+        cache_path = tmp_path / 'index.json'
+
+        first = prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path))
+        first.discover()
+        assert first.cache_stats()['misses'] == 3
+        assert cache_path.exists()
+
+        second = prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path))
+        prompts = second.discover()
+        stats = second.cache_stats()
+        assert stats['hits'] == 3
+        assert stats['misses'] == 0
+        assert {p.name for p in prompts} == {'reviewer', 'python-examples', 'api-client'}
+        assert sorted(second.get_by_name('reviewer').variables) == ['focus', 'language']
+
+    def test_changed_file_is_reparsed(self, prompt_loader, prompts_dir, tmp_path):
+        """Only files whose content changed are parsed again."""
+        cache_path = tmp_path / 'index.json'
+        prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path)).discover()
+
+        changed = prompts_dir / 'system' / 'reviewer.txt'
+        changed.write_text("# Code reviewer\nReview {{repo}} thoroughly.\n")
+        st = changed.stat()
+        os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path))
+        loader.discover()
+        assert loader.cache_stats()['hits'] == 2
+        assert loader.cache_stats()['misses'] == 1
+        assert loader.get_by_name('reviewer').variables == ['repo']
+
+    def test_touched_file_hits_by_hash(self, prompt_loader, prompts_dir, tmp_path):
+        """A new mtime with identical content is still a hit."""
+        cache_path = tmp_path / 'index.json'
+        prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path)).discover()
+
+        touched = prompts_dir / 'few-shot' / 'python-examples.md'
+        st = touched.stat()
+        os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path))
+        loader.discover()
+        assert loader.cache_stats()['hits'] == 3
+
+    def test_invalidate_forces_reparse(self, prompt_loader, prompts_dir, tmp_path):
+        """Invalidating the index removes it and re-parses everything."""
+        cache_path = tmp_path / 'index.json'
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(cache_path))
+        loader.discover()
+
+        loader.invalidate_cache()
+        assert not cache_path.exists()
+
+        loader.discover()
+        assert loader.cache_stats()['misses'] == 3
+
+    def test_rediscovery_does_not_duplicate_indexes(self, prompt_loader, prompts_dir):
+        """Calling discover() twice rebuilds the category index from scratch."""
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        loader.discover()
+        assert len(loader.get_by_category('system')) == 1
+
+
+class TestPromptDiscovery:
+    """Test recursive prompt discovery."""
+
+    def test_discovers_every_category(self, prompt_loader, prompts_dir):
+        """Categories come from directories, including nested ones."""
+        (prompts_dir / 'analysis' / 'security').mkdir(parents=True)
+        (prompts_dir / 'analysis' / 'bug-analysis.txt').write_text("# Bug analysis\n")
+        (prompts_dir / 'analysis' / 'security' / 'owasp.md').write_text("# OWASP\n")
+        (prompts_dir / 'analysis' / 'notes.json').write_text("{}")
+        (prompts_dir / '.hidden').mkdir()
+        (prompts_dir / '.hidden' / 'skip.txt').write_text("skip")
+
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None, workers=2)
+        prompts = loader.discover()
+
+        assert [p.name for p in loader.get_by_category('analysis')] == ['bug-analysis']
+        assert [p.name for p in loader.get_by_category('analysis/security')] == ['owasp']
+        assert len(prompts) == 5
+        assert [p.path for p in prompts] == sorted(p.path for p in prompts)
+
+    def test_iter_prompts_streams(self, prompt_loader, prompts_dir):
+        """iter_prompts yields prompts without building the indexes."""
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        names = {p.name for p in loader.iter_prompts()}
+        assert names == {'reviewer', 'python-examples', 'api-client'}
+        assert loader.prompts == []
+
+
+class TestPromptRegistry:
+    """Test qualified prompt lookup and content-addressed storage."""
+
+    @pytest.fixture
+    def loader(self, prompt_loader, prompts_dir):
+        """Sample library with the same stem in two categories."""
+        (prompts_dir / 'system' / 'api-client.j2').write_text(
+            "# API client\n# tags: api, clients\nGenerate a client for {{endpoint}}.\n"
+        )
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        return loader
+
+    def test_qualified_lookup(self, loader):
+        """category/name resolves to exactly one prompt."""
+        assert loader.get_by_name('system/api-client').category == 'system'
+        assert loader.get_by_name('templates/api-client').category == 'templates'
+        assert loader.get_by_name('reviewer').qualified_id == 'system/reviewer'
+        assert loader.get_by_name('system/missing') is None
+
+    def test_ambiguous_bare_name_raises(self, prompt_loader, loader):
+        """A bare name shared across categories is an explicit error."""
+        with pytest.raises(prompt_loader.AmbiguousPromptError) as excinfo:
+            loader.get_by_name('api-client')
+        assert excinfo.value.candidates == ['system/api-client', 'templates/api-client']
+
+    def test_suggested_candidates_resolve(self, prompt_loader, loader, prompts_dir):
+        """When one name exists with two extensions, each suggestion picks exactly one file."""
+        (prompts_dir / 'system' / 'api-client.md').write_text("# API client notes\n")
+        loader.discover()
+
+        with pytest.raises(prompt_loader.AmbiguousPromptError) as excinfo:
+            loader.get_by_name('system/api-client')
+        assert excinfo.value.candidates == ['system/api-client.j2', 'system/api-client.md']
+        for candidate in excinfo.value.candidates:
+            assert loader.get_by_name(candidate).path.endswith(candidate.split('/')[1])
+
+        with pytest.raises(prompt_loader.AmbiguousPromptError) as excinfo:
+            loader.get_by_name('api-client')
+        assert excinfo.value.candidates == ['system/api-client.j2', 'system/api-client.md', 'templates/api-client']
+        assert loader.get_by_name('templates/api-client').category == 'templates'
+
+    def test_identical_bodies_share_one_template(self, loader):
+        """Prompts with identical content are compiled and stored once."""
+        system = loader.get_by_name('system/api-client')
+        templates = loader.get_by_name('templates/api-client')
+        assert system.digest == templates.digest
+        assert loader.compile('system/api-client') is loader.compile('templates/api-client')
+        assert len(loader.registry.templates) == 1
+
+    def test_removed_prompt_releases_shared_body_last(self, loader):
+        """The shared template is dropped only when its last prompt is removed."""
+        system = loader.get_by_name('system/api-client')
+        loader.compile('system/api-client')
+
+        loader.remove_prompt(system.path)
+        assert system.digest in loader.registry.templates
+        assert loader.get_by_name('api-client').category == 'templates'
+
+        loader.remove_prompt(loader.get_by_name('api-client').path)
+        assert system.digest not in loader.registry.templates
+
+
+class TestLazyPromptContent:
+    """Test that discovered prompts only hold metadata."""
+
+    def test_discovered_prompts_do_not_hold_content(self, prompt_loader, prompts_dir):
+        """Discovery keeps metadata only and reads bodies on demand."""
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        prompt = loader.get_by_name('reviewer')
+
+        assert not hasattr(prompt, '__dict__')
+        assert prompt._content is None
+        assert prompt.content.startswith('# Code reviewer')
+        assert prompt._content is None
+
+    def test_to_dict_reads_only_a_preview(self, prompt_loader, tmp_path):
+        """to_dict truncates long bodies to a 200 character preview."""
+        path = tmp_path / 'long.txt'
+        path.write_text('x' * 1000)
+        prompt = prompt_loader.Prompt(name='long', path=str(path))
+
+        assert prompt.to_dict()['content_preview'] == 'x' * 200 + '...'
+
+
+class TestPromptSearch:
+    """Test the ranked full-text prompt search."""
+
+    @pytest.fixture
+    def loader(self, prompt_loader, prompts_dir):
+        """Discover the sample library without the index cache."""
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        return loader
+
+    def test_name_match_ranks_first(self, loader):
+        """Field boosts put name matches ahead of content matches."""
+        results = loader.search('python')
+        assert results[0].name == 'python-examples'
+
+    def test_top_k_limits_results(self, loader):
+        """Only the requested number of results is returned."""
+        assert len(loader.search('code client python', top_k=1)) == 1
+
+    def test_unknown_term_returns_nothing(self, loader):
+        """Queries without indexed terms return an empty list."""
+        assert loader.search('kubernetes') == []
+
+    def test_index_updates_incrementally(self, prompt_loader, loader, prompts_dir):
+        """Added and removed prompts are reflected without rediscovery."""
+        extra = prompt_loader.Prompt(
+            name='kubernetes-deploy',
+            path=str(prompts_dir / 'system' / 'kubernetes-deploy.txt'),
+            content='Deploy to kubernetes.',
+            category='system',
+        )
+        loader.add_prompt(extra)
+        assert loader.search('kubernetes') == [extra]
+
+        loader.remove_prompt(extra.path)
+        assert loader.search('kubernetes') == []
+        assert len(loader.get_by_category('system')) == 1
+
+
+class TestPromptRendering:
+    """Test compiled template rendering."""
+
+    @pytest.fixture
+    def loader(self, prompt_loader, prompts_dir):
+        """Discover the sample library without the index cache."""
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        return loader
+
+    def test_render_fills_both_placeholder_forms(self, loader):
+        """Both {{var}} and {{ var }} are substituted."""
+        rendered = loader.render('reviewer', {'language': 'Go', 'focus': 'races'})
+        assert rendered == "# Code reviewer\nYou review Go code for races.\n"
+
+    def test_missing_variables_left_unless_strict(self, loader):
+        """Missing variables stay as placeholders, or raise in strict mode."""
+        assert '{{ focus }}' in loader.render('reviewer', {'language': 'Go'})
+        with pytest.raises(ValueError, match='focus'):
+            loader.render('reviewer', {'language': 'Go'}, strict=True)
+
+    def test_render_many_streams_outputs(self, loader):
+        """render_many yields one output per variable dict and reuses the compiled template."""
+        outputs = loader.render_many('api-client', ({'endpoint': f'/v{i}'} for i in range(3)))
+        assert [line.splitlines()[-1] for line in outputs] == [
+            'Generate a client for /v0.',
+            'Generate a client for /v1.',
+            'Generate a client for /v2.',
+        ]
+        assert loader.compile('api-client') is loader.compile('api-client')
+
+    def test_unknown_prompt_raises(self, loader):
+        """Rendering an unknown prompt raises ValueError."""
+        with pytest.raises(ValueError, match='Prompt not found'):
+            loader.render('missing', {})
+
+
+class TestJinjaTemplates:
+    """Test Jinja2 rendering of .j2 prompts."""
+
+    @pytest.fixture
+    def loader(self, prompt_loader, prompts_dir, tmp_path):
+        """Library with a Jinja template using loops, filters and attributes."""
+        pytest.importorskip('jinja2')
+        (prompts_dir / 'templates' / 'report.j2').write_text(
+            "# Report\n"
+            "{% for item in items %}- {{ item | upper }}\n{% endfor %}"
+            "Owner: {{ owner.name }}\n"
+        )
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=str(tmp_path / 'cache' / 'index.json'))
+        loader.discover()
+        return loader
+
+    def test_variables_found_at_discovery(self, loader):
+        """Loop targets and attribute roots count as variables."""
+        assert loader.get_by_name('report').variables == ['items', 'owner']
+
+    def test_renders_loops_filters_and_attributes(self, loader):
+        """.j2 prompts are rendered by Jinja2."""
+        rendered = loader.render('report', {'items': ['a', 'b'], 'owner': {'name': 'ops'}})
+        assert rendered == "# Report\n- A\n- B\nOwner: ops\n"
+
+    def test_strict_checks_before_rendering(self, loader):
+        """Strict mode rejects undeclared variables known at compile time."""
+        with pytest.raises(ValueError, match='owner'):
+            loader.render('report', {'items': []}, strict=True)
+
+    def test_bytecode_cache_written(self, loader, tmp_path):
+        """Compiled templates are written to the shared bytecode cache."""
+        loader.compile('report')
+        assert list((tmp_path / 'cache' / 'jinja').iterdir())
+
+
+class TestPromptService:
+    """Test change polling and the HTTP service."""
+
+    def test_refresh_reloads_only_changes(self, prompt_loader, prompts_dir):
+        """refresh() adds, updates and removes prompts from a stat comparison."""
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        assert loader.refresh() == {'added': 0, 'updated': 0, 'removed': 0}
+
+        (prompts_dir / 'system' / 'new.txt').write_text("# New\n{{x}}\n")
+        (prompts_dir / 'few-shot' / 'python-examples.md').unlink()
+        changed = prompts_dir / 'system' / 'reviewer.txt'
+        changed.write_text("# Reviewer v2\n")
+        st = changed.stat()
+        os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert loader.refresh() == {'added': 1, 'updated': 1, 'removed': 1}
+        assert loader.get_by_name('reviewer').description == 'Reviewer v2'
+        assert loader.get_by_name('python-examples') is None
+        assert loader.render('new', {'x': 1}) == "# New\n1\n"
+
+    def test_server_answers_search_and_render(self, prompt_loader, prompts_dir):
+        """The warm server answers search and render requests over HTTP."""
+        import json
+        import threading
+        import urllib.request
+
+        loader = prompt_loader.PromptLoader(str(prompts_dir), cache_path=None)
+        loader.discover()
+        server = prompt_loader.PromptServer(loader, ('127.0.0.1', 0), poll_interval=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            with urllib.request.urlopen(f"{base}/search?q=python&limit=1") as response:
+                results = json.load(response)
+            assert [r['id'] for r in results] == ['few-shot/python-examples']
+
+            request = urllib.request.Request(
+                f"{base}/render",
+                data=json.dumps({'name': 'api-client', 'batch': [{'endpoint': '/a'}]}).encode(),
+                method='POST',
+            )
+            with urllib.request.urlopen(request) as response:
+                rendered = json.load(response)['rendered']
+            assert rendered[0].endswith('Generate a client for /a.\n')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestPromptBenchmarks:
+    """Test the prompt benchmark harness."""
+
+    @pytest.fixture
+    def bench(self, load_script):
+        """Get the benchmark-prompts module."""
+        return load_script('benchmark-prompts.py')
+
+    def test_synthetic_library_covers_all_categories(self, bench, prompt_loader, tmp_path):
+        """Generated libraries spread prompts over every category."""
+        bench.generate_library(tmp_path / 'lib', 30)
+        loader = prompt_loader.PromptLoader(str(tmp_path / 'lib'), cache_path=None)
+        loader.discover()
+        assert len(loader.prompts) == 30
+        assert sorted(loader.by_category) == sorted(bench.CATEGORIES)
+
+    def test_benchmark_reports_every_operation(self, bench, tmp_path):
+        """A small run reports latency and throughput per operation."""
+        results = bench.benchmark_size(20, queries=5, iterations=1, seed=0, workdir=tmp_path)
+        for operation in ('discover_cold', 'discover_warm', 'search', 'get_by_name', 'get_by_tag', 'render'):
+            assert {'p50_ms', 'p99_ms', 'ops_per_sec'} <= set(results[operation])
+        assert results['process']['peak_rss_mb'] > 0
+
+    def test_compare_flags_regressions_over_threshold(self, bench):
+        """Only metrics worse than the threshold are reported."""
+        baseline = {'1000': {'search': {'p50_ms': 1.0, 'ops_per_sec': 1000.0}}}
+        current = {'1000': {'search': {'p50_ms': 1.1, 'ops_per_sec': 700.0}}}
+        regressions = bench.compare(current, baseline, threshold=0.2)
+        assert len(regressions) == 1
+        assert 'ops_per_sec' in regressions[0]
@@ -0,0 +1,81 @@
+# Workflow Discovery Tests
+# Tests for the shared single-walk workflow file discovery
+
+import pytest
+
+
+@pytest.fixture
+def discovery(load_script):
+    """Get the workflow_discovery module."""
+    return load_script('workflow_discovery.py')
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a workflow tree with vendored, hidden and ignored content."""
+    root = tmp_path / 'repo'
+    files = [
+        'a.yaml', 'b.yml', 'notes.md',
+        'ci/deploy.yaml', 'ci/old/legacy.yml',
+        'node_modules/pkg/workflow.yaml',
+        '.github/workflows/actions.yaml',
+        'generated/out.yaml', 'generated/keep.yaml',
+        'drafts/wip.yaml', 'ci/drafts/nested.yaml',
+    ]
+    for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('name: x\n')
+    (root / '.workflowignore').write_text('# generated output\ngenerated/*\n!generated/keep.yaml\n/drafts/\n')
+    (root / 'ci' / '.gitignore').write_text('old/\n')
+    return root
+
+
+def relative(root, paths):
+    return [p.relative_to(root).as_posix() for p in paths]
+
+
+class TestWorkflowDiscovery:
+    """Test walking, pruning and ignore handling."""
+
+    def test_single_walk_finds_yaml_and_yml(self, discovery, tree):
+        """Both extensions are found in one stable, files-first walk."""
+        found = relative(tree, discovery.discover_workflows([str(tree)]))
+        assert found == ['a.yaml', 'b.yml', 'ci/deploy.yaml', 'ci/drafts/nested.yaml', 'generated/keep.yaml']
+
+    def test_vendored_and_hidden_dirs_never_read(self, discovery, tree, monkeypatch):
+        """Pruned directories are skipped before os.scandir is called on them."""
+        import os
+        scanned = []
+        real_scandir = os.scandir
+
+        def recording_scandir(path):
+            scanned.append(os.path.basename(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr(discovery.os, 'scandir', recording_scandir)
+        list(discovery.discover_workflows([str(tree)]))
+        assert 'node_modules' not in scanned
+        assert '.github' not in scanned
+        assert 'drafts' in scanned  # ci/drafts is only anchored-ignored at the root
+
+    def test_excludes_and_no_ignore(self, discovery, tree):
+        """Exclude patterns apply on top of ignore files, which can be turned off."""
+        found = relative(tree, discovery.discover_workflows([str(tree)], excludes=['*.yml', 'ci/']))
+        assert found == ['a.yaml', 'generated/keep.yaml']
+
+        unfiltered = relative(tree, discovery.discover_workflows([str(tree)], use_ignore_files=False))
+        assert 'generated/out.yaml' in unfiltered
+        assert 'ci/old/legacy.yml' in unfiltered
+        assert 'node_modules/pkg/workflow.yaml' not in unfiltered
+
+    def test_explicit_files_and_non_recursive(self, discovery, tree):
+        """Named files are yielded as given; non-recursive walks stay at the top level."""
+        found = list(discovery.discover_workflows([str(tree / 'generated' / 'out.yaml'), str(tree / 'notes.md')]))
+        assert found == [tree / 'generated' / 'out.yaml']
+        assert relative(tree, discovery.discover_workflows([str(tree)], recursive=False)) == ['a.yaml', 'b.yml']
+
+    def test_streams_lazily(self, discovery, tree):
+        """The first path is available before the rest of the tree is walked."""
+        stream = discovery.discover_workflows([str(tree)])
+        assert next(stream).name == 'a.yaml'
@@ -0,0 +1,402 @@
+# Workflow Executor Tests
+# Tests for the asyncio DAG executor behind run-workflow.py
+
+import asyncio
+import importlib
+import os
+import threading
+from collections import namedtuple
+
+import pytest
+
+
+@pytest.fixture
+def executor(load_script):
+    """Get the workflow_executor module."""
+    return load_script('workflow_executor.py')
+
+
+@pytest.fixture
+def process_pool(executor):
+    """Get the workflow_process_pool module the executor uses (re-loading it would break pickling)."""
+    return importlib.import_module('workflow_process_pool')
+
+
+def workflow(*steps, **fields):
+    return {'name': 'test', 'steps': list(steps), **fields}
+
+
+def worker_pid(params, inputs):
+    """Process-class action: report where it ran and what its blob arrived as."""
+    blob = inputs.get('blob')
+    return {'pid': os.getpid(), 'blob_type': type(blob).__name__, 'blob_sum': sum(blob[::4096]) if blob else 0}
+
+
+Point = namedtuple('Point', 'x y')
+
+
+def make_point(params, inputs):
+    return {'point': Point(3, bytes(params['size']))}
+
+
+def use_point(params, inputs):
+    point = inputs['point']
+    return {'type': type(point).__name__, 'x': point.x, 'y_type': type(point.y).__name__}
+
+
+def make_blob(params, inputs):
+    return {'blob': bytes(range(256)) * (params['size'] // 256)}
+
+
+class InFlight:
+    """Async action that sleeps and records the most calls running at once."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, params, inputs):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return {'value': params.get('value')}
+
+
+class TestScheduling:
+    """Test dependency order and concurrency limits."""
+
+    def test_independent_steps_overlap(self, executor):
+        """Four parallel 50 ms steps between two others finish in about three step times."""
+        sleepy = InFlight()
+        steps = [{'name': 'root', 'action': 'sleep'}]
+        steps += [{'name': f'b{i}', 'action': 'sleep', 'needs': ['root']} for i in range(4)]
+        steps.append({'name': 'sink', 'action': 'sleep', 'depends_on': [f'b{i}' for i in range(4)]})
+        result = executor.run_workflow(workflow(*steps), actions={'sleep': sleepy}, concurrency=8)
+
+        assert result.succeeded
+        assert sleepy.peak == 4
+        assert result.wall_time < 0.05 * 6
+        order = {step.name: step for step in result.steps}
+        assert all(order['root'].finished <= order[f'b{i}'].started for i in range(4))
+        assert all(order[f'b{i}'].finished <= order['sink'].started for i in range(4))
+
+    def test_concurrency_limit(self, executor):
+        sleepy = InFlight(0.01)
+        steps = [{'name': f's{i}', 'action': 'sleep'} for i in range(10)]
+        result = executor.run_workflow(workflow(*steps), actions={'sleep': sleepy}, concurrency=3)
+        assert result.succeeded
+        assert sleepy.peak == 3
+
+    def test_sync_actions_run_off_the_loop(self, executor):
+        threads = set()
+
+        def record(params, inputs):
+            threads.add(threading.get_ident())
+            return {}
+
+        executor.run_workflow(workflow({'name': 'a', 'action': 'record'}), actions={'record': record})
+        assert threading.get_ident() not in threads
+
+    def test_unrunnable_workflows_rejected(self, executor):
+        with pytest.raises(executor.ExecutionError, match="unknown step 'missing'.*cycle: a → b → a"):
+            executor.WorkflowExecutor(workflow(
+                {'name': 'a', 'action': 'x', 'needs': ['b', 'missing']},
+                {'name': 'b', 'action': 'x', 'needs': ['a']},
+            ), actions={'x': lambda params, inputs: {}})
+        with pytest.raises(executor.ExecutionError, match='no implementation for actions: x'):
+            executor.WorkflowExecutor(workflow({'name': 'a', 'action': 'x'}), actions={})
+
+
+class TestDataFlow:
+    """Test outputs, templates, conditions and failures."""
+
+    def test_outputs_flow_between_steps(self, executor):
+        def build(params, inputs):
+            return {'artifact': f"{params['target']}.tar", 'log': 'dropped', 'ok': True}
+
+        def deploy(params, inputs):
+            return f"deployed {inputs['artifact']} to {params['env']}"
+
+        result = executor.run_workflow(workflow(
+            {'name': 'build', 'action': 'build', 'outputs': ['artifact', 'ok'],
+             'params': {'target': '{{inputs.target}}'}},
+            {'name': 'deploy', 'action': 'deploy', 'needs': 'build', 'outputs': ['message'],
+             'condition': 'outputs.build.ok == true',
+             'params': {'env': '{{env}}'}, 'inputs': {'artifact': '{{steps.build.outputs.artifact}}'}},
+        ), inputs={'target': 'app', 'env': 'prod'}, actions={'build': build, 'deploy': deploy})
+
+        assert result.outputs == {
+            'build': {'artifact': 'app.tar', 'ok': True},
+            'deploy': {'message': 'deployed app.tar to prod'},
+        }
+
+    def test_false_condition_skips_step(self, executor):
+        result = executor.run_workflow(workflow(
+            {'name': 'notify', 'action': 'x', 'condition': "inputs.env == 'prod'"},
+        ), inputs={'env': 'dev'}, actions={'x': lambda params, inputs: {}})
+        assert [(s.status, s.error) for s in result.steps] == [('skipped', 'condition is false')]
+        assert result.succeeded
+
+    def test_failure_skips_downstream_only(self, executor):
+        def fail(params, inputs):
+            raise RuntimeError('boom')
+
+        calls = []
+
+        def ok(params, inputs):
+            calls.append(params)
+            return {'v': 1}
+
+        result = executor.run_workflow(workflow(
+            {'name': 'a', 'action': 'fail', 'outputs': ['v']},
+            {'name': 'b', 'action': 'ok', 'needs': ['a'], 'params': {'x': '{{outputs.a.v}}'}, 'outputs': ['v']},
+            {'name': 'c', 'action': 'ok', 'needs': ['b'], 'params': {'x': '{{outputs.b.v}}'}, 'outputs': ['v']},
+            {'name': 'd', 'action': 'ok', 'needs': ['c']},
+            {'name': 'e', 'action': 'ok'},
+        ), actions={'fail': fail, 'ok': ok})
+
+        statuses = {s.name: s.status for s in result.steps}
+        assert statuses == {'a': 'failed', 'b': 'skipped', 'c': 'skipped', 'd': 'skipped', 'e': 'succeeded'}
+        assert result.steps[0].error == 'RuntimeError: boom'
+        assert result.steps[2].error == 'dependency failed: b'
+        assert calls == [{}]
+        assert not result.succeeded
+
+    def test_condition_skip_does_not_block_downstream(self, executor):
+        result = executor.run_workflow(workflow(
+            {'name': 'a', 'action': 'ok', 'condition': False},
+            {'name': 'b', 'action': 'ok', 'needs': ['a']},
+        ), actions={'ok': lambda params, inputs: {}})
+        assert [s.status for s in result.steps] == ['skipped', 'succeeded']
+
+    def test_failing_on_step_does_not_stall_run(self, executor, capsys):
+        def on_step(result):
+            raise RuntimeError('callback broke')
+
+        result = executor.run_workflow(workflow(
+            {'name': 'a', 'action': 'ok'},
+            {'name': 'b', 'action': 'ok', 'needs': ['a']},
+        ), actions={'ok': lambda params, inputs: {}}, on_step=on_step)
+
+        assert [s.status for s in result.steps] == ['succeeded', 'succeeded']
+        assert 'on_step callback failed for a' in capsys.readouterr().err
+
+    def test_dry_run_stubs_missing_actions(self, executor):
+        result = executor.run_workflow(workflow(
+            {'name': 'scan', 'agent': 'security', 'outputs': ['findings']},
+        ), dry_run=True)
+        assert result.outputs == {'scan': {'findings': None}}
+
+    def test_load_actions_from_file(self, executor, tmp_path):
+        module = tmp_path / 'my_actions.py'
+        module.write_text(
+            "from workflow_executor import action\n"
+            "@action('greet')\n"
+            "def greet(params, inputs):\n"
+            "    return {'greeting': 'hi ' + params['who']}\n"
+            "ACTIONS = {'agent:echo': lambda params, inputs: dict(inputs)}\n"
+        )
+        actions = executor.load_actions(str(module))
+        assert set(actions) >= {'greet', 'agent:echo'}
+        result = executor.run_workflow(workflow(
+            {'name': 'hello', 'action': 'greet', 'params': {'who': 'grok'}},
+            {'name': 'echo', 'agent': 'echo', 'needs': ['hello'],
+             'inputs': {'text': '{{outputs.hello.greeting}}!'}},
+        ), actions=actions)
+        assert result.outputs['echo'] == {'text': 'hi grok!'}
+
+
+class TestProcessPool:
+    """Test process-class actions and shared-memory buffers."""
+
+    def test_process_actions_run_in_workers(self, executor):
+        result = executor.run_workflow(workflow(
+            {'name': 'a', 'action': 'pid', 'execution': 'process'},
+            {'name': 'b', 'action': 'pid'},
+        ), actions={'pid': worker_pid}, workers=2)
+        assert result.succeeded, [s.error for s in result.steps]
+        assert result.outputs['a']['pid'] != os.getpid()
+        assert result.outputs['b']['pid'] == os.getpid()
+
+    def test_large_buffers_use_shared_memory(self, executor, process_pool):
+        """Big results come back as bytes; big arguments arrive as memoryviews, small ones pickled."""
+        size = process_pool.SHARED_MEMORY_THRESHOLD * 2
+        result = executor.run_workflow(workflow(
+            {'name': 'make', 'action': 'make', 'execution': 'process', 'params': {'size': size}, 'outputs': ['blob']},
+            {'name': 'use', 'action': 'use', 'execution': 'process', 'needs': ['make'],
+             'inputs': {'blob': '{{outputs.make.blob}}'}},
+            {'name': 'small', 'action': 'use', 'execution': 'process', 'inputs': {'blob': [1, 2]}},
+        ), actions={'make': make_blob, 'use': worker_pid}, workers=2)
+
+        assert result.succeeded, [s.error for s in result.steps]
+        blob = result.outputs['make']['blob']
+        assert type(blob) is bytes and len(blob) == size
+        assert result.outputs['use']['blob_type'] == 'memoryview'
+        assert result.outputs['use']['blob_sum'] == sum(blob[::4096])
+        assert result.outputs['small']['blob_type'] == 'list'
+
+    def test_namedtuples_cross_the_pool(self, executor, process_pool):
+        """Namedtuples keep their type both ways, with large fields shared like any other buffer."""
+        size = process_pool.SHARED_MEMORY_THRESHOLD * 2
+        result = executor.run_workflow(workflow(
+            {'name': 'make', 'action': 'make', 'execution': 'process', 'params': {'size': size}, 'outputs': ['point']},
+            {'name': 'use', 'action': 'use', 'execution': 'process', 'needs': ['make'],
+             'inputs': {'point': '{{outputs.make.point}}'}},
+            {'name': 'small', 'action': 'use', 'execution': 'process', 'inputs': {'point': Point(1, 2)}},
+        ), actions={'make': make_point, 'use': use_point}, workers=2)
+
+        assert result.succeeded, [s.error for s in result.steps]
+        point = result.outputs['make']['point']
+        assert type(point) is Point and point.y == bytes(size)
+        assert result.outputs['use'] == {'type': 'Point', 'x': 3, 'y_type': 'memoryview'}
+        assert result.outputs['small'] == {'type': 'Point', 'x': 1, 'y_type': 'int'}
+
+    def test_other_sequence_subclasses_pass_through(self, process_pool):
+        class Tagged(list):
+            def __init__(self, tag, items):
+                super().__init__(items)
+                self.tag = tag
+
+        value = Tagged('t', [b'x' * 64])
+        assert process_pool.share_buffers(value, [], threshold=32) is value
+
+    def test_shared_blocks_are_freed(self, process_pool):
+        blocks = []
+        shared = process_pool.share_buffers({'a': [b'x' * 10, bytearray(64)]}, blocks, threshold=32)
+        assert shared['a'][0] == b'x' * 10
+        handle = shared['a'][1]
+        assert isinstance(handle, process_pool.SharedBuffer) and handle.size == 64
+        process_pool.release(blocks, unlink=True)
+        with pytest.raises(FileNotFoundError):
+            process_pool.SharedMemory(name=handle.name)
+
+    def test_execution_class_validated(self, executor):
+        with pytest.raises(ValueError, match='Unknown execution class'):
+            executor.action('x', execution='gpu')
+        with pytest.raises(executor.ExecutionError, match='needs execution .async.'):
+            executor.WorkflowExecutor(workflow({'name': 'a', 'action': 'x', 'execution': 'process'}),
+                                      actions={'x': InFlight()})
+
+
+class TestStepCache:
+    """Test content-addressed reuse of step outputs across runs."""
+
+    @pytest.fixture
+    def step_cache(self, executor):
+        return importlib.import_module('workflow_step_cache')
+
+    def run(self, executor, step_cache, calls, value='v1', **step_fields):
+        def build(params, inputs):
+            calls.append(params['value'])
+            return {'artifact': params['value'] + '.tar'}
+
+        return executor.run_workflow(workflow(
+            {'name': 'build', 'action': 'build', 'params': {'value': '{{inputs.value}}'},
+             'outputs': ['artifact'], **step_fields},
+            {'name': 'ship', 'action': 'ship', 'needs': ['build'], 'outputs': ['shipped'],
+             'inputs': {'artifact': '{{outputs.build.artifact}}'}},
+        ), inputs={'value': value}, step_cache=step_cache,
+            actions={'build': build, 'ship': lambda params, inputs: inputs['artifact']})
+
+    def test_rerun_hits_and_changed_inputs_miss(self, executor, step_cache, tmp_path):
+        calls = []
+        first = self.run(executor, step_cache.StepCache(str(tmp_path)), calls)
+        assert first.cache['misses'] == 2 and not any(s.cached for s in first.steps)
+
+        second = self.run(executor, step_cache.StepCache(str(tmp_path)), calls)
+        assert second.cache == {**second.cache, 'hits': 2, 'misses': 0}
+        assert all(s.cached for s in second.steps)
+        assert second.outputs == first.outputs
+        assert calls == ['v1']
+
+        third = self.run(executor, step_cache.StepCache(str(tmp_path)), calls, value='v2')
+        assert calls == ['v1', 'v2']
+        assert third.outputs['ship'] == {'shipped': 'v2.tar'}
+
+    def test_cache_false_opts_out(self, executor, step_cache, tmp_path):
+        calls = []
+        for _ in range(2):
+            result = self.run(executor, step_cache.StepCache(str(tmp_path)), calls, cache=False)
+        assert calls == ['v1', 'v1']
+        assert [s.cached for s in result.steps] == [False, True]
+
+    def test_action_identity_tracks_code(self, step_cache):
+        def one(params, inputs):
+            return 1
+
+        def two(params, inputs):
+            return 2
+
+        assert step_cache.action_identity('a', one) != step_cache.action_identity('a', two)
+        assert step_cache.action_identity('a', one) == step_cache.action_identity('a', one)
+        assert step_cache.action_identity('a', one) != step_cache.action_identity('b', one)
+
+    def test_buffers_key_by_content(self, step_cache):
+        key = step_cache.step_key('id', {'blob': b'abc'}, {}, None)
+        assert key == step_cache.step_key('id', {'blob': bytearray(b'abc')}, {}, None)
+        assert key != step_cache.step_key('id', {'blob': b'abd'}, {}, None)
+
+    def test_keys_are_typed_and_order_free(self, step_cache):
+        """Mixed-type mapping keys hash, in any order, and values of different types never collide."""
+        key = step_cache.step_key('id', {200: 'ok', 'default': 'fallback'}, {}, None)
+        assert key == step_cache.step_key('id', {'default': 'fallback', 200: 'ok'}, {}, None)
+        assert key != step_cache.step_key('id', {'200': 'ok', 'default': 'fallback'}, {}, None)
+        assert step_cache.step_key('id', {'n': 1}, {}, None) != step_cache.step_key('id', {'n': True}, {}, None)
+        assert step_cache.step_key('id', {'n': 1}, {}, None) != step_cache.step_key('id', {'n': '1'}, {}, None)
+
+    def test_unencodable_arguments_run_uncached(self, executor, step_cache, tmp_path):
+        """Objects without a stable encoding are a miss and are never cached, but the step still runs."""
+        assert step_cache.step_key('id', {'obj': object()}, {}, None) is None
+        calls = []
+        steps = workflow({'name': 'route', 'action': 'route', 'outputs': ['routes'],
+                          'params': {'codes': {200: 'ok', 'default': 'fallback'}, 'obj': '{{inputs.obj}}'}})
+
+        def route(params, inputs):
+            calls.append(params)
+            return sorted(map(str, params['codes']))
+
+        for _ in range(2):
+            result = executor.run_workflow(steps, inputs={'obj': object()}, actions={'route': route},
+                                           step_cache=step_cache.StepCache(str(tmp_path)))
+            assert result.succeeded, [s.error for s in result.steps]
+            assert result.outputs['route'] == {'routes': ['200', 'default']}
+            assert result.cache['misses'] == 1
+        assert len(calls) == 2 and not list(tmp_path.rglob('*.pickle'))
+
+        del steps['steps'][0]['params']['obj']
+        for expected_calls in (3, 3):
+            result = executor.run_workflow(steps, actions={'route': route},
+                                           step_cache=step_cache.StepCache(str(tmp_path)))
+            assert result.succeeded and len(calls) == expected_calls
+
+    def test_lru_eviction(self, step_cache, tmp_path):
+        """Writing past the budget evicts the least recently used entries first."""
+        cache = step_cache.StepCache(str(tmp_path), max_bytes=3500)
+        for i, key in enumerate(['aa01', 'bb02', 'cc03']):
+            assert cache.put(key, {'data': bytes(1000)})
+            os.utime(cache._entry_path(key), (i, i))
+        assert cache.get('aa01') is not step_cache.MISSING  # Now the most recently used
+
+        assert cache.put('dd04', {'data': bytes(1000)})
+        assert cache.evictions == 1
+        assert cache.get('bb02') is step_cache.MISSING
+        assert all(cache.get(key) is not step_cache.MISSING for key in ['aa01', 'cc03', 'dd04'])
+        assert cache.size <= 3500 * step_cache.LOW_WATER_MARK
+
+    def test_oversized_overwrite_releases_old_entry(self, step_cache, tmp_path):
+        """Replacing an entry with one over the budget drops both from the size total."""
+        cache = step_cache.StepCache(str(tmp_path), max_bytes=2000)
+        assert cache.put('aa01', {'data': bytes(1000)})
+        assert cache.size > 1000
+        assert not cache.put('aa01', {'data': bytes(5000)})
+        assert cache.get('aa01') is step_cache.MISSING
+        assert cache.size == 0 == sum(size for _, size, _ in cache._entries())
+
+    def test_unpicklable_outputs_not_cached(self, step_cache, tmp_path):
+        cache = step_cache.StepCache(str(tmp_path))
+        assert not cache.put('ee05', {'handle': threading.Lock()})
+        assert cache.get('ee05') is step_cache.MISSING
+        assert cache.size == 0
+        assert not list(tmp_path.rglob('*.tmp'))
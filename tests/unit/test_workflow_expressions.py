@@ -0,0 +1,71 @@
+# Workflow Expression Tests
+# Tests for compiled conditions and templates in workflow_expressions.py
+
+import pytest
+
+
+@pytest.fixture
+def expressions(load_script):
+    """Get the workflow_expressions module."""
+    return load_script('workflow_expressions.py')
+
+
+class TestConditions:
+    """Test parsing and evaluating condition expressions."""
+
+    @pytest.mark.parametrize('source, expected', [
+        ('outputs.verify.success == true', True),
+        ("inputs.env != 'prod' and outputs.verify.score >= 0.9", True),
+        ('not outputs.verify.success || inputs.force', False),
+        ("inputs.env in ['dev', 'staging']", True),
+        ("inputs.env not in ['dev', 'staging']", False),
+        ('outputs.missing.value > 1', False),
+        ('(inputs.count > 2 && inputs.count < 5) or false', True),
+    ])
+    def test_evaluate(self, expressions, source, expected):
+        context = {
+            'inputs': {'env': 'dev', 'force': False, 'count': 3},
+            'outputs': {'verify': {'success': True, 'score': 0.95}},
+        }
+        assert expressions.compile_expression(source).evaluate(context) is expected
+
+    @pytest.mark.parametrize('source', ['a ==', 'a == == b', '(a', 'a $ b', 'outputs.'])
+    def test_syntax_errors(self, expressions, source):
+        with pytest.raises(expressions.ExpressionError):
+            expressions.Expression(source)
+
+    def test_output_refs(self, expressions):
+        expression = expressions.compile_expression(
+            "outputs.build.artifact.path != null and steps.test.outputs.passed"
+        )
+        assert expression.output_refs == (
+            expressions.OutputRef('build', 'artifact', ('path',)),
+            expressions.OutputRef('test', 'passed', ()),
+        )
+
+    def test_compiled_once(self, expressions):
+        assert expressions.compile_expression('a == 1') is expressions.compile_expression('a == 1')
+
+
+class TestTemplates:
+    """Test template rendering and reference extraction."""
+
+    def test_render(self, expressions):
+        template = expressions.compile_template('Deploy {{ outputs.build.tag }} to {{inputs.env}}')
+        context = {'inputs': {'env': 'prod'}, 'outputs': {'build': {'tag': 'v1'}}}
+        assert template.render(context) == 'Deploy v1 to prod'
+        assert [ref.step for ref in template.output_refs] == ['build']
+
+    def test_lone_placeholder_keeps_type(self, expressions):
+        template = expressions.compile_template('{{steps.scan.outputs.findings}}')
+        context = {'outputs': {'scan': {'findings': [1, 2]}}, 'steps': {'scan': {'outputs': {'findings': [1, 2]}}}}
+        assert template.render(context) == [1, 2]
+
+    def test_default_filter(self, expressions):
+        template = expressions.compile_template("{{ inputs.region | default('us-east-1') }}")
+        assert template.render({'inputs': {}}) == 'us-east-1'
+
+    def test_step_outputs(self, expressions):
+        assert expressions.step_outputs({'outputs': ['a', 'b']}) == {'a', 'b'}
+        assert expressions.step_outputs({'outputs': {'a': 'string'}}) == {'a'}
+        assert expressions.step_outputs({}) is None
@@ -0,0 +1,215 @@
+# Workflow Journal Tests
+# Tests for the SQLite run journal and resuming runs
+
+import json
+import sys
+import threading
+import types
+
+import pytest
+
+
+@pytest.fixture
+def journal_module(load_script):
+    """Get the workflow_journal module."""
+    return load_script('workflow_journal.py')
+
+
+@pytest.fixture
+def executor(load_script):
+    """Get the workflow_executor module."""
+    return load_script('workflow_executor.py')
+
+
+def journaled_run(executor, journal, workflow, actions, run_id=None):
+    """Run workflow the way run-workflow.py does, recording it in journal."""
+    completed = journal.completed_steps(run_id, workflow['steps']) if run_id else {}
+    run_id = journal.start_run('wf.yaml', workflow, {}, run_id)
+    steps = {step['name']: step for step in workflow['steps']}
+
+    def on_step(result):
+        if not result.resumed:
+            journal.record_step(run_id, steps[result.name], steps[result.name]['action'], result)
+
+    result = executor.run_workflow(workflow, actions=actions, completed=completed, on_step=on_step,
+                                   on_start=lambda name: journal.step_started(run_id, name))
+    journal.finish_run(run_id, 'succeeded' if result.succeeded else 'failed')
+    return run_id, result
+
+
+class TestJournal:
+    """Test checkpointing step transitions and resuming from the frontier."""
+
+    def test_resume_skips_completed_steps(self, journal_module, executor, tmp_path):
+        calls = []
+        broken = {'b': True}
+
+        def work(params, inputs):
+            calls.append(params['n'])
+            if broken.get(params['n']):
+                raise RuntimeError('not yet')
+            return {'out': params['n'] + str(inputs.get('prev', ''))}
+
+        workflow = {'name': 'wf', 'steps': [
+            {'name': 'a', 'action': 'work', 'params': {'n': 'a'}, 'outputs': ['out']},
+            {'name': 'b', 'action': 'work', 'needs': ['a'], 'params': {'n': 'b'},
+             'inputs': {'prev': '{{outputs.a.out}}'}, 'outputs': ['out']},
+            {'name': 'c', 'action': 'work', 'needs': ['b'], 'params': {'n': 'c'}, 'outputs': ['out']},
+        ]}
+        journal = journal_module.Journal(str(tmp_path / 'runs.sqlite'))
+        run_id, first = journaled_run(executor, journal, workflow, {'work': work})
+        assert not first.succeeded
+        assert journal.run(run_id).status == 'failed'
+        assert journal.step_states(run_id) == {'a': 'succeeded', 'b': 'failed', 'c': 'skipped'}
+
+        broken.clear()
+        calls.clear()
+        _, second = journaled_run(executor, journal, workflow, {'work': work}, run_id)
+        assert second.succeeded
+        assert calls == ['b', 'c']
+        assert second.outputs['b'] == {'out': 'ba'}
+        assert [s.resumed for s in second.steps] == [True, False, False]
+        assert journal.run(run_id).status == 'succeeded'
+
+        events = journal._conn.execute("SELECT step, status FROM events WHERE step = 'b'").fetchall()
+        assert events == [('b', 'running'), ('b', 'failed'), ('b', 'running'), ('b', 'succeeded')]
+        journal.close()
+
+    def test_changed_steps_rerun(self, journal_module, tmp_path):
+        journal = journal_module.Journal(str(tmp_path / 'runs.sqlite'))
+        steps = [{'name': 'a', 'action': 'x'}]
+        run_id = journal.start_run('wf.yaml', {'steps': steps}, {})
+        result = type('Result', (), {'name': 'a', 'status': 'succeeded', 'outputs': {'v': 1},
+                                     'error': None, 'duration': 0.5, 'cached': False})()
+        journal.record_step(run_id, steps[0], 'x', result)
+        journal.flush()
+
+        assert journal.completed_steps(run_id, steps) == {'a': {'v': 1}}
+        assert journal.completed_steps(run_id, [{'name': 'a', 'action': 'x', 'params': {'n': 2}}]) == {}
+        assert journal.action_durations() == {'x': [0.5]}
+        assert journal.action_durations('other.yaml') == {}
+        journal.close()
+
+    def test_writes_are_batched(self, journal_module, executor, tmp_path):
+        """A wide run commits its hundreds of transitions in a handful of transactions."""
+        workflow = {'name': 'wide', 'steps': [{'name': f's{i}', 'action': 'x'} for i in range(500)]}
+        journal = journal_module.Journal(str(tmp_path / 'runs.sqlite'))
+        run_id, result = journaled_run(executor, journal, workflow, {'x': lambda params, inputs: {}})
+        assert result.succeeded
+        assert len(journal.step_states(run_id)) == 500
+        assert journal.batches < 500 * 2 / 10
+        journal.close()
+
+    def test_upstream_change_reruns_downstream(self, journal_module, executor, tmp_path):
+        """Steps fed by a step that runs again are run again too, not reused with stale outputs."""
+        def scale(params, inputs):
+            return {'v': params['n'] * inputs.get('factor', 1)}
+
+        def steps(n):
+            return {'name': 'wf', 'steps': [
+                {'name': 'a', 'action': 'scale', 'params': {'n': n}, 'outputs': ['v']},
+                {'name': 'b', 'action': 'scale', 'needs': ['a'], 'params': {'n': 2},
+                 'inputs': {'factor': '{{outputs.a.v}}'}, 'outputs': ['v']},
+                {'name': 'c', 'action': 'scale', 'needs': ['b'], 'params': {'n': 1},
+                 'inputs': {'factor': '{{outputs.b.v}}'}, 'outputs': ['v']},
+                {'name': 'd', 'action': 'scale', 'params': {'n': 7}, 'outputs': ['v']},
+            ]}
+
+        journal = journal_module.Journal(str(tmp_path / 'runs.sqlite'))
+        run_id, first = journaled_run(executor, journal, steps(1), {'scale': scale})
+        assert first.outputs['c'] == {'v': 2}
+
+        assert journal.completed_steps(run_id, steps(5)['steps']) == {'d': {'v': 7}}
+        _, second = journaled_run(executor, journal, steps(5), {'scale': scale}, run_id)
+        assert second.outputs['b'] == {'v': 10}
+        assert second.outputs['c'] == {'v': 10}
+        assert [s.resumed for s in second.steps] == [False, False, False, True]
+        journal.close()
+
+    def test_unpicklable_outputs_are_not_resumable(self, journal_module, executor, tmp_path, capsys):
+        """A step whose outputs cannot be pickled is journaled without them and runs again on resume."""
+        workflow = {'name': 'wf', 'steps': [
+            {'name': 'a', 'action': 'lock', 'outputs': ['lock']},
+            {'name': 'b', 'action': 'ok', 'needs': ['a']},
+        ]}
+        actions = {'lock': lambda params, inputs: {'lock': threading.Lock()}, 'ok': lambda params, inputs: {}}
+        journal = journal_module.Journal(str(tmp_path / 'runs.sqlite'))
+        run_id, result = journaled_run(executor, journal, workflow, actions)
+
+        assert [s.status for s in result.steps] == ['succeeded', 'succeeded']
+        assert 'outputs of a cannot be journaled' in capsys.readouterr().err
+        assert journal.step_states(run_id) == {'a': 'succeeded', 'b': 'succeeded'}
+        assert journal.completed_steps(run_id, workflow['steps']) == {}
+        journal.close()
+
+    def test_resume_with_custom_class_outputs(self, load_script, tmp_path, monkeypatch, capsys):
+        """Journaled instances of classes from an actions module load once --actions is imported."""
+        run_workflow = load_script('run-workflow.py')
+        (tmp_path / 'report_actions.py').write_text(
+            "from pathlib import Path\n"
+            "from workflow_executor import action\n"
+            "class Report:\n"
+            "    def __init__(self, score):\n"
+            "        self.score = score\n"
+            "@action('report')\n"
+            "def report(params, inputs):\n"
+            "    return {'report': Report(7)}\n"
+            "@action('publish')\n"
+            "def publish(params, inputs):\n"
+            "    if Path(params['flag']).exists():\n"
+            "        raise RuntimeError('not yet')\n"
+            "    return {'score': inputs['report'].score}\n"
+        )
+        flag = tmp_path / 'broken'
+        flag.touch()
+        (tmp_path / 'wf.yaml').write_text(
+            "name: reports\n"
+            "steps:\n"
+            "  - {name: report, action: report, outputs: [report]}\n"
+            "  - name: publish\n"
+            "    action: publish\n"
+            "    needs: [report]\n"
+            f"    params: {{flag: '{flag}'}}\n"
+            "    inputs: {report: '{{outputs.report.report}}'}\n"
+            "    outputs: [score]\n"
+        )
+        journal_path = str(tmp_path / 'runs.sqlite')
+        common = ['--actions', str(tmp_path / 'report_actions.py'), '--journal', journal_path,
+                  '--no-cache', '--no-step-cache']
+
+        def main(*argv):
+            # Each run starts without the actions module, as a new process would.
+            monkeypatch.delitem(sys.modules, 'report_actions', raising=False)
+            monkeypatch.setattr('sys.argv', ['run-workflow.py', *argv, *common])
+            with pytest.raises(SystemExit) as excinfo:
+                run_workflow.main()
+            return excinfo.value.code
+
+        assert main('--workflow', str(tmp_path / 'wf.yaml')) == 1
+        run_id = capsys.readouterr().out.split('--resume ')[1].split()[0]
+
+        flag.unlink()
+        assert main('--resume', run_id, '--json', str(tmp_path / 'out.json')) == 0
+        assert '1 steps already completed' in capsys.readouterr().out
+        result = json.loads((tmp_path / 'out.json').read_text())
+        assert [(s['name'], s['resumed']) for s in result['steps']] == [('report', True), ('publish', False)]
+        assert result['steps'][1]['outputs'] == {'score': 7}
+
+    def test_unloadable_outputs_rerun(self, journal_module, executor, tmp_path, monkeypatch, capsys):
+        """Outputs that no longer unpickle mark the step, and everything after it, to run again."""
+        module = types.ModuleType('vanishing_actions')
+        exec("class Token:\n    pass\n", module.__dict__)
+        monkeypatch.setitem(sys.modules, 'vanishing_actions', module)
+        workflow = {'name': 'wf', 'steps': [
+            {'name': 'a', 'action': 'make', 'outputs': ['token']},
+            {'name': 'b', 'action': 'use', 'needs': ['a']},
+            {'name': 'c', 'action': 'use'},
+        ]}
+        actions = {'make': lambda params, inputs: {'token': module.Token()}, 'use': lambda params, inputs: {}}
+        journal = journal_module.Journal(str(tmp_path / 'runs.sqlite'))
+        run_id, _ = journaled_run(executor, journal, workflow, actions)
+
+        monkeypatch.delitem(sys.modules, 'vanishing_actions')
+        assert journal.completed_steps(run_id, workflow['steps']) == {'c': {}}
+        assert 'journaled outputs of a cannot be loaded' in capsys.readouterr().err
+        journal.close()
@@ -0,0 +1,478 @@
+# Workflow Linter Tests
+# Tests for lint rules and the lint-workflow.py driver
+
+import pytest
+import yaml
+
+
+@pytest.fixture
+def lint_workflow(load_script):
+    """Get the lint-workflow module."""
+    return load_script('lint-workflow.py')
+
+
+def write_workflow(path, steps, **fields):
+    """Write a minimal valid workflow with the given steps."""
+    workflow = {
+        'name': path.stem,
+        'version': '1.0.0',
+        'description': 'Test workflow',
+        'triggers': ['manual'],
+        'steps': steps,
+        **fields,
+    }
+    path.write_text(yaml.safe_dump(workflow, sort_keys=False))
+    return path
+
+
+@pytest.fixture
+def workflows_dir(tmp_path):
+    """Create a directory of workflows with a mix of issues."""
+    root = tmp_path / 'workflows'
+    (root / 'nested').mkdir(parents=True)
+    for i in range(6):
+        steps = [{'name': 'build', 'action': 'builder.run'}]
+        if i % 2:
+            steps.append({'name': 'deploy', 'depends_on': ['missing']})
+        write_workflow(root / f'wf-{i}.yaml', steps)
+    write_workflow(root / 'nested' / 'other.yml', [{'action': 'x.run'}])
+    (root / 'broken.yaml').write_text("name: [unclosed\n")
+    return root
+
+
+class TestParallelLint:
+    """Test --jobs process-pool linting."""
+
+    def test_parallel_matches_serial(self, lint_workflow, workflows_dir):
+        """Parallel linting yields the same results in the same order."""
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        serial = [o[:4] for o in lint_workflow.lint_files(files, jobs=1)]
+        parallel = [o[:4] for o in lint_workflow.lint_files(files, jobs=3)]
+
+        assert [path for path, *_ in parallel] == [str(f) for f in files]
+        assert parallel == serial
+
+    def test_collect_includes_yaml_and_yml(self, lint_workflow, workflows_dir):
+        """Directory arguments expand to both .yaml and .yml files."""
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        assert sorted(f.name for f in files) == sorted(
+            [f'wf-{i}.yaml' for i in range(6)] + ['broken.yaml', 'other.yml']
+        )
+
+    def test_load_errors_reported_separately(self, lint_workflow, workflows_dir):
+        """Files that fail to load report YAML_VALID and are flagged as not loaded."""
+        path, loaded, results, *_ = lint_workflow.lint_file(str(workflows_dir / 'broken.yaml'))
+        assert not loaded
+        assert [r.rule for r in results] == ['YAML_VALID']
+
+
+class TestWorkflowCache:
+    """Test the shared content-hash cache of parsed workflows."""
+
+    @pytest.fixture
+    def workflow_loader(self, lint_workflow):
+        # The module lint-workflow.py itself imports, not a second copy.
+        import workflow_loader
+        return workflow_loader
+
+    def test_second_load_hits(self, workflow_loader, workflows_dir, tmp_path):
+        """A second process-level cache reuses entries written by the first."""
+        path = str(workflows_dir / 'wf-0.yaml')
+        first = workflow_loader.WorkflowCache(str(tmp_path / 'cache'))
+        document = first.load(path)
+        assert (first.hits, first.misses) == (0, 1)
+
+        second = workflow_loader.WorkflowCache(str(tmp_path / 'cache'))
+        assert second.load(path) == document == yaml.safe_load(open(path))
+        assert (second.hits, second.misses) == (1, 0)
+
+    def test_edit_misses(self, workflow_loader, workflows_dir, tmp_path):
+        """Changing the file contents invalidates the cached document."""
+        path = workflows_dir / 'wf-0.yaml'
+        cache = workflow_loader.WorkflowCache(str(tmp_path / 'cache'))
+        cache.load(str(path))
+        write_workflow(path, [{'name': 'test', 'action': 'tester.run'}])
+
+        assert cache.load(str(path))['steps'][0]['name'] == 'test'
+        assert cache.misses == 2
+
+    def test_parse_errors_name_file(self, workflow_loader, workflows_dir, tmp_path):
+        """YAML errors point at the file, and failures are not cached."""
+        path = str(workflows_dir / 'broken.yaml')
+        cache = workflow_loader.WorkflowCache(str(tmp_path / 'cache'))
+        with pytest.raises(yaml.YAMLError, match='broken.yaml'):
+            cache.load(path)
+        assert not (tmp_path / 'cache').exists()
+
+    def test_unloadable_entry_is_a_miss(self, workflow_loader, tmp_path):
+        """Entries naming a class that no longer imports are re-parsed, not an error."""
+        entry = tmp_path / 'entry.pickle'
+        # Protocol 0 pickle of a global from a module that does not exist.
+        entry.write_bytes(b"cno_such_module\nGone\np0\n.")
+        assert workflow_loader.read_entry(entry, 'miss') == 'miss'
+        entry.write_bytes(b"cworkflow_loader\nNoSuchClass\np0\n.")
+        assert workflow_loader.read_entry(entry, 'miss') == 'miss'
+
+    def test_pickles_without_memory(self, workflow_loader, workflows_dir, tmp_path):
+        """Caches sent to worker processes leave the in-memory layer behind."""
+        import pickle
+        cache = workflow_loader.WorkflowCache(str(tmp_path / 'cache'))
+        cache.load(str(workflows_dir / 'wf-0.yaml'))
+        clone = pickle.loads(pickle.dumps(cache))
+        assert clone._memory == {}
+        assert clone.cache_dir == cache.cache_dir
+
+    def test_lint_with_cache_matches(self, lint_workflow, workflow_loader, workflows_dir, tmp_path):
+        """Linting through the cache reports exactly what an uncached run does."""
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        cache = workflow_loader.WorkflowCache(str(tmp_path / 'cache'))
+        uncached = [o[:4] for o in lint_workflow.lint_files(files, jobs=1)]
+        assert [o[:4] for o in lint_workflow.lint_files(files, jobs=2, cache=cache)] == uncached
+        assert [o[:4] for o in lint_workflow.lint_files(files, jobs=1, cache=cache)] == uncached
+
+
+class TestIncrementalLint:
+    """Test the content-hash lint result cache."""
+
+    @pytest.fixture
+    def result_cache(self, lint_workflow, tmp_path):
+        return lint_workflow.LintResultCache(str(tmp_path / 'cache'))
+
+    def test_unchanged_files_come_from_cache(self, lint_workflow, workflows_dir, result_cache):
+        """A second run re-lints nothing and returns identical results."""
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        first = list(lint_workflow.lint_files(files, result_cache=result_cache))
+        second = list(lint_workflow.lint_files(files, jobs=2, result_cache=result_cache))
+
+        assert all(outcome.linted for outcome in first)
+        assert not any(outcome.linted for outcome in second)
+        assert [r[:3] for r in second] == [r[:3] for r in first]
+
+    def test_only_changed_file_relinted(self, lint_workflow, workflows_dir, result_cache):
+        """Editing one file re-lints just that file."""
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        list(lint_workflow.lint_files(files, result_cache=result_cache))
+        write_workflow(workflows_dir / 'wf-2.yaml', [{'name': 'build'}])
+
+        rerun = list(lint_workflow.lint_files(files, result_cache=result_cache))
+        relinted = [outcome.path for outcome in rerun if outcome.linted]
+        assert relinted == [str(workflows_dir / 'wf-2.yaml')]
+        results = {outcome.path: outcome.results for outcome in rerun}
+        assert [r.rule for r in results[relinted[0]]] == ['STEP_ACTION']
+
+    def test_rule_set_change_invalidates(self, lint_workflow, workflows_dir, tmp_path):
+        """Results cached under another rule set are not reused."""
+        path = str(workflows_dir / 'wf-0.yaml')
+        full = lint_workflow.LintResultCache(str(tmp_path / 'cache'))
+        lint_workflow.lint_file(path, result_cache=full)
+
+        selection = lint_workflow.RuleSelection.resolve(['required-fields'])
+        partial_rules = lint_workflow.LintResultCache(str(tmp_path / 'cache'), selection)
+        assert partial_rules.fingerprint != full.fingerprint
+        assert lint_workflow.lint_file(path, result_cache=partial_rules, selection=selection).linted
+
+    def test_rule_module_change_invalidates(self, lint_workflow, tmp_path, monkeypatch):
+        """Editing a helper module that implements rules changes the fingerprint."""
+        sources = [tmp_path / source.name for source in lint_workflow.RULE_SOURCES]
+        for source, copy in zip(lint_workflow.RULE_SOURCES, sources):
+            copy.write_bytes(source.read_bytes())
+        monkeypatch.setattr(lint_workflow, 'RULE_SOURCES', tuple(sources))
+        before = lint_workflow.rules_fingerprint()
+
+        graph = tmp_path / 'workflow_graph.py'
+        graph.write_text(graph.read_text() + '\n# changed\n')
+        assert lint_workflow.rules_fingerprint() != before
+
+
+class TestDagRules:
+    """Test dependency-graph analytics over needs and depends_on."""
+
+    def lint_steps(self, lint_workflow, tmp_path, steps):
+        path = write_workflow(tmp_path / 'dag.yaml', steps)
+        return lint_workflow.lint_file(str(path))[2]
+
+    def test_needs_and_depends_on_form_one_graph(self, lint_workflow, tmp_path):
+        """Critical path and width cover both dependency keys."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'checkout', 'action': 'git.checkout'},
+            {'name': 'lint', 'action': 'linter.run', 'needs': ['checkout']},
+            {'name': 'test', 'action': 'test.runner', 'depends_on': ['checkout']},
+            {'name': 'build', 'action': 'builder.run', 'needs': 'test'},
+        ])
+        shape = [r for r in results if r.rule == 'DAG_SHAPE']
+        assert len(shape) == 1
+        assert 'Critical path: 3 of 4 steps (checkout → test → build)' in shape[0].message
+        assert 'max parallel width: 2 (lint, test)' in shape[0].message
+        assert not [r for r in results if r.rule == 'STEP_DEPENDENCY']
+
+    def test_unknown_needs_make_steps_unreachable(self, lint_workflow, tmp_path):
+        """Unknown dependencies are reported along with everything downstream of them."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'a', 'action': 'x.run'},
+            {'name': 'b', 'action': 'x.run', 'needs': ['missing']},
+            {'name': 'c', 'action': 'x.run', 'needs': ['b', 'a']},
+        ])
+        assert [r.message for r in results if r.rule == 'STEP_DEPENDENCY'] == [
+            "Step 'b' depends on unknown step: missing"
+        ]
+        unreachable = [r.message for r in results if r.rule == 'DAG_UNREACHABLE']
+        assert [m.split("'")[1] for m in unreachable] == ['b', 'c']
+
+    def test_redundant_edges_and_orphans(self, lint_workflow, tmp_path):
+        """Transitively implied edges and disconnected steps are flagged."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'a', 'action': 'x.run'},
+            {'name': 'b', 'action': 'x.run', 'needs': ['a']},
+            {'name': 'c', 'action': 'x.run', 'needs': ['a', 'b']},
+            {'name': 'lonely', 'action': 'x.run'},
+        ])
+        assert [r.message for r in results if r.rule == 'DAG_REDUNDANT_EDGE'] == [
+            "Step 'c' dependency on 'a' is implied transitively"
+        ]
+        assert [r.message for r in results if r.rule == 'DAG_ORPHAN'] == [
+            "Step 'lonely' has no dependencies and nothing depends on it"
+        ]
+
+    def test_reachability_matches_walks(self, lint_workflow):
+        """One-pass bitset reachability agrees with walking each step's ancestors."""
+        import random
+        from workflow_graph import WorkflowGraph
+        rng = random.Random(7)
+        steps = [{'name': f's{i}', 'needs': [f's{j}' for j in rng.sample(range(i), min(i, rng.randint(0, 4)))]}
+                 for i in range(200)]
+        # Steps listed out of topological order, plus a cycle and a step behind it
+        steps.reverse()
+        steps += [{'name': 'x', 'needs': ['y', 's3']}, {'name': 'y', 'needs': ['x']}, {'name': 'z', 'needs': ['y']}]
+        graph = WorkflowGraph(steps)
+
+        walked = []
+        for node in graph.order:
+            parents = {parent for dep in graph.deps[node] for parent in graph.ancestors(dep)}
+            walked.extend((dep, node) for dep in graph.deps[node] if dep in parents)
+        assert sorted(graph.redundant_edges()) == sorted(walked)
+        assert walked
+
+        pairs = [(i, j) for i in range(len(graph)) for j in range(0, len(graph), 5)]
+        assert graph.depends_on(pairs) == {(i, j) for i, j in pairs if j in graph.ancestors(i)}
+
+    def test_serial_chain_without_data_flow(self, lint_workflow, tmp_path):
+        """Chains are reported only for links that pass no data along."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'fetch', 'action': 'x.run', 'outputs': ['data']},
+            {'name': 'parse', 'action': 'x.run', 'needs': ['fetch'],
+             'params': {'input': '{{steps.fetch.outputs.data}}'}},
+            {'name': 'notify', 'action': 'x.run', 'needs': ['parse']},
+        ])
+        chains = [r.message for r in results if r.rule == 'DAG_SERIAL_CHAIN']
+        assert chains == ["Serialized chain fetch → parse → notify: 'notify' uses nothing from 'parse'"]
+
+    def test_cycles_reported(self, lint_workflow, tmp_path):
+        """Steps caught in a cycle are an error and cannot run."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'a', 'action': 'x.run', 'needs': ['b']},
+            {'name': 'b', 'action': 'x.run', 'depends_on': ['a']},
+            {'name': 'c', 'action': 'x.run', 'needs': ['b']},
+        ])
+        assert [r.severity for r in results if r.rule == 'DAG_CYCLE'] == ['error']
+        assert len([r for r in results if r.rule == 'DAG_UNREACHABLE']) == 3
+
+    def test_large_graph_is_linear(self, lint_workflow, tmp_path):
+        """A long generated chain lints quickly and without recursion limits."""
+        import time
+        steps = [{'name': 's0', 'action': 'x.run'}] + [
+            {'name': f's{i}', 'action': 'x.run', 'needs': [f's{i-1}']} for i in range(1, 10000)
+        ]
+        start = time.perf_counter()
+        results = self.lint_steps(lint_workflow, tmp_path, steps)
+        assert time.perf_counter() - start < 10
+        assert [r for r in results if r.rule == 'DAG_SHAPE'][0].message.startswith(
+            'Critical path: 10000 of 10000 steps')
+
+
+class TestStreamingOutput:
+    """Test NDJSON/SARIF writers and bounded streaming of results."""
+
+    @pytest.fixture
+    def results(self, lint_workflow, workflows_dir):
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        return [r for outcome in lint_workflow.lint_files(files) if outcome.loaded for r in outcome.results]
+
+    def test_ndjson_one_result_per_line(self, lint_workflow, results):
+        """Each result is written as its own JSON line as soon as it arrives."""
+        import io
+        import json
+        stream = io.StringIO()
+        writer = lint_workflow.NdjsonWriter(stream)
+        writer.write(results[:1])
+        assert stream.getvalue().count('\n') == 1
+        writer.write(results[1:])
+        writer.close(files=1)
+
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == [lint_workflow.result_to_dict(r) for r in results]
+
+    def test_sarif_document(self, lint_workflow, results):
+        """The streamed SARIF log parses as one document with every result."""
+        import io
+        import json
+        stream = io.StringIO()
+        writer = lint_workflow.SarifWriter(stream)
+        for result in results:
+            writer.write([result])
+        writer.close(files=8, errors=3)
+
+        log = json.loads(stream.getvalue())
+        run = log['runs'][0]
+        assert log['version'] == '2.1.0'
+        assert run['tool']['driver']['name'] == 'lint-workflow'
+        assert [r['ruleId'] for r in run['results']] == [r.rule for r in results]
+        assert {r['level'] for r in run['results']} <= {'error', 'warning', 'note'}
+        assert run['invocations'][0]['properties'] == {'files': 8, 'errors': 3}
+
+    def test_empty_sarif_is_valid(self, lint_workflow):
+        """A run without findings still produces a complete SARIF log."""
+        import io
+        import json
+        stream = io.StringIO()
+        lint_workflow.SarifWriter(stream).close()
+        assert json.loads(stream.getvalue())['runs'][0]['results'] == []
+
+    def test_parallel_lint_consumes_files_lazily(self, lint_workflow, workflows_dir):
+        """Only a bounded window of files is pulled ahead of the consumer."""
+        consumed = []
+        paths = sorted(workflows_dir.glob('*.yaml')) * 10
+
+        def files():
+            for path in paths:
+                consumed.append(path)
+                yield path
+
+        stream = lint_workflow.lint_files(files(), jobs=2, chunksize=2)
+        next(stream)
+        assert len(consumed) <= 2 * 2 * 2 + 2
+        assert len(list(stream)) == len(paths) - 1
+
+
+class TestRuleRegistry:
+    """Test rule registration, --select/--ignore resolution and profiling."""
+
+    @pytest.fixture
+    def broken_workflow(self, tmp_path):
+        return str(write_workflow(tmp_path / 'My_Flow.yaml', [
+            {'name': 'build'},
+            {'name': 'deploy', 'action': 'x.run', 'needs': ['missing']},
+        ], version='1.0'))
+
+    def rules_reported(self, lint_workflow, path, select=(), ignore=()):
+        selection = lint_workflow.RuleSelection.resolve(select, ignore)
+        return {r.rule for r in lint_workflow.lint_file(path, selection=selection).results}
+
+    def test_every_rule_registered_in_order(self, lint_workflow):
+        """All built-in checks are registered, each with a description."""
+        names = list(lint_workflow.RULE_REGISTRY)
+        assert names[:4] == ['required-fields', 'version', 'triggers', 'steps']
+        assert 'serial-chains' in names
+        assert all(rule.description for rule in lint_workflow.RULE_REGISTRY.values())
+
+    def test_select_by_rule_and_code(self, lint_workflow, broken_workflow):
+        """Rule names run whole rules; codes keep only those results."""
+        assert self.rules_reported(lint_workflow, broken_workflow, ['version']) == {'VERSION_FORMAT'}
+        assert self.rules_reported(lint_workflow, broken_workflow, ['steps']) == {'STEP_ACTION', 'STEP_DEPENDENCY'}
+        assert self.rules_reported(lint_workflow, broken_workflow, ['STEP_DEPENDENCY']) == {'STEP_DEPENDENCY'}
+
+    def test_ignore_by_rule_and_code(self, lint_workflow, broken_workflow):
+        """Ignored rules do not run and ignored codes are dropped."""
+        everything = self.rules_reported(lint_workflow, broken_workflow)
+        assert 'NAMING_CONVENTION' in everything
+        assert self.rules_reported(lint_workflow, broken_workflow, ignore=['naming-conventions']) == \
+            everything - {'NAMING_CONVENTION'}
+        assert self.rules_reported(lint_workflow, broken_workflow, ignore=['STEP_ACTION']) == \
+            everything - {'STEP_ACTION'}
+
+    def test_empty_selection_runs_nothing(self, lint_workflow, broken_workflow, monkeypatch, capsys):
+        """Ignoring everything selected runs no rules, and the CLI refuses it."""
+        assert self.rules_reported(lint_workflow, broken_workflow, ['version'], ['version']) == set()
+        assert self.rules_reported(lint_workflow, broken_workflow, ignore=list(lint_workflow.RULE_REGISTRY)) == set()
+
+        for argv in (['--select', 'version', '--ignore', 'version'],
+                     ['--ignore', ','.join(lint_workflow.RULE_REGISTRY)]):
+            monkeypatch.setattr('sys.argv', ['lint-workflow.py', *argv, broken_workflow])
+            with pytest.raises(SystemExit) as excinfo:
+                lint_workflow.main()
+            assert excinfo.value.code == 2
+            assert 'no rules selected' in capsys.readouterr().err
+
+    def test_unknown_selection_rejected(self, lint_workflow):
+        with pytest.raises(ValueError, match='no-such-rule'):
+            lint_workflow.RuleSelection.resolve(['no-such-rule'])
+
+    def test_profile_accumulates_per_rule(self, lint_workflow, workflows_dir):
+        """The profile counts one call per rule per linted file and sums findings."""
+        files = lint_workflow.collect_workflow_files([str(workflows_dir)])
+        selection = lint_workflow.RuleSelection.resolve(['steps', 'version'])
+        profile = lint_workflow.RuleProfile()
+        for outcome in lint_workflow.lint_files(files, jobs=2, selection=selection):
+            profile.add(outcome.timings)
+
+        report = profile.to_dict()
+        assert report['files'] == 7
+        assert set(report['rules']) == {'steps', 'version'}
+        assert report['rules']['steps']['calls'] == 7
+        assert report['rules']['steps']['findings'] == 7
+        assert report['rules']['version']['findings'] == 0
+        assert all(rule['total_ms'] >= 0 for rule in report['rules'].values())
+
+
+class TestExpressionRules:
+    """Test condition and output-reference checks in the guards rule."""
+
+    def lint_steps(self, lint_workflow, tmp_path, steps):
+        path = write_workflow(tmp_path / 'refs.yaml', steps)
+        selection = lint_workflow.RuleSelection.resolve(['guards'])
+        return lint_workflow.lint_file(str(path), selection=selection)[2]
+
+    def test_valid_references_pass(self, lint_workflow, tmp_path):
+        """Both reference forms resolve against declared outputs of dependencies."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'build', 'action': 'builder.run', 'outputs': ['artifact', 'ok']},
+            {'name': 'deploy', 'action': 'deployer.run', 'needs': ['build'],
+             'condition': 'outputs.build.ok == true',
+             'inputs': {'artifact': '{{steps.build.outputs.artifact}}'}},
+        ])
+        assert results == []
+
+    def test_condition_syntax(self, lint_workflow, tmp_path):
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'build', 'action': 'builder.run', 'condition': 'inputs.env == == 1'},
+        ])
+        assert [r.rule for r in results] == ['CONDITION_SYNTAX']
+        assert results[0].severity == 'error'
+
+    def test_unknown_step_and_output(self, lint_workflow, tmp_path):
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'build', 'action': 'builder.run', 'outputs': {'artifact': 'string'}},
+            {'name': 'deploy', 'action': 'deployer.run', 'needs': ['build'],
+             'inputs': {'a': '{{outputs.build.binary}}', 'b': '{{outputs.compile.artifact}}'}},
+        ])
+        by_rule = {r.rule: r for r in results}
+        assert set(by_rule) == {'OUTPUT_REF_NAME', 'OUTPUT_REF_STEP'}
+        assert by_rule['OUTPUT_REF_NAME'].suggestion == 'Declared outputs: artifact'
+        assert "no step 'compile'" in by_rule['OUTPUT_REF_STEP'].message
+
+    def test_undeclared_outputs_and_order(self, lint_workflow, tmp_path):
+        """Referencing a step that declares nothing, and is not a dependency, warns twice."""
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'scan', 'action': 'scanner.run'},
+            {'name': 'report', 'action': 'report.run', 'condition': 'outputs.scan.found > 0'},
+        ])
+        assert sorted((r.rule, r.severity) for r in results) == [
+            ('OUTPUT_REF_ORDER', 'warning'), ('OUTPUT_REF_UNDECLARED', 'warning')
+        ]
+
+    def test_transitive_dependency_satisfies_order(self, lint_workflow, tmp_path):
+        results = self.lint_steps(lint_workflow, tmp_path, [
+            {'name': 'a', 'action': 'x.run', 'outputs': ['v']},
+            {'name': 'b', 'action': 'x.run', 'needs': ['a']},
+            {'name': 'c', 'action': 'x.run', 'depends_on': ['b'], 'inputs': {'v': '{{outputs.a.v}}'}},
+        ])
+        assert results == []
@@ -0,0 +1,90 @@
+# Workflow Simulator Tests
+# Tests for the discrete-event scheduler simulation in simulate-workflow.py
+
+import pytest
+
+
+@pytest.fixture
+def simulator(load_script):
+    """Get the simulate-workflow module."""
+    return load_script('simulate-workflow.py')
+
+
+@pytest.fixture
+def graph(simulator):
+    """a (2s) fans out to b (4s), c (1s) and d (1s), which all feed e (1s)."""
+    return simulator.WorkflowGraph([
+        {'name': 'a', 'action': 'fetch'},
+        {'name': 'b', 'action': 'crunch', 'needs': ['a']},
+        {'name': 'c', 'action': 'check', 'needs': ['a']},
+        {'name': 'd', 'action': 'check', 'depends_on': ['a']},
+        {'name': 'e', 'action': 'report', 'needs': ['b', 'c', 'd']},
+    ])
+
+
+DURATIONS = [2.0, 4.0, 1.0, 1.0, 1.0]
+
+
+class TestSimulation:
+    """Test makespan, utilization and the saturation point."""
+
+    @pytest.mark.parametrize('workers, makespan', [(1, 9.0), (2, 7.0), (3, 7.0), (10, 7.0)])
+    def test_makespan(self, simulator, graph, workers, makespan):
+        run = simulator.simulate(graph, DURATIONS, workers)
+        assert run.makespan == makespan
+        assert sum(run.busy) == sum(DURATIONS)
+        assert run.starts[4] == makespan - 1.0
+
+    def test_utilization(self, simulator, graph):
+        assert simulator.simulate(graph, DURATIONS, 1).utilization == 1.0
+        assert simulator.simulate(graph, DURATIONS, 2).utilization == pytest.approx(9.0 / 14.0)
+
+    def test_saturation_point(self, simulator, graph):
+        """Two workers already reach the critical path; a third adds nothing."""
+        floor, path = graph.critical_path(DURATIONS)
+        assert (floor, [graph.names[i] for i in path]) == (7.0, ['a', 'b', 'e'])
+        saturation, runs = simulator.saturation_point(graph, DURATIONS, floor, 0.01, len(graph))
+        assert saturation == 2
+        assert runs[saturation].makespan == floor
+
+    def test_cycles_left_out(self, simulator):
+        graph = simulator.WorkflowGraph([
+            {'name': 'a', 'action': 'x'},
+            {'name': 'b', 'action': 'x', 'needs': ['c']},
+            {'name': 'c', 'action': 'x', 'needs': ['b']},
+        ])
+        run = simulator.simulate(graph, [1.0, 1.0, 1.0], 2)
+        assert run.makespan == 1.0 and sum(run.busy) == 1.0
+
+
+class TestEstimates:
+    """Test where step durations come from."""
+
+    def test_declared_then_journal_then_default(self, simulator, graph):
+        durations, sources = simulator.estimate_durations(
+            graph,
+            declared={'b': 10.0, 'check': 3.0},
+            learned={'fetch': [1.0, 5.0, 2.0], 'check': [9.0]},
+            default=0.5,
+        )
+        assert durations == [2.0, 10.0, 3.0, 3.0, 0.5]
+        assert sources == {'declared': 3, 'journal': 1, 'default': 1}
+
+    def test_learned_from_journal(self, simulator, load_script, tmp_path):
+        journal_module = load_script('workflow_journal.py')
+        path = str(tmp_path / 'runs.sqlite')
+        journal = journal_module.Journal(path)
+        run_id = journal.start_run('wf.yaml', {}, {})
+        for i, (action, duration, cached) in enumerate([('fetch', 2.0, 0), ('fetch', 4.0, 0), ('fetch', 0.1, 1)]):
+            result = type('Result', (), {'name': f's{i}', 'status': 'succeeded', 'outputs': {},
+                                         'error': None, 'duration': duration, 'cached': cached})()
+            journal.record_step(run_id, {'name': f's{i}'}, action, result)
+        journal.close()
+
+        assert simulator.load_learned(path, 'wf.yaml') == {'fetch': [2.0, 4.0]}
+        assert simulator.load_learned(str(tmp_path / 'missing.sqlite'), 'wf.yaml') == {}
+
+    def test_default_worker_counts(self, simulator):
+        assert simulator.default_worker_counts(1) == [1]
+        assert simulator.default_worker_counts(6) == [1, 2, 4, 6]
+        assert simulator.default_worker_counts(8) == [1, 2, 4, 8]
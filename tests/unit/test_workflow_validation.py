@@ -226,3 +226,129 @@ class TestYAMLSyntax:
                     yaml.safe_load(content)
             except yaml.YAMLError as e:
                 pytest.fail(f"Invalid YAML in {yaml_file}: {e}")
+
+
+class TestCycleDetection:
+    """Test SCC-based cycle detection in validate-workflow.sh."""
+
+    @pytest.fixture
+    def validator(self, load_script):
+        return load_script('validate-workflow.sh')
+
+    @staticmethod
+    def chain(size, close=False):
+        steps = [{'name': f's{i}', 'needs': [f's{i-1}'] if i else []} for i in range(size)]
+        if close:
+            steps[0]['needs'] = [f's{size - 1}']
+        return {'steps': steps}
+
+    def test_reports_every_cycle_group(self, validator):
+        """Each independent cycle is reported, over both needs and depends_on."""
+        workflow = {'steps': [
+            {'name': 'a', 'needs': ['b']},
+            {'name': 'b', 'depends_on': ['a']},
+            {'name': 'c'},
+            {'name': 'd', 'needs': ['c', 'e']},
+            {'name': 'e', 'needs': 'd'},
+            {'name': 'f', 'needs': ['f']},
+        ]}
+        assert validator.detect_cycles(workflow) == [
+            'Circular dependency detected: a -> b -> a',
+            'Circular dependency detected: d -> e -> d',
+            'Circular dependency detected: f -> f',
+        ]
+
+    def test_acyclic_workflow_passes(self, validator):
+        """Diamonds and shared dependencies are not cycles."""
+        workflow = {'steps': [
+            {'name': 'a'},
+            {'name': 'b', 'needs': ['a']},
+            {'name': 'c', 'depends_on': ['a']},
+            {'name': 'd', 'needs': ['b', 'c'], 'depends_on': ['a']},
+        ]}
+        assert validator.detect_cycles(workflow) == []
+
+    def test_large_group_lists_members(self, validator):
+        """A group larger than its shortest cycle names its members, truncated."""
+        workflow = {'steps': [
+            {'name': f'n{i}', 'needs': [f'n{(i + 1) % 12}'] + (['n0'] if i else [])} for i in range(12)
+        ]}
+        [message] = validator.detect_cycles(workflow)
+        assert message.startswith('Circular dependency detected: n0 -> n1 -> n0')
+        assert message.endswith('(cycle group of 12 steps: n0, n1, n2, n3, n4, n5, n6, n7, n8, n9, ...)')
+
+    def test_deep_chains_do_not_recurse(self, validator):
+        """100k-step chains are handled without hitting the recursion limit."""
+        assert validator.detect_cycles(self.chain(100000)) == []
+        [message] = validator.detect_cycles(self.chain(100000, close=True))
+        assert 'cycle group' not in message
+        assert message.count(' -> ') == 100000
+
+    def test_unknown_needs_reported(self, validator):
+        """Dependency validation covers needs as well as depends_on."""
+        workflow = {'steps': [{'name': 'a', 'needs': ['missing']}, {'name': 'b', 'depends_on': ['a']}]}
+        assert validator.validate_dependencies(workflow, 'wf.yaml') == [
+            "Step 'a' depends on unknown step 'missing' in wf.yaml"
+        ]
+
+
+class TestSchemaValidation:
+    """Test the bundled workflow schema and compiled schema validation."""
+
+    @pytest.fixture
+    def validator(self, load_script):
+        return load_script('validate-workflow.sh')
+
+    @pytest.fixture
+    def schema(self, validator):
+        return validator.load_schema_validator(str(validator.DEFAULT_SCHEMA))
+
+    def test_bundled_schema_accepts_repo_workflows(self, validator, schema):
+        """Every parseable workflow and pattern file in the repo passes the schema."""
+        workflows_dir = Path(__file__).parent.parent.parent / 'workflows'
+        checked = 0
+        for wf_file in sorted(workflows_dir.rglob('*.yaml')):
+            try:
+                workflow = yaml.safe_load(wf_file.read_text())
+            except yaml.YAMLError:
+                continue
+            assert validator.validate_against_schema(workflow, schema, str(wf_file)) == []
+            checked += 1
+        assert checked > 40
+
+    def test_schema_compiled_once(self, validator):
+        """Loading the same schema path again reuses the compiled validator."""
+        path = str(validator.DEFAULT_SCHEMA)
+        assert validator.load_schema_validator(path) is validator.load_schema_validator(path)
+
+    def test_collects_every_error(self, validator, schema):
+        """All violations are reported, each with its location and the specific cause."""
+        workflow = {
+            'name': 'bad',
+            'version': '1.0.0',
+            'description': 'Broken on purpose',
+            'triggers': ['push', {'on_push': 'main', 'on_pull_request': 'x'}],
+            'steps': [
+                {'name': 'a', 'depend_on': ['b']},
+                {'name': 'b', 'agent': 'z', 'needs': ['a', 'a']},
+            ],
+            'error_handling': {'max_retries': -1},
+        }
+        errors = validator.validate_against_schema(workflow, schema, 'bad.yaml')
+        assert [e.split(': ')[1] for e in errors] == [
+            'error_handling.max_retries', 'steps[0]', 'steps[0]', 'steps[1].needs',
+            'triggers[0]', 'triggers[1]',
+        ]
+        assert all(e.startswith('Schema validation failed in bad.yaml: ') for e in errors)
+        assert "steps[0]: 'action' is a required property" in errors[1]
+        assert "steps[1].needs: ['a', 'a'] has non-unique elements" in errors[3]
+
+    def test_pattern_files_need_no_steps(self, validator, schema):
+        """Pattern files declare pattern_type instead of steps."""
+        pattern = {'name': 'loop', 'version': '1.0.0', 'description': 'x',
+                   'pattern_type': 'composable_loop', 'can_be_nested': True}
+        assert validator.validate_against_schema(pattern, schema) == []
+        del pattern['pattern_type']
+        assert validator.validate_against_schema(pattern, schema) == [
+            "Schema validation failed: <root>: 'steps' is a required property"
+        ]